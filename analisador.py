@@ -1,9 +1,24 @@
 import re
+import codecs
+import gc
+import hashlib
+import json
+import marshal
+import mmap
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
 import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox, font
 from enum import Enum
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from itertools import chain
+from types import MappingProxyType
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
 import os
 import sys
 
@@ -80,6 +95,11 @@ class TokenType(Enum):
     ERRO_SINTAXE_COMANDO_INPUT_MALFORMADO = "erro_sintaxe_comando_input_malformado"
     ERRO_SINTAXE_COMANDO_WRT_MALFORMADO = "erro_sintaxe_comando_wrt_malformado"
     ERRO_SINTAXE_ORDEM_INCORRETA = "erro_sintaxe_ordem_incorreta"
+    
+    # Tipos de erro semântico (tabela de símbolos)
+    ERRO_VARIAVEL_NAO_DECLARADA = "erro_variavel_nao_declarada"
+    ERRO_VARIAVEL_REDECLARADA = "erro_variavel_redeclarada"
+    ERRO_FUNCAO_NAO_DECLARADA = "erro_funcao_nao_declarada"
 
 @dataclass
 class Token:
@@ -95,6 +115,161 @@ class Token:
             return f"Linha: {self.linha} - Coluna: {self.coluna} - ERRO: <{self.tipo.value}, {self.lexema}> - {self.descricao}"
         else:
             return f"Linha: {self.linha} - Coluna: {self.coluna} - Token: <{self.tipo.value}, {self.lexema}>"
+    
+    def para_dict(self) -> dict:
+        """Retorna o token como dicionário serializável em JSON (tipo pelo valor)."""
+        return {"tipo": self.tipo.value, "lexema": self.lexema, "linha": self.linha,
+                "coluna": self.coluna, "descricao": self.descricao}
+
+# Código inteiro de cada tipo de token (sua posição em TokenType), usado nas
+# colunas do TokenStore e nas decisões do analisador sintático
+TIPOS_TOKEN = list(TokenType)
+CODIGO_TIPO = MappingProxyType({tipo: codigo for codigo, tipo in enumerate(TIPOS_TOKEN)})
+
+class TokenView:
+    """
+    Visão preguiçosa de um token guardado em um TokenStore.
+    Tem os mesmos atributos de Token, mas lê cada campo das colunas do
+    armazenamento somente quando acessado.
+    """
+    __slots__ = ('_store', '_indice')
+    
+    def __init__(self, store: 'TokenStore', indice: int):
+        self._store = store
+        self._indice = indice
+    
+    @property
+    def tipo(self) -> TokenType:
+        return TokenStore.TIPOS[self._store.tipos[self._indice]]
+    
+    @property
+    def lexema(self) -> str:
+        return self._store.lexema(self._indice)
+    
+    @property
+    def linha(self) -> int:
+        return self._store.linhas[self._indice]
+    
+    @property
+    def coluna(self) -> int:
+        return self._store.colunas[self._indice]
+    
+    @property
+    def descricao(self) -> str:
+        return self._store.tabela_descricoes[self._store.descricoes[self._indice]]
+    
+    @property
+    def eh_erro(self) -> bool:
+        return bool(self._store.erros[self._indice])
+    
+    __str__ = Token.__str__
+    
+    def __repr__(self):
+        return repr(self.para_token())
+    
+    def para_token(self) -> Token:
+        """Cria um Token independente com os mesmos campos."""
+        return Token(self.tipo, self.lexema, self.linha, self.coluna, self.descricao, self.eh_erro)
+
+class TokenStore:
+    """
+    Armazenamento compacto de tokens em colunas (struct-of-arrays).
+    Cada token ocupa uma posição em arrays de inteiros: tipo, início e fim do
+    lexema no código-fonte, linha, coluna, descrição e indicador de erro.
+    Lexemas e descrições só viram strings quando são pedidos; as descrições
+    repetidas são guardadas uma única vez em tabela_descricoes.
+    Lexemas que não são um trecho do código (por exemplo, os dos erros de
+    validação) ficam em lexemas_extras e são indicados por início negativo.
+    Indexar ou percorrer o armazenamento produz objetos TokenView.
+    """
+    
+    TIPOS = TIPOS_TOKEN
+    CODIGOS_TIPO = CODIGO_TIPO
+    
+    def __init__(self, codigo: str = ""):
+        self.codigo = codigo
+        self.tipos = array('i')
+        self.inicios = array('i')
+        self.fins = array('i')
+        self.linhas = array('i')
+        self.colunas = array('i')
+        self.descricoes = array('i')
+        self.erros = array('b')
+        self.tabela_descricoes: List[str] = []
+        self.lexemas_extras: List[str] = []
+        self._indices_descricao = {}
+        
+        # Deslocamento do início de cada linha, para converter (linha, coluna) em posição
+        self._inicios_linha = array('i', [0])
+        posicao = codigo.find('\n')
+        while posicao != -1:
+            self._inicios_linha.append(posicao + 1)
+            posicao = codigo.find('\n', posicao + 1)
+    
+    def append(self, token: Token):
+        lexema = token.lexema
+        inicio = fim = 0
+        if lexema:
+            inicio = -1
+            if 1 <= token.linha <= len(self._inicios_linha) and token.coluna >= 1:
+                posicao = self._inicios_linha[token.linha - 1] + token.coluna - 1
+                if self.codigo.startswith(lexema, posicao):
+                    inicio, fim = posicao, posicao + len(lexema)
+            if inicio < 0:
+                self.lexemas_extras.append(lexema)
+                inicio = -len(self.lexemas_extras)
+        
+        descricao = self._indices_descricao.get(token.descricao)
+        if descricao is None:
+            descricao = self._indices_descricao[token.descricao] = len(self.tabela_descricoes)
+            self.tabela_descricoes.append(token.descricao)
+        
+        self.tipos.append(self.CODIGOS_TIPO[token.tipo])
+        self.inicios.append(inicio)
+        self.fins.append(fim)
+        self.linhas.append(token.linha)
+        self.colunas.append(token.coluna)
+        self.descricoes.append(descricao)
+        self.erros.append(token.eh_erro)
+    
+    def extend(self, tokens: Iterable[Token]):
+        for token in tokens:
+            self.append(token)
+    
+    def lexema(self, indice: int) -> str:
+        inicio = self.inicios[indice]
+        if inicio < 0:
+            return self.lexemas_extras[-inicio - 1]
+        return self.codigo[inicio:self.fins[indice]]
+    
+    def __len__(self) -> int:
+        return len(self.tipos)
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [TokenView(self, i) for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice de token fora do intervalo")
+        return TokenView(self, indice)
+    
+    def __iter__(self) -> Iterator[TokenView]:
+        for indice in range(len(self)):
+            yield TokenView(self, indice)
+    
+    def para_tokens(self) -> List[Token]:
+        """Converte o armazenamento em uma lista de Token."""
+        return [TokenView(self, indice).para_token() for indice in range(len(self))]
+    
+    def tamanho_bytes(self) -> int:
+        """Memória ocupada pelas colunas e tabelas (sem contar o código-fonte)."""
+        colunas = (self.tipos, self.inicios, self.fins, self.linhas, self.colunas,
+                   self.descricoes, self.erros, self._inicios_linha)
+        tabelas = self.tabela_descricoes + self.lexemas_extras
+        return (sum(sys.getsizeof(coluna) for coluna in colunas)
+                + sys.getsizeof(self.tabela_descricoes) + sys.getsizeof(self.lexemas_extras)
+                + sum(sys.getsizeof(texto) for texto in tabelas))
 
 @dataclass
 class NoSintatico:
@@ -114,42 +289,634 @@ class NoSintatico:
         self.filhos.append(filho)
     
     def __str__(self, nivel=0):
-        indent = "  " * nivel
-        resultado = f"{indent}{self.tipo}"
-        if self.valor:
-            resultado += f": {self.valor}"
-        resultado += "\n"
-        
-        for filho in self.filhos:
-            resultado += filho.__str__(nivel + 1)
-        
-        return resultado
+        return "".join(EscritorArvore().linhas(self, nivel))
 
-class AnalisadorSintatico:
-    """Analisador sintático para a linguagem ALAIAS."""
+class NoReconhecimento:
+    """
+    Nó usado por AnalisadorSintatico.reconhecer, que só verifica a sintaxe: uma
+    única instância (NO_RECONHECIMENTO) substitui todos os nós e descarta os
+    filhos, de modo que nenhum nó é alocado durante a análise.
+    """
+    __slots__ = ()
+    
+    def adicionar_filho(self, filho):
+        pass
+
+
+NO_RECONHECIMENTO = NoReconhecimento()
+
+class EscritorArvore:
+    """
+    Escreve a árvore sintática como linhas indentadas ("TIPO: valor"), percorrendo
+    os nós com uma pilha explícita: o tempo é linear no número de nós e qualquer
+    profundidade é suportada. As linhas são produzidas uma a uma (linhas), em
+    blocos (blocos) ou escritas em qualquer objeto com write (escrever), sem
+    montar uma única string com a árvore inteira.
+    profundidade_maxima limita os níveis exibidos (a raiz é o nível 0) e max_nos
+    limita o total de nós exibidos; o que é omitido é indicado por uma linha "...".
+    """
+    
+    def __init__(self, profundidade_maxima: Optional[int] = None, max_nos: Optional[int] = None,
+                 indentacao: str = "  "):
+        self.profundidade_maxima = profundidade_maxima
+        self.max_nos = max_nos
+        self.indentacao = indentacao
+    
+    def linhas(self, raiz, nivel: int = 0) -> Iterator[str]:
+        """Produz as linhas da árvore (cada uma terminada em '\\n'), em pré-ordem."""
+        if isinstance(raiz, NoView):
+            return self._linhas_arena(raiz.arvore, raiz.indice, nivel)
+        return self._linhas_nos(raiz, nivel)
+    
+    def _linhas_nos(self, raiz, nivel: int) -> Iterator[str]:
+        # A pilha guarda um iterador sobre os filhos de cada nível aberto e o prefixo
+        # de indentação desse nível; len(pilha) - 1 é a profundidade relativa do nó atual
+        indentacao = self.indentacao
+        limite = self.profundidade_maxima if self.profundidade_maxima is not None else float('inf')
+        restantes = self.max_nos if self.max_nos is not None else -1
+        pilha = [iter((raiz,))]
+        prefixos = [indentacao * nivel]
+        
+        while pilha:
+            for no in pilha[-1]:
+                if restantes == 0:
+                    yield f"... (árvore truncada: limite de {self.max_nos} nós)\n"
+                    return
+                restantes -= 1
+                
+                prefixo = prefixos[-1]
+                valor = no.valor
+                if valor:
+                    yield f"{prefixo}{no.tipo}: {valor}\n"
+                else:
+                    yield f"{prefixo}{no.tipo}\n"
+                
+                filhos = no.filhos
+                if filhos:
+                    if len(pilha) > limite:
+                        yield f"{prefixo}{indentacao}... ({len(filhos)} filho(s) não exibido(s))\n"
+                        continue
+                    pilha.append(iter(filhos))
+                    prefixos.append(prefixo + indentacao)
+                    break
+            else:
+                pilha.pop()
+                prefixos.pop()
+    
+    def _linhas_arena(self, arvore: 'ArvoreCompacta', raiz: int, nivel: int) -> Iterator[str]:
+        # Mesmo percurso de _linhas_nos, lendo os índices direto dos arrays da arena
+        indentacao = self.indentacao
+        limite = self.profundidade_maxima if self.profundidade_maxima is not None else float('inf')
+        restantes = self.max_nos if self.max_nos is not None else -1
+        nomes_tipo, tipos, valor_de = arvore.nomes_tipo, arvore.tipos, arvore.valor
+        primeiros_filhos, filhos_de = arvore.primeiros_filhos, arvore.filhos
+        pilha = [iter((raiz,))]
+        prefixos = [indentacao * nivel]
+        
+        while pilha:
+            for no in pilha[-1]:
+                if restantes == 0:
+                    yield f"... (árvore truncada: limite de {self.max_nos} nós)\n"
+                    return
+                restantes -= 1
+                
+                prefixo = prefixos[-1]
+                valor = valor_de(no)
+                if valor:
+                    yield f"{prefixo}{nomes_tipo[tipos[no]]}: {valor}\n"
+                else:
+                    yield f"{prefixo}{nomes_tipo[tipos[no]]}\n"
+                
+                if primeiros_filhos[no] >= 0:
+                    if len(pilha) > limite:
+                        yield f"{prefixo}{indentacao}... ({sum(1 for _ in filhos_de(no))} filho(s) não exibido(s))\n"
+                        continue
+                    pilha.append(filhos_de(no))
+                    prefixos.append(prefixo + indentacao)
+                    break
+            else:
+                pilha.pop()
+                prefixos.pop()
+    
+    def blocos(self, raiz, linhas_por_bloco: int = 1000) -> Iterator[str]:
+        """Produz a árvore em trechos de até linhas_por_bloco linhas."""
+        bloco = []
+        for linha in self.linhas(raiz):
+            bloco.append(linha)
+            if len(bloco) >= linhas_por_bloco:
+                yield "".join(bloco)
+                bloco.clear()
+        if bloco:
+            yield "".join(bloco)
+    
+    def escrever(self, raiz, destino: TextIO) -> None:
+        """Escreve a árvore em um destino com método write (arquivo, StringIO, sys.stdout...)."""
+        for bloco in self.blocos(raiz):
+            destino.write(bloco)
+
+class NoView:
+    """
+    Visão de um nó guardado em uma ArvoreCompacta.
+    Tem os mesmos atributos e a mesma forma de impressão de NoSintatico, mas lê
+    cada campo dos arrays da arena somente quando acessado. A linha e a coluna
+    são as do token do nó (0 quando o nó não tem token).
+    """
+    __slots__ = ('arvore', 'indice')
+    
+    def __init__(self, arvore: 'ArvoreCompacta', indice: int):
+        self.arvore = arvore
+        self.indice = indice
+    
+    @property
+    def tipo(self) -> str:
+        return self.arvore.nomes_tipo[self.arvore.tipos[self.indice]]
+    
+    @property
+    def valor(self) -> str:
+        return self.arvore.valor(self.indice)
+    
+    @property
+    def filhos(self) -> List['NoView']:
+        arvore = self.arvore
+        return [NoView(arvore, filho) for filho in arvore.filhos(self.indice)]
+    
+    @property
+    def token(self) -> Optional[Token]:
+        indice_token = self.arvore.indices_token[self.indice]
+        return self.arvore.tokens[indice_token] if indice_token >= 0 else None
+    
+    @property
+    def linha(self) -> int:
+        token = self.token
+        return token.linha if token is not None else 0
+    
+    @property
+    def coluna(self) -> int:
+        token = self.token
+        return token.coluna if token is not None else 0
+    
+    def adicionar_filho(self, filho: 'NoView'):
+        self.arvore.adicionar_filho(self.indice, filho.indice)
+    
+    __str__ = NoSintatico.__str__
+    
+    def __repr__(self):
+        return f"NoView({self.tipo!r}, {self.valor!r}, indice={self.indice})"
+    
+    def para_no(self) -> NoSintatico:
+        """Cria uma árvore de NoSintatico independente a partir deste nó."""
+        arvore = self.arvore
+        raiz = NoSintatico(self.tipo, self.valor, token=self.token)
+        pendentes = [(self.indice, raiz)]
+        while pendentes:
+            indice, no = pendentes.pop()
+            for filho in arvore.filhos(indice):
+                visao = NoView(arvore, filho)
+                no_filho = NoSintatico(visao.tipo, visao.valor, token=visao.token)
+                no.filhos.append(no_filho)
+                pendentes.append((filho, no_filho))
+        return raiz
+
+class NoSomenteLeitura:
+    """
+    Visão somente leitura de um nó (NoSintatico ou NoView) guardado pela
+    MemoriaAnalise: tem os mesmos atributos e a mesma impressão do nó, mas não
+    tem adicionar_filho e filhos cria uma lista nova de visões a cada acesso, então
+    quem recebe a árvore não altera os nós guardados nem os reaproveitados pela
+    reanálise. trocas substitui tokens (pelo id) por cópias com a linha da época
+    em que a árvore foi guardada.
+    """
+    __slots__ = ('no', 'trocas')
+    
+    def __init__(self, no, trocas: Optional[dict] = None):
+        self.no = no
+        self.trocas = trocas if trocas is not None else {}
+    
+    @property
+    def tipo(self) -> str:
+        return self.no.tipo
+    
+    @property
+    def valor(self) -> str:
+        return self.no.valor
+    
+    @property
+    def filhos(self) -> List['NoSomenteLeitura']:
+        trocas = self.trocas
+        return [NoSomenteLeitura(filho, trocas) for filho in self.no.filhos]
+    
+    @property
+    def token(self) -> Optional[Token]:
+        token = self.no.token
+        return self.trocas.get(id(token), token) if token is not None else None
+    
+    @property
+    def linha(self) -> int:
+        return self.no.linha
+    
+    @property
+    def coluna(self) -> int:
+        return self.no.coluna
+    
+    __str__ = NoSintatico.__str__
+    
+    def __repr__(self):
+        return f"NoSomenteLeitura({self.tipo!r}, {self.valor!r})"
+    
+    def para_no(self) -> NoSintatico:
+        """Cria uma árvore de NoSintatico independente a partir deste nó."""
+        raiz = NoSintatico(self.tipo, self.valor, token=self.token)
+        pendentes = [(self, raiz)]
+        while pendentes:
+            visao, no = pendentes.pop()
+            for filho in visao.filhos:
+                no_filho = NoSintatico(filho.tipo, filho.valor, token=filho.token)
+                no.filhos.append(no_filho)
+                pendentes.append((filho, no_filho))
+        return raiz
+
+class ArvoreCompacta:
+    """
+    Árvore sintática em arena (struct-of-arrays).
+    Cada nó é um índice em arrays paralelos: código do tipo do nó, posição do
+    valor em tabela_valores, primeiro filho, próximo irmão e índice do token na
+    lista de tokens analisada (-1 indica ausência). Os filhos formam uma lista
+    ligada (primeiro filho e próximo irmão); ultimos_filhos permite acrescentar
+    um filho em tempo constante. Os valores que são o próprio lexema do token do
+    nó não são copiados (valor -1); os demais ficam uma única vez em
+    tabela_valores. Indexar a arena produz objetos NoView.
+    """
+    
+    def __init__(self, tokens: Optional[List[Token]] = None):
+        self.tokens = tokens if tokens is not None else []
+        self.tipos = array('B')
+        self.valores = array('i')
+        self.primeiros_filhos = array('i')
+        self.proximos_irmaos = array('i')
+        self.ultimos_filhos = array('i')
+        self.indices_token = array('i')
+        self.nomes_tipo: List[str] = []
+        self.tabela_valores: List[str] = []
+        self._codigos_tipo = {}
+        self._indices_valor = {}
+    
+    def novo_no(self, tipo: str, valor: str = "", filhos: Optional[List[NoView]] = None,
+                indice_token: int = -1) -> NoView:
+        """Cria um nó com a mesma assinatura de NoSintatico (o token vem pelo índice)."""
+        codigo = self._codigos_tipo.get(tipo)
+        if codigo is None:
+            codigo = self._codigos_tipo[tipo] = len(self.nomes_tipo)
+            self.nomes_tipo.append(tipo)
+        
+        if indice_token >= 0 and valor == self.tokens[indice_token].lexema:
+            posicao_valor = -1
+        else:
+            posicao_valor = self._indices_valor.get(valor)
+            if posicao_valor is None:
+                posicao_valor = self._indices_valor[valor] = len(self.tabela_valores)
+                self.tabela_valores.append(valor)
+        
+        indice = len(self.tipos)
+        self.tipos.append(codigo)
+        self.valores.append(posicao_valor)
+        self.primeiros_filhos.append(-1)
+        self.proximos_irmaos.append(-1)
+        self.ultimos_filhos.append(-1)
+        self.indices_token.append(indice_token)
+        
+        for filho in filhos or ():
+            self.adicionar_filho(indice, filho.indice)
+        return NoView(self, indice)
+    
+    def adicionar_filho(self, pai: int, filho: int):
+        ultimo = self.ultimos_filhos[pai]
+        if ultimo < 0:
+            self.primeiros_filhos[pai] = filho
+        else:
+            self.proximos_irmaos[ultimo] = filho
+        self.ultimos_filhos[pai] = filho
+    
+    def filhos(self, indice: int) -> Iterator[int]:
+        """Percorre os índices dos filhos de um nó, em ordem."""
+        filho = self.primeiros_filhos[indice]
+        proximos = self.proximos_irmaos
+        while filho >= 0:
+            yield filho
+            filho = proximos[filho]
+    
+    def valor(self, indice: int) -> str:
+        posicao_valor = self.valores[indice]
+        if posicao_valor < 0:
+            return self.tokens[self.indices_token[indice]].lexema
+        return self.tabela_valores[posicao_valor]
+    
+    def __len__(self) -> int:
+        return len(self.tipos)
+    
+    def __getitem__(self, indice: int) -> NoView:
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice de nó fora do intervalo")
+        return NoView(self, indice)
+    
+    @classmethod
+    def de_arvore(cls, raiz, tokens: Iterable[Token]) -> 'ArvoreCompacta':
+        """
+        Copia uma árvore (de NoSintatico ou NoView) para uma nova arena, sem
+        recursão; a raiz é o nó 0. Os tokens dos nós são procurados em tokens e
+        os que não estão lá são acrescentados à lista de tokens da arena.
+        """
+        arvore = cls(list(tokens))
+        indices = {id(token): indice for indice, token in enumerate(arvore.tokens)}
+        pendentes = [(raiz, -1)]
+        while pendentes:
+            no, pai = pendentes.pop()
+            token = no.token
+            indice_token = -1
+            if token is not None:
+                indice_token = indices.get(id(token))
+                if indice_token is None:
+                    indice_token = indices[id(token)] = len(arvore.tokens)
+                    arvore.tokens.append(token)
+            indice = arvore.novo_no(no.tipo, no.valor, None, indice_token).indice
+            if pai >= 0:
+                arvore.adicionar_filho(pai, indice)
+            pendentes.extend((filho, indice) for filho in reversed(no.filhos))
+        return arvore
+    
+    def tamanho_bytes(self) -> int:
+        """Memória ocupada pelos arrays e tabelas (sem contar os tokens)."""
+        arrays = (self.tipos, self.valores, self.primeiros_filhos, self.proximos_irmaos,
+                  self.ultimos_filhos, self.indices_token)
+        return (sum(sys.getsizeof(coluna) for coluna in arrays)
+                + sys.getsizeof(self.nomes_tipo) + sys.getsizeof(self.tabela_valores)
+                + sum(sys.getsizeof(texto) for texto in self.nomes_tipo + self.tabela_valores))
+
+class IndiceDelimitadores:
+    """
+    Pares de parênteses e colchetes de uma sequência de códigos de tipo de token
+    (AnalisadorSintatico.tipos), calculados em uma única passagem que visita apenas
+    os delimitadores. Cada tipo de delimitador tem a sua própria pilha, como em
+    validar_delimitadores:
+    - fechamento: {posição de abertura: posição do fechamento correspondente};
+    - fechamentos_sem_abertura: posições de ')' e ']' sem abertura, em ordem;
+    - parenteses_abertos / colchetes_abertos: posições de '(' e '[' não fechados.
+    """
+    
+    ABRE_PARENT = CODIGO_TIPO[TokenType.ABRE_PARENT]
+    FECHA_PARENT = CODIGO_TIPO[TokenType.FECHA_PARENT]
+    ABRE_COLCHETES = CODIGO_TIPO[TokenType.ABRE_COLCHETES]
+    FECHA_COLCHETES = CODIGO_TIPO[TokenType.FECHA_COLCHETES]
+    REGEX_DELIMITADOR = re.compile(b'[' + re.escape(bytes([ABRE_PARENT, FECHA_PARENT,
+                                                           ABRE_COLCHETES, FECHA_COLCHETES])) + b']')
+    
+    def __init__(self, tipos: bytes):
+        self.fechamento = {}
+        self.fechamentos_sem_abertura = []
+        self.parenteses_abertos = []
+        self.colchetes_abertos = []
+        
+        fechamento = self.fechamento
+        sem_abertura = self.fechamentos_sem_abertura
+        parenteses = self.parenteses_abertos
+        colchetes = self.colchetes_abertos
+        abre_parent, fecha_parent, abre_colchetes = self.ABRE_PARENT, self.FECHA_PARENT, self.ABRE_COLCHETES
+        for delimitador in self.REGEX_DELIMITADOR.finditer(tipos):
+            posicao = delimitador.start()
+            tipo = tipos[posicao]
+            if tipo == abre_parent:
+                parenteses.append(posicao)
+            elif tipo == abre_colchetes:
+                colchetes.append(posicao)
+            else:
+                pilha = parenteses if tipo == fecha_parent else colchetes
+                if pilha:
+                    fechamento[pilha.pop()] = posicao
+                else:
+                    sem_abertura.append(posicao)
+
+
+@dataclass
+class Simbolo:
+    """Declaração de uma variável (tipo intn, den, ...) ou função (tipo func)."""
+    nome: str
+    tipo: str
+    linha: int
+    coluna: int
+    escopo: str = ""
+
+
+class TabelaSimbolos:
+    """
+    Declarações de variáveis e funções de um programa, com tipo, posição e escopo,
+    consultadas em O(1) pelas verificações semânticas.
+    Como a linguagem não tem fim de bloco, o escopo de uma variável é a última
+    função declarada antes dela ("" antes de qualquer função, o escopo global);
+    declarar o mesmo nome duas vezes no mesmo escopo é uma redeclaração.
+    A tabela é preenchida pelo analisador sintático (tabela_simbolos) ou, no
+    percurso das regras de validação do analisador léxico, token a token por
+    consumir, que reconhece os pares tipo identificador e func identificador.
+    """
+    
+    ESCOPO_GLOBAL = ""
     
     def __init__(self):
+        self.variaveis = {}       # {nome: [Simbolo, ...]}, na ordem das declarações
+        self.funcoes = {}         # {nome: Simbolo}
+        self.redeclaracoes = []   # [(Simbolo, Simbolo da declaração anterior no mesmo escopo)]
+        self.escopo_atual = self.ESCOPO_GLOBAL
+        self._anterior = None     # Último token recebido por consumir
+    
+    def declarar(self, nome: str, tipo: str, linha: int, coluna: int) -> Simbolo:
+        """Registra a declaração de uma variável no escopo atual."""
+        simbolo = Simbolo(nome, tipo, linha, coluna, self.escopo_atual)
+        declaracoes = self.variaveis.get(nome)
+        if declaracoes is None:
+            self.variaveis[nome] = [simbolo]
+        else:
+            for anterior in declaracoes:
+                if anterior.escopo == simbolo.escopo:
+                    self.redeclaracoes.append((simbolo, anterior))
+                    break
+            declaracoes.append(simbolo)
+        return simbolo
+    
+    def declarar_funcao(self, nome: str, linha: int, coluna: int) -> Simbolo:
+        """Registra a declaração de uma função, que passa a ser o escopo atual."""
+        simbolo = Simbolo(nome, "func", linha, coluna, self.ESCOPO_GLOBAL)
+        self.funcoes.setdefault(nome, simbolo)
+        self.escopo_atual = nome
+        return simbolo
+    
+    def declarada(self, nome: str) -> bool:
+        """Indica se a variável é declarada em algum ponto do programa."""
+        return nome in self.variaveis
+    
+    def buscar(self, nome: str) -> Optional[Simbolo]:
+        """Retorna a primeira declaração da variável, se houver."""
+        declaracoes = self.variaveis.get(nome)
+        return declaracoes[0] if declaracoes else None
+    
+    def tipo_antes(self, nome: str, linha: int, coluna: int) -> Optional[str]:
+        """Tipo da última declaração da variável antes da posição (linha, coluna)."""
+        for simbolo in reversed(self.variaveis.get(nome, ())):
+            if (simbolo.linha, simbolo.coluna) < (linha, coluna):
+                return simbolo.tipo
+        return None
+    
+    def consumir(self, token: Token) -> None:
+        """Registra as declarações formadas pelo token anterior e este."""
+        anterior = self._anterior
+        self._anterior = token
+        if token.tipo is not TokenType.IDENTIFICADOR or anterior is None:
+            return
+        if anterior.tipo is TokenType.TIPO_VAR:
+            self.declarar(token.lexema, anterior.lexema, token.linha, token.coluna)
+        elif anterior.tipo is TokenType.FUNCTION:
+            self.declarar_funcao(token.lexema, token.linha, token.coluna)
+
+
+class AnalisadorSintatico:
+    """
+    Analisador sintático para a linguagem ALAIAS.
+    As decisões usam o array tipos, com o código inteiro (CODIGO_TIPO) de cada
+    token significativo e o código FIM como sentinela depois do último token,
+    para que consultar o token atual nunca precise checar o tamanho da lista.
+    """
+    
+    # Códigos dos tipos de token consultados pelo analisador
+    INICIO = CODIGO_TIPO[TokenType.INICIO]
+    NEWLINE = CODIGO_TIPO[TokenType.NEWLINE]
+    EOF = CODIGO_TIPO[TokenType.EOF]
+    TIPO_VAR = CODIGO_TIPO[TokenType.TIPO_VAR]
+    IDENTIFICADOR = CODIGO_TIPO[TokenType.IDENTIFICADOR]
+    FUNCTION = CODIGO_TIPO[TokenType.FUNCTION]
+    INPUT = CODIGO_TIPO[TokenType.INPUT]
+    WRT = CODIGO_TIPO[TokenType.WRT]
+    PULAR_LINHA = CODIGO_TIPO[TokenType.PULAR_LINHA]
+    COND_SE = CODIGO_TIPO[TokenType.COND_SE]
+    COND_SENAOSE = CODIGO_TIPO[TokenType.COND_SENAOSE]
+    COND_SENAO = CODIGO_TIPO[TokenType.COND_SENAO]
+    REP_PARA = CODIGO_TIPO[TokenType.REP_PARA]
+    REP_ENQUANTO = CODIGO_TIPO[TokenType.REP_ENQUANTO]
+    REP_RANGE = CODIGO_TIPO[TokenType.REP_RANGE]
+    IN = CODIGO_TIPO[TokenType.IN]
+    OPER_ATRIB = CODIGO_TIPO[TokenType.OPER_ATRIB]
+    OPER_LOGICO = CODIGO_TIPO[TokenType.OPER_LOGICO]
+    OP_REL = CODIGO_TIPO[TokenType.OP_REL]
+    OPER_MATEMATICO = CODIGO_TIPO[TokenType.OPER_MATEMATICO]
+    ABRE_PARENT = CODIGO_TIPO[TokenType.ABRE_PARENT]
+    FECHA_PARENT = CODIGO_TIPO[TokenType.FECHA_PARENT]
+    ABRE_COLCHETES = CODIGO_TIPO[TokenType.ABRE_COLCHETES]
+    FECHA_COLCHETES = CODIGO_TIPO[TokenType.FECHA_COLCHETES]
+    FIM = len(TIPOS_TOKEN)  # Sentinela: não há mais tokens
+    
+    # Tipos de token que não participam da análise sintática
+    IGNORADOS = (TokenType.WHITESPACE, TokenType.COMENTARIO)
+    # Tokens que encerram uma lista de comandos
+    FINAIS = frozenset({EOF, FIM})
+    # Tokens que finalizam blocos condicionais
+    FINAIS_BLOCO_CONDICIONAL = frozenset({COND_SENAO, COND_SENAOSE})
+    # Estruturas de controle que podem encerrar o bloco anterior
+    ESTRUTURAS_CONTROLE = frozenset({COND_SE, REP_PARA, REP_ENQUANTO, REP_RANGE})
+    CONTEXTOS_REPETICAO = frozenset({"REP_PARA", "REP_ENQUANTO", "REP_RANGE"})
+    # Conjunto de sincronização da recuperação de erros (modo pânico): início de
+    # comando (FIRST de Comando, exceto identificador, que também continua expressões;
+    # um identificador só sincroniza no início de uma linha) e o que pode seguir um
+    # comando (FOLLOW: quebra de linha, fim de bloco e fim)
+    SINCRONIZACAO = frozenset({TIPO_VAR, FUNCTION, INPUT, WRT, PULAR_LINHA, COND_SE,
+                               REP_PARA, REP_ENQUANTO, REP_RANGE, NEWLINE}
+                              | FINAIS_BLOCO_CONDICIONAL | FINAIS)
+    # Máximo padrão de erros sintáticos registrados por análise
+    MAX_ERROS = 100
+    # Referências a identificadores registradas durante a análise (referencias)
+    REF_VARIAVEL, REF_FUNCAO, REF_USO, REF_CHAMADA = range(4)
+    # Tipo do nó criado para cada tipo de valor
+    NOS_VALOR = MappingProxyType({
+        CODIGO_TIPO[TokenType.VALOR_INTEIRO]: "VALOR_INTEIRO",
+        CODIGO_TIPO[TokenType.VALOR_REAL]: "VALOR_REAL",
+        CODIGO_TIPO[TokenType.VALOR_TEXTO]: "VALOR_TEXTO",
+        CODIGO_TIPO[TokenType.VALOR_LOGICO]: "VALOR_LOGICO",
+    })
+    
+    def __init__(self, max_erros: Optional[int] = MAX_ERROS):
         self.tokens = []
+        self.tipos = bytes([self.FIM])
         self.posicao = 0
         self.erros_sintaticos = []
+        self.max_erros = max_erros
+        self.em_recuperacao = False
+        self.posicao_ultimo_erro = -1
+        self.erros_suprimidos = 0
+        self.interrompida = False
         self.arvore_sintatica = None
+        self.arvore_compacta = None
+        self._indice_delimitadores = None
+        
+        # Declarações e usos de identificadores, na ordem do código:
+        # (REF_*, token do identificador, tipo declarado ou None)
+        self.referencias = []
+        self._tabela_simbolos = None
+        
+        # Comandos de nível superior da última análise, para reanalisar
+        self._comandos_topo = None
+        self._linhas_tokens = array('i')
+        self._inicio_comandos = 0
+        self._fim_comandos = 0
+        self._num_erros_comandos = 0
+        self._num_suprimidos_comandos = 0
+        self._num_referencias_comandos = 0
+        
+        # Construtor dos nós: NoSintatico ou, em analisar_compacto, a arena
+        self._criar_no = NoSintatico
+        
+        # Tratador do comando iniciado por cada tipo de token (indexado pelo código)
+        self.tratadores_comando = [self._analisar_comando_invalido] * (self.FIM + 1)
+        for codigo, tratador in (
+            (self.TIPO_VAR, self._analisar_declaracao_variavel),
+            (self.FUNCTION, self._analisar_declaracao_funcao),
+            (self.IDENTIFICADOR, self._analisar_comando_identificador),
+            (self.INPUT, self._analisar_comando_input),
+            (self.WRT, self._analisar_comando_output),
+            (self.COND_SE, self._analisar_estrutura_condicional),
+            (self.REP_PARA, self._analisar_estrutura_repeticao),
+            (self.REP_ENQUANTO, self._analisar_estrutura_repeticao),
+            (self.REP_RANGE, self._analisar_estrutura_repeticao),
+            (self.PULAR_LINHA, self._analisar_comando_breakline),
+        ):
+            self.tratadores_comando[codigo] = tratador
+        self.tratadores_comando[self.FIM] = lambda: None
         
     def analisar(self, tokens: List[Token]) -> Tuple[Optional[NoSintatico], List[Token]]:
         """
         Analisa sintaticamente uma lista de tokens.
         Retorna a árvore sintática e lista de erros sintáticos.
         """
-        # Filtra tokens não significativos para análise sintática
-        self.tokens = [t for t in tokens if t.tipo not in [
-            TokenType.WHITESPACE, TokenType.COMENTARIO
-        ] and not t.eh_erro]
+        self.tokens = self._filtrar_tokens(tokens)
+        self.tipos = bytes([CODIGO_TIPO[t.tipo] for t in self.tokens] + [self.FIM])
+        
+        self._linhas_tokens = array('i', [t.linha for t in self.tokens])
+        self._indice_delimitadores = None
+        
+        # Em analisar_compacto os nós são criados em uma arena que referencia estes tokens
+        self.arvore_compacta = ArvoreCompacta(self.tokens) if self._criar_no == self._criar_no_compacto else None
         
         self.posicao = 0
         self.erros_sintaticos = []
+        self.em_recuperacao = False
+        self.posicao_ultimo_erro = -1
+        self.erros_suprimidos = 0
+        self.interrompida = False
+        self.arvore_sintatica = None
+        self._comandos_topo = None
+        self.referencias = []
+        self._tabela_simbolos = None
         
         try:
             self.arvore_sintatica = self._analisar_programa()
         except Exception as e:
+            self._comandos_topo = None
             erro = Token(
                 tipo=TokenType.ERRO_SINTAXE_PROGRAMA_INCOMPLETO,
                 lexema="",
@@ -160,8 +927,219 @@ class AnalisadorSintatico:
             )
             self.erros_sintaticos.append(erro)
         
+        if self.interrompida:
+            self._comandos_topo = None
+        return self.arvore_sintatica, self.erros_sintaticos
+    
+    @property
+    def indice_delimitadores(self) -> IndiceDelimitadores:
+        """
+        Pares de delimitadores dos tokens atuais, calculados na primeira consulta e
+        consultados por validar_delimitadores. A regra léxica de expressões
+        condicionais acompanha apenas os colchetes das condições, no fluxo ainda
+        com os tokens de erro, por isso o estado dela não serve para este índice.
+        """
+        if self._indice_delimitadores is None:
+            self._indice_delimitadores = IndiceDelimitadores(self.tipos)
+        return self._indice_delimitadores
+    
+    @property
+    def tabela_simbolos(self) -> TabelaSimbolos:
+        """
+        Tabela com as declarações registradas em referencias durante a análise,
+        montada na primeira consulta (sem percorrer os tokens) e usada por
+        validar_simbolos.
+        """
+        if self._tabela_simbolos is None:
+            tabela = TabelaSimbolos()
+            for referencia, token, tipo in self.referencias:
+                if referencia == self.REF_VARIAVEL:
+                    tabela.declarar(token.lexema, tipo, token.linha, token.coluna)
+                elif referencia == self.REF_FUNCAO:
+                    tabela.declarar_funcao(token.lexema, token.linha, token.coluna)
+            self._tabela_simbolos = tabela
+        return self._tabela_simbolos
+    
+    def _filtrar_tokens(self, tokens: List[Token]) -> List[Token]:
+        """Filtra tokens não significativos para análise sintática (IGNORADOS e erros)."""
+        # Comparações por identidade: o hash de um membro de Enum é calculado em Python
+        espaco, comentario = self.IGNORADOS
+        return [t for t in tokens if t.tipo is not espaco and t.tipo is not comentario and not t.eh_erro]
+    
+    def reanalisar(self, tokens: List[Token]) -> Tuple[Optional[NoSintatico], List[Token]]:
+        """
+        Analisa como analisar, reaproveitando a análise anterior deste analisador.
+        Os tokens iguais no início e no fim das duas listas são os mesmos objetos
+        Token (como os produzidos por um LexicoIncremental, que mantém os tokens das
+        linhas não editadas); os comandos de nível superior que só dependem desses
+        tokens são reaproveitados com seus nós e erros, e apenas os comandos que se
+        sobrepõem ao trecho editado são analisados de novo. Os erros dos comandos
+        posteriores à edição têm a linha deslocada. Sem análise anterior
+        reaproveitável, faz a análise completa.
+        """
+        anteriores = self.tokens
+        comandos = self._comandos_topo
+        novos = self._filtrar_tokens(tokens)
+        if (comandos is None or self._criar_no is not NoSintatico
+                or not novos or not anteriores
+                or novos[-1].tipo != TokenType.EOF or anteriores[-1].tipo != TokenType.EOF):
+            return self.analisar(tokens)
+        
+        # Trecho alterado: maior prefixo e sufixo com os mesmos objetos Token. O
+        # LexicoIncremental corrige a linha dos tokens deslocados no próprio objeto,
+        # por isso a linha é comparada com a registrada na análise anterior: no
+        # prefixo ela não muda e no sufixo todas mudam pelo mesmo deslocamento
+        # (o EOF é recriado a cada análise léxica e conta como igual)
+        linhas_anteriores = self._linhas_tokens
+        deslocamento_linhas = novos[-1].linha - linhas_anteriores[-1]
+        limite = min(len(anteriores), len(novos))
+        inicio_alterado = 0
+        while (inicio_alterado < limite and novos[inicio_alterado] is anteriores[inicio_alterado]
+               and novos[inicio_alterado].linha == linhas_anteriores[inicio_alterado]):
+            inicio_alterado += 1
+        tamanho_sufixo = 1
+        while (tamanho_sufixo < limite - inicio_alterado
+               and novos[-1 - tamanho_sufixo] is anteriores[-1 - tamanho_sufixo]
+               and novos[-1 - tamanho_sufixo].linha - linhas_anteriores[-1 - tamanho_sufixo] == deslocamento_linhas):
+            tamanho_sufixo += 1
+        if inicio_alterado <= self._inicio_comandos:
+            return self.analisar(tokens)  # A edição alcança o início do programa
+        
+        fim_alterado = len(anteriores) - tamanho_sufixo
+        deslocamento = len(novos) - len(anteriores)
+        inicios = [comando[0] for comando in comandos]
+        erros_anteriores = self.erros_sintaticos
+        referencias_anteriores = self.referencias
+        fim_anterior = self._fim_comandos
+        num_erros_anterior = self._num_erros_comandos
+        num_suprimidos_anterior = self._num_suprimidos_comandos
+        num_referencias_anterior = self._num_referencias_comandos
+        
+        # Comandos do prefixo: toda a janela examinada (até o início do comando seguinte,
+        # inclusive) fica antes do trecho alterado
+        reaproveitados = bisect_left(inicios, inicio_alterado) - 1
+        if not 0 <= reaproveitados < len(comandos):
+            return self.analisar(tokens)
+        inicio, erro_no_inicio, _, num_erros, num_suprimidos, num_referencias = comandos[reaproveitados]
+        
+        # Códigos e linhas: o prefixo e o sufixo são copiados da análise anterior
+        fim_alterado_novo = len(novos) - tamanho_sufixo
+        alterados = novos[inicio_alterado:fim_alterado_novo]
+        self.tipos = (self.tipos[:inicio_alterado]
+                      + bytes([CODIGO_TIPO[t.tipo] for t in alterados])
+                      + self.tipos[fim_alterado:])
+        linhas = linhas_anteriores[:inicio_alterado]
+        linhas.extend(t.linha for t in alterados)
+        if deslocamento_linhas:
+            linhas.extend(t.linha for t in novos[fim_alterado_novo:])
+        else:
+            linhas.extend(linhas_anteriores[fim_alterado:])
+        self._linhas_tokens = linhas
+        self._indice_delimitadores = None
+        self.tokens = novos
+        self.arvore_compacta = None
+        self.posicao = inicio
+        self.erros_sintaticos = erros_anteriores[:num_erros]
+        self.referencias = referencias_anteriores[:num_referencias]
+        self._tabela_simbolos = None
+        self.em_recuperacao = False
+        self.posicao_ultimo_erro = inicio if erro_no_inicio else -1
+        self.erros_suprimidos = num_suprimidos
+        self.interrompida = False
+        novos_comandos = comandos[:reaproveitados]
+        
+        def reaproveitar(posicao: int) -> bool:
+            # Comandos do sufixo: a análise chegou ao início de um comando anterior
+            # posterior ao trecho alterado, no mesmo estado de recuperação
+            posicao_anterior = posicao - deslocamento
+            if posicao_anterior < fim_alterado:
+                return False
+            indice = bisect_left(inicios, posicao_anterior)
+            if indice == len(inicios) or inicios[indice] != posicao_anterior:
+                return False
+            _, erro_no_inicio, _, num_erros, num_suprimidos, num_referencias = comandos[indice]
+            if erro_no_inicio != (self.posicao_ultimo_erro == posicao):
+                return False
+            
+            ajuste_erros = len(self.erros_sintaticos) - num_erros
+            ajuste_suprimidos = self.erros_suprimidos - num_suprimidos
+            ajuste_referencias = len(self.referencias) - num_referencias
+            # As referências guardam os próprios tokens, cuja linha já está atualizada
+            self.referencias.extend(referencias_anteriores[num_referencias:num_referencias_anterior])
+            for erro in erros_anteriores[num_erros:num_erros_anterior]:
+                if deslocamento_linhas:
+                    erro = Token(erro.tipo, erro.lexema, erro.linha + deslocamento_linhas,
+                                 erro.coluna, erro.descricao, erro.eh_erro)
+                self.erros_sintaticos.append(erro)
+            for inicio_comando, erro_no_comando, comando, erros_antes, suprimidos_antes, referencias_antes in comandos[indice:]:
+                novos_comandos.append((inicio_comando + deslocamento, erro_no_comando, comando,
+                                       erros_antes + ajuste_erros, suprimidos_antes + ajuste_suprimidos,
+                                       referencias_antes + ajuste_referencias))
+            self.erros_suprimidos += num_suprimidos_anterior - num_suprimidos
+            self.posicao = fim_anterior + deslocamento
+            self._fim_comandos = self.posicao
+            self._num_erros_comandos = len(self.erros_sintaticos)
+            self._num_suprimidos_comandos = self.erros_suprimidos
+            self._num_referencias_comandos = len(self.referencias)
+            return True
+        
+        try:
+            self._analisar_comandos_topo(novos_comandos, reaproveitar)
+        except Exception:
+            return self.analisar(tokens)
+        if self.interrompida or (self.max_erros is not None and len(self.erros_sintaticos) >= self.max_erros):
+            return self.analisar(tokens)  # O limite de erros depende da análise inteira
+        
+        self._comandos_topo = novos_comandos
+        programa = NoSintatico("PROGRAMA")
+        programa.adicionar_filho(NoSintatico("INICIO", "als"))
+        lista = self._montar_lista(NoSintatico("LISTA_COMANDOS"), novos_comandos)
+        if lista:
+            programa.adicionar_filho(lista)
+        self.arvore_sintatica = programa
         return self.arvore_sintatica, self.erros_sintaticos
     
+    def analisar_compacto(self, tokens: List[Token]) -> Tuple[Optional[NoView], List[Token]]:
+        """
+        Analisa como analisar, mas guarda a árvore em uma ArvoreCompacta
+        (disponível em arvore_compacta) e retorna a visão NoView da raiz.
+        """
+        self._criar_no = self._criar_no_compacto
+        try:
+            return self.analisar(tokens)
+        finally:
+            self._criar_no = NoSintatico
+    
+    def reconhecer(self, tokens: List[Token]) -> List[Token]:
+        """
+        Verifica a sintaxe sem construir a árvore: aplica a mesma gramática, com os
+        mesmos erros e a mesma recuperação de analisar, mas todos os nós são
+        NO_RECONHECIMENTO. Retorna a lista de erros sintáticos; arvore_sintatica
+        fica None e a análise não pode ser reaproveitada por reanalisar.
+        """
+        self._criar_no = self._criar_no_reconhecimento
+        try:
+            _, erros = self.analisar(tokens)
+        finally:
+            self._criar_no = NoSintatico
+        self.arvore_sintatica = None
+        self._comandos_topo = None
+        return erros
+    
+    @staticmethod
+    def _criar_no_reconhecimento(tipo: str, valor: str = "", filhos=None,
+                                 token: Optional[Token] = None) -> NoReconhecimento:
+        return NO_RECONHECIMENTO
+    
+    def _criar_no_compacto(self, tipo: str, valor: str = "", filhos: Optional[List[NoView]] = None,
+                           token: Optional[Token] = None) -> NoView:
+        # O token de um nó é sempre o último consumido, em self.posicao - 1
+        return self.arvore_compacta.novo_no(tipo, valor, filhos, self.posicao - 1 if token is not None else -1)
+    
+    def _no_token(self, tipo: str, token: Token):
+        """Cria o nó do token recém-consumido, com o lexema como valor."""
+        return self._criar_no(tipo, token.lexema, None, token)
+    
     def _token_atual(self) -> Optional[Token]:
         """Retorna o token atual."""
         if self.posicao < len(self.tokens):
@@ -176,47 +1154,108 @@ class AnalisadorSintatico:
             return token
         return None
     
-    def _verificar_token(self, tipo_esperado: TokenType) -> bool:
-        """Verifica se o token atual é do tipo esperado."""
-        token = self._token_atual()
-        return token is not None and token.tipo == tipo_esperado
+    def _verificar_token(self, tipo_esperado: int) -> bool:
+        """Verifica se o token atual tem o código de tipo esperado."""
+        return self.tipos[self.posicao] == tipo_esperado
     
-    def _consumir_token(self, tipo_esperado: TokenType, mensagem_erro: str = "") -> Optional[Token]:
+    def _consumir_token(self, tipo_esperado: int, mensagem_erro: str = "") -> Optional[Token]:
         """Consome um token esperado ou gera erro."""
-        if self._verificar_token(tipo_esperado):
-            return self._avancar()
+        if self.tipos[self.posicao] == tipo_esperado:
+            token = self.tokens[self.posicao]
+            self.posicao += 1
+            return token
         else:
             token_atual = self._token_atual()
             if not mensagem_erro:
-                mensagem_erro = f"Esperado token {tipo_esperado.value}"
+                mensagem_erro = f"Esperado token {TIPOS_TOKEN[tipo_esperado].value}"
             
-            erro = Token(
-                tipo=TokenType.ERRO_SINTAXE_COMANDO_INCOMPLETO,
-                lexema=token_atual.lexema if token_atual else "EOF",
-                linha=token_atual.linha if token_atual else 1,
-                coluna=token_atual.coluna if token_atual else 1,
-                descricao=mensagem_erro,
-                eh_erro=True
+            self._registrar_erro(
+                TokenType.ERRO_SINTAXE_COMANDO_INCOMPLETO,
+                mensagem_erro,
+                token_atual
             )
-            self.erros_sintaticos.append(erro)
             return None
     
+    def _registrar_erro(self, tipo: TokenType, descricao: str, token: Optional[Token],
+                        lexema: Optional[str] = None):
+        """
+        Registra um erro sintático na posição do token (ou na linha 1, no fim dos tokens).
+        Depois de um erro o analisador entra em modo pânico: os erros seguintes são
+        apenas contados em erros_suprimidos até a lista de comandos sincronizar
+        (_sincronizar), assim como um novo erro no mesmo token do erro anterior.
+        Ao atingir max_erros, a análise é interrompida.
+        """
+        if self.em_recuperacao or self.posicao == self.posicao_ultimo_erro:
+            self.erros_suprimidos += 1
+            self.em_recuperacao = True
+            return
+        self.em_recuperacao = True
+        self.posicao_ultimo_erro = self.posicao
+        
+        if lexema is None:
+            lexema = token.lexema if token else "EOF"
+        self.erros_sintaticos.append(Token(
+            tipo=tipo,
+            lexema=lexema,
+            linha=token.linha if token else 1,
+            coluna=token.coluna if token else 1,
+            descricao=descricao,
+            eh_erro=True
+        ))
+        
+        if self.max_erros is not None and len(self.erros_sintaticos) >= self.max_erros:
+            self.erros_sintaticos.append(Token(
+                tipo=TokenType.ERRO_SINTAXE_PROGRAMA_INCOMPLETO,
+                lexema=lexema,
+                linha=token.linha if token else 1,
+                coluna=token.coluna if token else 1,
+                descricao=f"Limite de {self.max_erros} erros sintáticos atingido; análise interrompida",
+                eh_erro=True
+            ))
+            self.interrompida = True
+            # Pula para o fim: as regras em andamento terminam sem consumir mais tokens
+            # e, como o modo pânico nunca é encerrado, sem registrar novos erros
+            self.posicao = len(self.tokens)
+    
+    def _sincronizar(self):
+        """
+        Encerra o modo pânico: descarta tokens até um do conjunto SINCRONIZACAO
+        (início de comando, quebra de linha ou fim de bloco) ou até o primeiro token
+        de uma nova linha do código, já que o analisador léxico não emite NEWLINE.
+        Assim uma falha gera um único erro em vez de um erro por token restante do
+        comando, e o número de erros acompanha o número de linhas com defeito.
+        """
+        tipos = self.tipos
+        tokens = self.tokens
+        sincronizacao = self.SINCRONIZACAO
+        posicao = self.posicao
+        linha = tokens[posicao - 1].linha if 0 < posicao <= len(tokens) else 0
+        while tipos[posicao] not in sincronizacao:
+            linha_token = tokens[posicao].linha
+            if linha_token != linha:
+                break
+            linha = linha_token
+            posicao += 1
+        self.posicao = posicao
+        if posicao < len(self.tokens):
+            self.em_recuperacao = False
+    
     def _analisar_programa(self) -> NoSintatico:
         """
         Programa -> 'als' ListaComandos
         """
-        programa = NoSintatico("PROGRAMA")
+        programa = self._criar_no("PROGRAMA")
         
         # Deve começar com 'als'
-        if not self._consumir_token(TokenType.INICIO, "Programa deve começar com 'als'"):
+        if not self._consumir_token(self.INICIO, "Programa deve começar com 'als'"):
             return programa
         
         # Adiciona nó para o 'als'
-        no_inicio = NoSintatico("INICIO", "als")
+        no_inicio = self._criar_no("INICIO", "als")
         programa.adicionar_filho(no_inicio)
         
         # Ignora quebras de linha após 'als'
-        while self._verificar_token(TokenType.NEWLINE):
+        while self._verificar_token(self.NEWLINE):
             self._avancar()
         
         # Analisa lista de comandos
@@ -230,87 +1269,110 @@ class AnalisadorSintatico:
         """
         ListaComandos -> Comando ListaComandos | ε
         """
-        lista = NoSintatico("LISTA_COMANDOS")
+        lista = self._criar_no("LISTA_COMANDOS")
+        self._inicio_comandos = self.posicao
+        self._comandos_topo = []
+        self._analisar_comandos_topo(self._comandos_topo)
+        return self._montar_lista(lista, self._comandos_topo)
+    
+    def _analisar_comandos_topo(self, comandos: list, reaproveitar=None):
+        """
+        Analisa os comandos de nível superior a partir da posição atual e registra
+        em comandos uma tupla por comando, usada pela reanálise incremental:
+        (posição inicial, se o último erro foi nessa posição, nó do comando,
+        erros registrados antes dele, erros suprimidos antes dele, referências
+        registradas antes dele).
+        Se reaproveitar(posição) retornar True no início de um comando, os comandos
+        restantes já foram acrescentados por ele e a análise termina.
+        """
+        tipos = self.tipos
         
-        while self._token_atual() and self._token_atual().tipo != TokenType.EOF:
+        while tipos[self.posicao] not in self.FINAIS:
+            # Depois de um erro, descarta o restante do comando com falha
+            if self.em_recuperacao:
+                self._sincronizar()
+                continue
+            
             # Ignora quebras de linha
-            if self._verificar_token(TokenType.NEWLINE):
+            if tipos[self.posicao] == self.NEWLINE:
                 self._avancar()
                 continue
             
+            inicio = self.posicao
+            if reaproveitar is not None and reaproveitar(inicio):
+                return
+            erro_no_inicio = self.posicao_ultimo_erro == inicio
+            num_erros = len(self.erros_sintaticos)
+            num_suprimidos = self.erros_suprimidos
+            num_referencias = len(self.referencias)
+            
+            # Um comando inválido registra o erro e avança; a sincronização descarta o resto
             comando = self._analisar_comando()
+            comandos.append((inicio, erro_no_inicio, comando, num_erros, num_suprimidos, num_referencias))
+        
+        self._fim_comandos = self.posicao
+        self._num_erros_comandos = len(self.erros_sintaticos)
+        self._num_suprimidos_comandos = self.erros_suprimidos
+        self._num_referencias_comandos = len(self.referencias)
+    
+    def _montar_lista(self, lista: NoSintatico, comandos: list) -> Optional[NoSintatico]:
+        """Acrescenta à lista os nós dos comandos analisados (None se não houver nenhum)."""
+        vazia = True
+        for _, _, comando, _, _, _ in comandos:
             if comando:
                 lista.adicionar_filho(comando)
-            else:
-                # Se não conseguiu analisar comando, avança para evitar loop infinito
-                if self._token_atual():
-                    self._avancar()
-        
-        return lista if lista.filhos else None
+                vazia = False
+        return None if vazia else lista
     
     def _analisar_comando(self) -> Optional[NoSintatico]:
         """
         Comando -> DeclaracaoVariavel | Atribuicao | ComandoInput | ComandoOutput | 
                    EstruturaCondicional | EstruturaRepeticao | ComandoBreakLine | 
                    DeclaracaoFuncao | ChamadaFuncao
+        O comando é escolhido pela tabela tratadores_comando, indexada pelo tipo do token atual.
         """
+        return self.tratadores_comando[self.tipos[self.posicao]]()
+    
+    def _analisar_comando_identificador(self) -> NoSintatico:
+        # Chamada de função (identificador seguido de parênteses) ou atribuição
+        if self.tipos[self.posicao + 1] == self.ABRE_PARENT:
+            return self._analisar_chamada_funcao()
+        return self._analisar_atribuicao()
+    
+    def _analisar_comando_breakline(self) -> NoSintatico:
+        self._avancar()
+        return self._criar_no("COMANDO_BREAKLINE", "brkln")
+    
+    def _analisar_comando_invalido(self) -> None:
+        # Token não reconhecido para início de comando
         token = self._token_atual()
-        if not token:
-            return None
-        
-        if token.tipo == TokenType.TIPO_VAR:
-            return self._analisar_declaracao_variavel()
-        elif token.tipo == TokenType.FUNCTION:
-            return self._analisar_declaracao_funcao()
-        elif token.tipo == TokenType.IDENTIFICADOR:
-            # Verifica se é uma chamada de função (identificador seguido de parênteses)
-            if (self.posicao + 1 < len(self.tokens) and 
-                self.tokens[self.posicao + 1].tipo == TokenType.ABRE_PARENT):
-                return self._analisar_chamada_funcao()
-            else:
-                return self._analisar_atribuicao()
-        elif token.tipo == TokenType.INPUT:
-            return self._analisar_comando_input()
-        elif token.tipo == TokenType.WRT:
-            return self._analisar_comando_output()
-        elif token.tipo == TokenType.COND_SE:
-            return self._analisar_estrutura_condicional()
-        elif token.tipo in [TokenType.REP_PARA, TokenType.REP_ENQUANTO, TokenType.REP_RANGE]:
-            return self._analisar_estrutura_repeticao()
-        elif token.tipo == TokenType.PULAR_LINHA:
-            self._avancar()
-            return NoSintatico("COMANDO_BREAKLINE", "brkln")
-        else:
-            # Token não reconhecido para início de comando
-            erro = Token(
-                tipo=TokenType.ERRO_SINTAXE_COMANDO_INCOMPLETO,
-                lexema=token.lexema,
-                linha=token.linha,
-                coluna=token.coluna,
-                descricao=f"Token inesperado '{token.lexema}' não inicia um comando válido",
-                eh_erro=True
-            )
-            self.erros_sintaticos.append(erro)
-            self._avancar()
-            return None
+        self._registrar_erro(
+            TokenType.ERRO_SINTAXE_COMANDO_INCOMPLETO,
+            f"Token inesperado '{token.lexema}' não inicia um comando válido",
+            token
+        )
+        self._avancar()
+        return None
     
     def _analisar_declaracao_variavel(self) -> NoSintatico:
         """
         DeclaracaoVariavel -> TipoVar Identificador
         """
-        no = NoSintatico("DECLARACAO_VARIAVEL")
+        no = self._criar_no("DECLARACAO_VARIAVEL")
         
         # Tipo da variável
-        token_tipo = self._consumir_token(TokenType.TIPO_VAR, "Esperado tipo de variável")
+        token_tipo = self._consumir_token(self.TIPO_VAR, "Esperado tipo de variável")
         if token_tipo:
-            no_tipo = NoSintatico("TIPO", token_tipo.lexema, token=token_tipo)
+            no_tipo = self._no_token("TIPO", token_tipo)
             no.adicionar_filho(no_tipo)
         
         # Identificador
-        token_id = self._consumir_token(TokenType.IDENTIFICADOR, "Esperado identificador após tipo de variável")
+        token_id = self._consumir_token(self.IDENTIFICADOR, "Esperado identificador após tipo de variável")
         if token_id:
-            no_id = NoSintatico("IDENTIFICADOR", token_id.lexema, token=token_id)
+            no_id = self._no_token("IDENTIFICADOR", token_id)
             no.adicionar_filho(no_id)
+            if token_tipo:
+                self.referencias.append((self.REF_VARIAVEL, token_id, token_tipo.lexema))
         
         return no
     
@@ -318,19 +1380,20 @@ class AnalisadorSintatico:
         """
         Atribuicao -> Identificador '<=' Expressao
         """
-        no = NoSintatico("ATRIBUICAO")
+        no = self._criar_no("ATRIBUICAO")
         
         # Identificador
-        token_id = self._consumir_token(TokenType.IDENTIFICADOR, "Esperado identificador")
+        token_id = self._consumir_token(self.IDENTIFICADOR, "Esperado identificador")
         if token_id:
-            no_id = NoSintatico("IDENTIFICADOR", token_id.lexema, token=token_id)
+            no_id = self._no_token("IDENTIFICADOR", token_id)
             no.adicionar_filho(no_id)
+            self.referencias.append((self.REF_USO, token_id, None))
         
         # Operador de atribuição
-        if not self._consumir_token(TokenType.OPER_ATRIB, "Esperado operador de atribuição '<='"):
+        if not self._consumir_token(self.OPER_ATRIB, "Esperado operador de atribuição '<='"):
             return no
         
-        no_op = NoSintatico("OPERADOR_ATRIBUICAO", "<=")
+        no_op = self._criar_no("OPERADOR_ATRIBUICAO", "<=")
         no.adicionar_filho(no_op)
         
         # Expressão
@@ -344,28 +1407,29 @@ class AnalisadorSintatico:
         """
         DeclaracaoFuncao -> 'func' NomeFuncao '(' ')'
         """
-        no = NoSintatico("DECLARACAO_FUNCAO")
+        no = self._criar_no("DECLARACAO_FUNCAO")
         
         # 'func'
-        token_func = self._consumir_token(TokenType.FUNCTION, "Esperado 'func'")
+        token_func = self._consumir_token(self.FUNCTION, "Esperado 'func'")
         if token_func:
-            no_func = NoSintatico("PALAVRA_FUNC", token_func.lexema, token=token_func)
+            no_func = self._no_token("PALAVRA_FUNC", token_func)
             no.adicionar_filho(no_func)
         
         # Nome da função (identificador)
-        token_nome = self._consumir_token(TokenType.IDENTIFICADOR, "Esperado nome da função após 'func'")
+        token_nome = self._consumir_token(self.IDENTIFICADOR, "Esperado nome da função após 'func'")
         if token_nome:
-            no_nome = NoSintatico("NOME_FUNCAO", token_nome.lexema, token=token_nome)
+            no_nome = self._no_token("NOME_FUNCAO", token_nome)
             no.adicionar_filho(no_nome)
+            self.referencias.append((self.REF_FUNCAO, token_nome, "func"))
         
         # '('
-        if self._consumir_token(TokenType.ABRE_PARENT, "Esperado '(' após nome da função"):
-            no_abre = NoSintatico("ABRE_PARENTESES", "(")
+        if self._consumir_token(self.ABRE_PARENT, "Esperado '(' após nome da função"):
+            no_abre = self._criar_no("ABRE_PARENTESES", "(")
             no.adicionar_filho(no_abre)
         
         # ')'
-        if self._consumir_token(TokenType.FECHA_PARENT, "Esperado ')' para fechar declaração da função"):
-            no_fecha = NoSintatico("FECHA_PARENTESES", ")")
+        if self._consumir_token(self.FECHA_PARENT, "Esperado ')' para fechar declaração da função"):
+            no_fecha = self._criar_no("FECHA_PARENTESES", ")")
             no.adicionar_filho(no_fecha)
         
         return no
@@ -374,22 +1438,23 @@ class AnalisadorSintatico:
         """
         ChamadaFuncao -> Identificador '(' ')'
         """
-        no = NoSintatico("CHAMADA_FUNCAO")
+        no = self._criar_no("CHAMADA_FUNCAO")
         
         # Nome da função (identificador)
-        token_nome = self._consumir_token(TokenType.IDENTIFICADOR, "Esperado nome da função")
+        token_nome = self._consumir_token(self.IDENTIFICADOR, "Esperado nome da função")
         if token_nome:
-            no_nome = NoSintatico("NOME_FUNCAO", token_nome.lexema, token=token_nome)
+            no_nome = self._no_token("NOME_FUNCAO", token_nome)
             no.adicionar_filho(no_nome)
+            self.referencias.append((self.REF_CHAMADA, token_nome, None))
         
         # '('
-        if self._consumir_token(TokenType.ABRE_PARENT, "Esperado '(' após nome da função"):
-            no_abre = NoSintatico("ABRE_PARENTESES", "(")
+        if self._consumir_token(self.ABRE_PARENT, "Esperado '(' após nome da função"):
+            no_abre = self._criar_no("ABRE_PARENTESES", "(")
             no.adicionar_filho(no_abre)
         
         # ')'
-        if self._consumir_token(TokenType.FECHA_PARENT, "Esperado ')' para fechar chamada da função"):
-            no_fecha = NoSintatico("FECHA_PARENTESES", ")")
+        if self._consumir_token(self.FECHA_PARENT, "Esperado ')' para fechar chamada da função"):
+            no_fecha = self._criar_no("FECHA_PARENTESES", ")")
             no.adicionar_filho(no_fecha)
         
         return no
@@ -398,23 +1463,23 @@ class AnalisadorSintatico:
         """
         ComandoInput -> 'input' '(' Identificador ')'
         """
-        no = NoSintatico("COMANDO_INPUT")
+        no = self._criar_no("COMANDO_INPUT")
         
         # 'input'
-        self._consumir_token(TokenType.INPUT, "Esperado 'input'")
+        self._consumir_token(self.INPUT, "Esperado 'input'")
         
         # '('
-        if not self._consumir_token(TokenType.ABRE_PARENT, "Esperado '(' após 'input'"):
+        if not self._consumir_token(self.ABRE_PARENT, "Esperado '(' após 'input'"):
             return no
         
-        # Identificador
-        token_id = self._consumir_token(TokenType.IDENTIFICADOR, "Esperado identificador dentro dos parênteses")
+        # Identificador (a declaração é verificada pela regra comando_input do léxico)
+        token_id = self._consumir_token(self.IDENTIFICADOR, "Esperado identificador dentro dos parênteses")
         if token_id:
-            no_id = NoSintatico("IDENTIFICADOR", token_id.lexema, token=token_id)
+            no_id = self._no_token("IDENTIFICADOR", token_id)
             no.adicionar_filho(no_id)
         
         # ')'
-        self._consumir_token(TokenType.FECHA_PARENT, "Esperado ')' para fechar comando input")
+        self._consumir_token(self.FECHA_PARENT, "Esperado ')' para fechar comando input")
         
         return no
     
@@ -422,25 +1487,22 @@ class AnalisadorSintatico:
         """
         ComandoOutput -> 'wrt' Expressao
         """
-        no = NoSintatico("COMANDO_OUTPUT")
+        no = self._criar_no("COMANDO_OUTPUT")
         
         # 'wrt'
-        self._consumir_token(TokenType.WRT, "Esperado 'wrt'")
+        self._consumir_token(self.WRT, "Esperado 'wrt'")
         
         # Expressão (pode ser string, identificador, valor)
         expressao = self._analisar_expressao()
         if expressao:
             no.adicionar_filho(expressao)
         else:
-            erro = Token(
-                tipo=TokenType.ERRO_SINTAXE_COMANDO_WRT_MALFORMADO,
-                lexema="wrt",
-                linha=self._token_atual().linha if self._token_atual() else 1,
-                coluna=self._token_atual().coluna if self._token_atual() else 1,
-                descricao="Comando 'wrt' deve ser seguido por uma expressão válida",
-                eh_erro=True
+            self._registrar_erro(
+                TokenType.ERRO_SINTAXE_COMANDO_WRT_MALFORMADO,
+                "Comando 'wrt' deve ser seguido por uma expressão válida",
+                self._token_atual(),
+                "wrt"
             )
-            self.erros_sintaticos.append(erro)
         
         return no
     
@@ -450,10 +1512,10 @@ class AnalisadorSintatico:
                                ('!cdt+' '[' ExpressaoLogica ']' ListaComandos)* 
                                ('!cdt' ListaComandos)?
         """
-        no = NoSintatico("ESTRUTURA_CONDICIONAL")
+        no = self._criar_no("ESTRUTURA_CONDICIONAL")
         
         # 'cdt'
-        self._consumir_token(TokenType.COND_SE, "Esperado 'cdt'")
+        self._consumir_token(self.COND_SE, "Esperado 'cdt'")
         
         # Analisa condição principal
         condicao = self._analisar_condicao()
@@ -466,9 +1528,9 @@ class AnalisadorSintatico:
             no.adicionar_filho(comandos_if)
         
         # Analisa '!cdt+' (senãose) - pode ter múltiplos
-        while self._verificar_token(TokenType.COND_SENAOSE):
+        while self._verificar_token(self.COND_SENAOSE):
             self._avancar()
-            no_senaose = NoSintatico("SENAO_SE")
+            no_senaose = self._criar_no("SENAO_SE")
             
             condicao_senaose = self._analisar_condicao()
             if condicao_senaose:
@@ -481,9 +1543,9 @@ class AnalisadorSintatico:
             no.adicionar_filho(no_senaose)
         
         # Analisa '!cdt' (senão) - opcional
-        if self._verificar_token(TokenType.COND_SENAO):
+        if self._verificar_token(self.COND_SENAO):
             self._avancar()
-            no_senao = NoSintatico("SENAO")
+            no_senao = self._criar_no("SENAO")
             
             comandos_senao = self._analisar_bloco_comandos("COND_SENAO")
             if comandos_senao:
@@ -500,11 +1562,12 @@ class AnalisadorSintatico:
                              'repeat' Identificador 'in' Valor ListaComandos
         """
         token = self._token_atual()
-        no = NoSintatico("ESTRUTURA_REPETICAO")
+        tipo = self.tipos[self.posicao]
+        no = self._criar_no("ESTRUTURA_REPETICAO")
         
-        if token.tipo == TokenType.REP_PARA:  # cycle
+        if tipo == self.REP_PARA:  # cycle
             self._avancar()
-            no_tipo = NoSintatico("TIPO_REPETICAO", "cycle")
+            no_tipo = self._criar_no("TIPO_REPETICAO", "cycle")
             no.adicionar_filho(no_tipo)
             
             condicao = self._analisar_condicao()
@@ -515,9 +1578,9 @@ class AnalisadorSintatico:
             if comandos:
                 no.adicionar_filho(comandos)
                 
-        elif token.tipo == TokenType.REP_ENQUANTO:  # during
+        elif tipo == self.REP_ENQUANTO:  # during
             self._avancar()
-            no_tipo = NoSintatico("TIPO_REPETICAO", "during")
+            no_tipo = self._criar_no("TIPO_REPETICAO", "during")
             no.adicionar_filho(no_tipo)
             
             condicao = self._analisar_condicao()
@@ -528,32 +1591,30 @@ class AnalisadorSintatico:
             if comandos:
                 no.adicionar_filho(comandos)
                 
-        elif token.tipo == TokenType.REP_RANGE:  # repeat
+        elif tipo == self.REP_RANGE:  # repeat
             self._avancar()
-            no_tipo = NoSintatico("TIPO_REPETICAO", "repeat")
+            no_tipo = self._criar_no("TIPO_REPETICAO", "repeat")
             no.adicionar_filho(no_tipo)
             
             # Identificador
-            token_id = self._consumir_token(TokenType.IDENTIFICADOR, "Esperado identificador após 'repeat'")
+            token_id = self._consumir_token(self.IDENTIFICADOR, "Esperado identificador após 'repeat'")
             if token_id:
-                no_id = NoSintatico("IDENTIFICADOR", token_id.lexema, token=token_id)
+                no_id = self._no_token("IDENTIFICADOR", token_id)
                 no.adicionar_filho(no_id)
+                self.referencias.append((self.REF_USO, token_id, None))
             
             # 'in'
-            if self._verificar_token(TokenType.IN):
+            if self._verificar_token(self.IN):
                 self._avancar()
-                no_in = NoSintatico("PALAVRA_IN", "in")
+                no_in = self._criar_no("PALAVRA_IN", "in")
                 no.adicionar_filho(no_in)
             else:
-                erro = Token(
-                    tipo=TokenType.ERRO_SINTAXE_ESTRUTURA_REPETICAO_MALFORMADA,
-                    lexema="repeat",
-                    linha=token.linha,
-                    coluna=token.coluna,
-                    descricao="Esperado 'in' após identificador em comando 'repeat'",
-                    eh_erro=True
+                self._registrar_erro(
+                    TokenType.ERRO_SINTAXE_ESTRUTURA_REPETICAO_MALFORMADA,
+                    "Esperado 'in' após identificador em comando 'repeat'",
+                    token,
+                    "repeat"
                 )
-                self.erros_sintaticos.append(erro)
             
             # Valor
             valor = self._analisar_valor()
@@ -571,54 +1632,58 @@ class AnalisadorSintatico:
         Condicao -> '[' ExpressaoLogica ']'
         """
         # '['
-        if not self._consumir_token(TokenType.ABRE_COLCHETES, "Esperado '[' para iniciar condição"):
+        if not self._consumir_token(self.ABRE_COLCHETES, "Esperado '[' para iniciar condição"):
             return None
         
         # Expressão lógica
         expressao = self._analisar_expressao_logica()
         
         # ']'
-        self._consumir_token(TokenType.FECHA_COLCHETES, "Esperado ']' para fechar condição")
+        self._consumir_token(self.FECHA_COLCHETES, "Esperado ']' para fechar condição")
         
         return expressao
     
     def _analisar_bloco_comandos(self, contexto_pai: str = "") -> Optional[NoSintatico]:
         """Analisa um bloco de comandos até encontrar uma palavra-chave de fechamento."""
-        bloco = NoSintatico("BLOCO_COMANDOS")
-        
-        while self._token_atual() and self._token_atual().tipo != TokenType.EOF:
-            token = self._token_atual()
+        bloco = self._criar_no("BLOCO_COMANDOS")
+        vazio = True
+        tipos = self.tipos
+        
+        while tipos[self.posicao] not in self.FINAIS:
+            # Depois de um erro, descarta o restante do comando com falha
+            if self.em_recuperacao:
+                self._sincronizar()
+                continue
+            
+            tipo = tipos[self.posicao]
             
             # Ignora quebras de linha
-            if self._verificar_token(TokenType.NEWLINE):
+            if tipo == self.NEWLINE:
                 self._avancar()
                 continue
             
             # Para quando encontra tokens que finalizam blocos condicionais
-            if token.tipo in [TokenType.COND_SENAO, TokenType.COND_SENAOSE]:
+            if tipo in self.FINAIS_BLOCO_CONDICIONAL:
                 break
             
             # Para quando encontra uma nova estrutura de controle no mesmo nível 
             # (apenas se já temos comandos no bloco)
-            if (token.tipo in [TokenType.COND_SE, TokenType.REP_PARA, 
-                              TokenType.REP_ENQUANTO, TokenType.REP_RANGE] and 
-                len(bloco.filhos) > 0):
+            if tipo in self.ESTRUTURAS_CONTROLE and not vazio:
                 # Se estamos em um contexto de repetição e encontramos outra estrutura de controle,
                 # isso indica o fim do bloco de repetição
-                if contexto_pai in ["REP_PARA", "REP_ENQUANTO", "REP_RANGE"]:
+                if contexto_pai in self.CONTEXTOS_REPETICAO:
                     break
                 # Se estamos em um contexto condicional, só paramos em estruturas de mesmo nível
-                elif contexto_pai == "COND_SE" and token.tipo == TokenType.COND_SE:
+                elif contexto_pai == "COND_SE" and tipo == self.COND_SE:
                     break
             
+            # Um comando inválido registra o erro e avança; a sincronização descarta o resto
             comando = self._analisar_comando()
             if comando:
                 bloco.adicionar_filho(comando)
-            else:
-                # Se não conseguiu analisar comando, para para evitar loop infinito
-                break
+                vazio = False
         
-        return bloco if bloco.filhos else None
+        return None if vazio else bloco
     
     def _analisar_expressao_logica(self) -> Optional[NoSintatico]:
         """
@@ -628,26 +1693,21 @@ class AnalisadorSintatico:
         if not esq:
             return None
         
-        while (self._token_atual() and 
-               self._token_atual().tipo == TokenType.OPER_LOGICO):
+        while self.tipos[self.posicao] == self.OPER_LOGICO:
             op_token = self._avancar()
             dir = self._analisar_expressao_relacional()
             
             if dir:
-                no_op = NoSintatico("EXPRESSAO_LOGICA", op_token.lexema)
+                no_op = self._criar_no("EXPRESSAO_LOGICA", op_token.lexema)
                 no_op.adicionar_filho(esq)
                 no_op.adicionar_filho(dir)
                 esq = no_op
             else:
-                erro = Token(
-                    tipo=TokenType.ERRO_SINTAXE_EXPRESSAO_INVALIDA,
-                    lexema=op_token.lexema,
-                    linha=op_token.linha,
-                    coluna=op_token.coluna,
-                    descricao=f"Expressão incompleta após operador lógico '{op_token.lexema}'",
-                    eh_erro=True
+                self._registrar_erro(
+                    TokenType.ERRO_SINTAXE_EXPRESSAO_INVALIDA,
+                    f"Expressão incompleta após operador lógico '{op_token.lexema}'",
+                    op_token
                 )
-                self.erros_sintaticos.append(erro)
                 break
         
         return esq
@@ -660,99 +1720,97 @@ class AnalisadorSintatico:
         if not esq:
             return None
         
-        if (self._token_atual() and 
-            self._token_atual().tipo == TokenType.OP_REL):
+        if self.tipos[self.posicao] == self.OP_REL:
             op_token = self._avancar()
             dir = self._analisar_expressao()
             
             if dir:
-                no_op = NoSintatico("EXPRESSAO_RELACIONAL", op_token.lexema)
+                no_op = self._criar_no("EXPRESSAO_RELACIONAL", op_token.lexema)
                 no_op.adicionar_filho(esq)
                 no_op.adicionar_filho(dir)
                 return no_op
             else:
-                erro = Token(
-                    tipo=TokenType.ERRO_SINTAXE_EXPRESSAO_INVALIDA,
-                    lexema=op_token.lexema,
-                    linha=op_token.linha,
-                    coluna=op_token.coluna,
-                    descricao=f"Expressão incompleta após operador relacional '{op_token.lexema}'",
-                    eh_erro=True
+                self._registrar_erro(
+                    TokenType.ERRO_SINTAXE_EXPRESSAO_INVALIDA,
+                    f"Expressão incompleta após operador relacional '{op_token.lexema}'",
+                    op_token
                 )
-                self.erros_sintaticos.append(erro)
         
         return esq
     
     def _analisar_expressao(self) -> Optional[NoSintatico]:
         """
         Expressao -> Termo (OperadorMatematico Termo)*
+        Termo -> Valor | Identificador | '(' Expressao ')'
+        Análise iterativa por subida de precedência: todos os operadores matemáticos
+        têm a mesma precedência e associam à esquerda, então cada nível de
+        parênteses é um laço que acumula o operando esquerdo. Ao abrir '(' o nível
+        atual (operando esquerdo e operador pendente) é guardado em uma pilha
+        explícita, o que permite qualquer profundidade sem recursão.
         """
-        esq = self._analisar_termo()
-        if not esq:
-            return None
-        
-        while (self._token_atual() and 
-               self._token_atual().tipo == TokenType.OPER_MATEMATICO):
-            op_token = self._avancar()
-            dir = self._analisar_termo()
-            
-            if dir:
-                no_op = NoSintatico("EXPRESSAO_MATEMATICA", op_token.lexema)
-                no_op.adicionar_filho(esq)
-                no_op.adicionar_filho(dir)
-                esq = no_op
+        tipos = self.tipos
+        tokens = self.tokens
+        pilha = []  # Níveis suspensos por '(': (operando esquerdo, operador pendente)
+        esq = None
+        operador = None
+        
+        while True:
+            # Termo do nível atual
+            tipo = tipos[self.posicao]
+            if tipo == self.ABRE_PARENT:
+                self.posicao += 1
+                pilha.append((esq, operador))
+                esq = operador = None
+                continue
+            if tipo == self.IDENTIFICADOR:
+                token = tokens[self.posicao]
+                self.posicao += 1
+                termo = self._no_token("IDENTIFICADOR", token)
+                self.referencias.append((self.REF_USO, token, None))
             else:
-                erro = Token(
-                    tipo=TokenType.ERRO_SINTAXE_EXPRESSAO_INVALIDA,
-                    lexema=op_token.lexema,
-                    linha=op_token.linha,
-                    coluna=op_token.coluna,
-                    descricao=f"Expressão incompleta após operador matemático '{op_token.lexema}'",
-                    eh_erro=True
-                )
-                self.erros_sintaticos.append(erro)
-                break
-        
-        return esq
+                termo = self._analisar_valor()
+            
+            # Combina o termo com o nível atual; ao fechar um nível entre parênteses,
+            # seu resultado é o termo do nível de fora
+            while True:
+                fim_nivel = False
+                if operador is None:
+                    if termo is None:
+                        fim_nivel = True  # Nível sem nenhum termo
+                    else:
+                        esq = termo
+                elif termo is not None:
+                    esq = self._criar_no("EXPRESSAO_MATEMATICA", operador.lexema, [esq, termo])
+                    operador = None
+                else:
+                    self._registrar_erro(
+                        TokenType.ERRO_SINTAXE_EXPRESSAO_INVALIDA,
+                        f"Expressão incompleta após operador matemático '{operador.lexema}'",
+                        operador
+                    )
+                    fim_nivel = True
+                
+                if not fim_nivel and tipos[self.posicao] == self.OPER_MATEMATICO:
+                    operador = tokens[self.posicao]
+                    self.posicao += 1
+                    break  # Próximo termo do mesmo nível
+                
+                if not pilha:
+                    return esq
+                
+                # Fecha o nível entre parênteses e volta ao nível de fora
+                self._consumir_token(self.FECHA_PARENT, "Esperado ')' para fechar expressão")
+                termo = esq
+                esq, operador = pilha.pop()
     
-    def _analisar_termo(self) -> Optional[NoSintatico]:
+    def _analisar_valor(self) -> Optional[NoSintatico]:
         """
-        Termo -> Valor | Identificador | '(' Expressao ')'
+        Valor -> ValorInteiro | ValorReal | ValorTexto | ValorLogico
         """
-        token = self._token_atual()
-        if not token:
-            return None
-        
-        if token.tipo == TokenType.ABRE_PARENT:
-            # Expressão entre parênteses
-            self._avancar()
-            expressao = self._analisar_expressao()
-            self._consumir_token(TokenType.FECHA_PARENT, "Esperado ')' para fechar expressão")
-            return expressao
-        elif token.tipo == TokenType.IDENTIFICADOR:
-            self._avancar()
-            return NoSintatico("IDENTIFICADOR", token.lexema, token=token)
-        else:
-            return self._analisar_valor()
-    
-    def _analisar_valor(self) -> Optional[NoSintatico]:
-        """
-        Valor -> ValorInteiro | ValorReal | ValorTexto | ValorLogico
-        """
-        token = self._token_atual()
-        if not token:
-            return None
-        
-        if token.tipo in [TokenType.VALOR_INTEIRO, TokenType.VALOR_REAL, 
-                         TokenType.VALOR_TEXTO, TokenType.VALOR_LOGICO]:
-            self._avancar()
-            tipo_map = {
-                TokenType.VALOR_INTEIRO: "VALOR_INTEIRO",
-                TokenType.VALOR_REAL: "VALOR_REAL",
-                TokenType.VALOR_TEXTO: "VALOR_TEXTO",
-                TokenType.VALOR_LOGICO: "VALOR_LOGICO"
-            }
-            return NoSintatico(tipo_map[token.tipo], token.lexema, token=token)
+        tipo_no = self.NOS_VALOR.get(self.tipos[self.posicao])
+        if tipo_no:
+            token = self._avancar()
+            return self._no_token(tipo_no, token)
         
         return None
     
@@ -763,46 +1821,50 @@ class AnalisadorSintatico:
         
         return str(self.arvore_sintatica)
     
+    def escrever_arvore(self, destino: TextIO, profundidade_maxima: Optional[int] = None,
+                        max_nos: Optional[int] = None) -> None:
+        """Escreve a árvore sintática em destino, linha a linha, com EscritorArvore."""
+        if not self.arvore_sintatica:
+            destino.write("Nenhuma árvore sintática gerada.\n")
+            return
+        
+        EscritorArvore(profundidade_maxima, max_nos).escrever(self.arvore_sintatica, destino)
+    
     def validar_delimitadores(self) -> List[Token]:
-        """Valida se parênteses e colchetes estão balanceados."""
+        """
+        Valida se parênteses e colchetes estão balanceados, a partir do
+        indice_delimitadores (sem percorrer os tokens de novo).
+        """
+        indice = self.indice_delimitadores
+        tokens = self.tokens
         erros = []
-        pilha_parenteses = []
-        pilha_colchetes = []
         
-        for token in self.tokens:
-            if token.tipo == TokenType.ABRE_PARENT:
-                pilha_parenteses.append(token)
-            elif token.tipo == TokenType.FECHA_PARENT:
-                if not pilha_parenteses:
-                    erro = Token(
-                        tipo=TokenType.ERRO_SINTAXE_PARENTESES_NAO_FECHADOS,
-                        lexema=token.lexema,
-                        linha=token.linha,
-                        coluna=token.coluna,
-                        descricao="Parênteses de fechamento ')' sem abertura correspondente",
-                        eh_erro=True
-                    )
-                    erros.append(erro)
-                else:
-                    pilha_parenteses.pop()
-            elif token.tipo == TokenType.ABRE_COLCHETES:
-                pilha_colchetes.append(token)
-            elif token.tipo == TokenType.FECHA_COLCHETES:
-                if not pilha_colchetes:
-                    erro = Token(
-                        tipo=TokenType.ERRO_SINTAXE_COLCHETES_NAO_FECHADOS,
-                        lexema=token.lexema,
-                        linha=token.linha,
-                        coluna=token.coluna,
-                        descricao="Colchetes de fechamento ']' sem abertura correspondente",
-                        eh_erro=True
-                    )
-                    erros.append(erro)
-                else:
-                    pilha_colchetes.pop()
+        # Fechamentos sem abertura correspondente, na ordem dos tokens
+        for posicao in indice.fechamentos_sem_abertura:
+            token = tokens[posicao]
+            if self.tipos[posicao] == self.FECHA_PARENT:
+                erro = Token(
+                    tipo=TokenType.ERRO_SINTAXE_PARENTESES_NAO_FECHADOS,
+                    lexema=token.lexema,
+                    linha=token.linha,
+                    coluna=token.coluna,
+                    descricao="Parênteses de fechamento ')' sem abertura correspondente",
+                    eh_erro=True
+                )
+            else:
+                erro = Token(
+                    tipo=TokenType.ERRO_SINTAXE_COLCHETES_NAO_FECHADOS,
+                    lexema=token.lexema,
+                    linha=token.linha,
+                    coluna=token.coluna,
+                    descricao="Colchetes de fechamento ']' sem abertura correspondente",
+                    eh_erro=True
+                )
+            erros.append(erro)
         
         # Verifica parênteses não fechados
-        for token in pilha_parenteses:
+        for posicao in indice.parenteses_abertos:
+            token = tokens[posicao]
             erro = Token(
                 tipo=TokenType.ERRO_SINTAXE_PARENTESES_NAO_FECHADOS,
                 lexema=token.lexema,
@@ -814,7 +1876,8 @@ class AnalisadorSintatico:
             erros.append(erro)
         
         # Verifica colchetes não fechados
-        for token in pilha_colchetes:
+        for posicao in indice.colchetes_abertos:
+            token = tokens[posicao]
             erro = Token(
                 tipo=TokenType.ERRO_SINTAXE_COLCHETES_NAO_FECHADOS,
                 lexema=token.lexema,
@@ -825,7 +1888,894 @@ class AnalisadorSintatico:
             )
             erros.append(erro)
         
+        # Os erros de delimitadores entram no mesmo limite max_erros da análise
+        if self.max_erros is not None:
+            del erros[max(self.max_erros - len(self.erros_sintaticos), 0):]
+        
+        return erros
+    
+    def validar_simbolos(self) -> List[Token]:
+        """
+        Verifica as referências registradas durante a análise com a tabela_simbolos:
+        variáveis redeclaradas no mesmo escopo e o primeiro uso de cada variável ou
+        função que não é declarada em nenhum ponto do programa. A variável do
+        comando input já é verificada pela regra comando_input do analisador léxico.
+        """
+        tabela = self.tabela_simbolos
+        redeclaradas = {(simbolo.linha, simbolo.coluna): anterior for simbolo, anterior in tabela.redeclaracoes}
+        reportados = set()
+        erros = []
+        
+        for referencia, token, _ in self.referencias:
+            nome = token.lexema
+            if referencia == self.REF_USO:
+                if tabela.declarada(nome) or nome in reportados:
+                    continue
+                reportados.add(nome)
+                erros.append(Token(
+                    tipo=TokenType.ERRO_VARIAVEL_NAO_DECLARADA,
+                    lexema=nome,
+                    linha=token.linha,
+                    coluna=token.coluna,
+                    descricao=f"Variável '{nome}' não foi declarada",
+                    eh_erro=True
+                ))
+            elif referencia == self.REF_CHAMADA:
+                if nome in tabela.funcoes or nome + "()" in reportados:
+                    continue
+                reportados.add(nome + "()")
+                erros.append(Token(
+                    tipo=TokenType.ERRO_FUNCAO_NAO_DECLARADA,
+                    lexema=nome,
+                    linha=token.linha,
+                    coluna=token.coluna,
+                    descricao=f"Função '{nome}' não foi declarada",
+                    eh_erro=True
+                ))
+            elif referencia == self.REF_VARIAVEL and redeclaradas:
+                anterior = redeclaradas.get((token.linha, token.coluna))
+                if anterior is None:
+                    continue
+                escopo = f" na função '{anterior.escopo}'" if anterior.escopo else ""
+                erros.append(Token(
+                    tipo=TokenType.ERRO_VARIAVEL_REDECLARADA,
+                    lexema=nome,
+                    linha=token.linha,
+                    coluna=token.coluna,
+                    descricao=f"Variável '{nome}' já foi declarada{escopo} na linha {anterior.linha}",
+                    eh_erro=True
+                ))
+        
+        # Os erros semânticos entram no mesmo limite max_erros da análise
+        if self.max_erros is not None:
+            del erros[max(self.max_erros - len(self.erros_sintaticos), 0):]
+        
         return erros
+
+
+class IndiceLinha:
+    """
+    Índice pré-calculado de uma linha, consultado pelas verificações _verificar_*
+    do analisador léxico em O(1), sem reler nem fatiar a linha a cada coluna.
+    """
+    
+    # Sequência de caracteres coletada por um identificador (bem ou mal formado)
+    REGEX_SEQUENCIA = re.compile(r'[\w@]*')
+    # Palavra no formato de identificador seguida de fronteira de palavra
+    REGEX_PALAVRA = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*\b')
+    
+    def __init__(self, linha: str):
+        self.linha = linha
+        # Uma aspa só fica sem fechamento se for a última da linha
+        self.ultima_aspa = linha.rfind('"')
+        # Trecho entre o primeiro '[' e o último ']' da linha (contexto de condição)
+        self.primeiro_abre_colchete = linha.find('[')
+        self.ultimo_fecha_colchete = linha.rfind(']')
+        
+        # Última palavra calculada, compartilhada pelas verificações da mesma posição
+        self._palavra_posicao = -1
+        self._palavra = None
+        
+        # Sequência [_seq_inicio, _seq_fim) já calculada, com as posições da
+        # última '@' e do último caractere alfabético, '_' ou '@' dentro dela
+        self._seq_inicio = 0
+        self._seq_fim = 0
+        self._ultima_arroba = -1
+        self._ultima_alfa = -1
+    
+    def sequencia(self, posicao: int) -> Tuple[int, int, int]:
+        """
+        Retorna (fim, ultima_arroba, ultima_alfa) da sequência de caracteres
+        alfanuméricos, '_' e '@' que contém a posição.
+        Cada sequência é calculada uma única vez, mesmo quando consultada em
+        várias posições, o que mantém a análise da linha linear.
+        """
+        if not (self._seq_inicio <= posicao < self._seq_fim):
+            linha = self.linha
+            fim = self.REGEX_SEQUENCIA.match(linha, posicao).end()
+            
+            ultima_alfa = fim - 1
+            while ultima_alfa >= posicao and not (linha[ultima_alfa].isalpha() or linha[ultima_alfa] in '_@'):
+                ultima_alfa -= 1
+            
+            self._seq_inicio = posicao
+            self._seq_fim = fim
+            self._ultima_arroba = linha.rfind('@', posicao, fim)
+            self._ultima_alfa = ultima_alfa
+        
+        return self._seq_fim, self._ultima_arroba, self._ultima_alfa
+    
+    def palavra(self, posicao: int) -> Optional[str]:
+        """Retorna a palavra no formato de identificador que começa na posição, se houver."""
+        if posicao != self._palavra_posicao:
+            match = self.REGEX_PALAVRA.match(self.linha, posicao)
+            self._palavra = match.group(0) if match else None
+            self._palavra_posicao = posicao
+        return self._palavra
+    
+    def dentro_de_colchetes(self, posicao: int) -> bool:
+        """Indica se há um '[' antes da posição e um ']' nela ou depois, na mesma linha."""
+        return 0 <= self.primeiro_abre_colchete < posicao <= self.ultimo_fecha_colchete
+
+
+def _substituir_nao_latin1(erro: UnicodeEncodeError) -> Tuple[str, int]:
+    """Tratador de codificação que troca caracteres fora do Latin-1 por '\xff' (classe NAO_ASCII)."""
+    return '\xff' * (erro.end - erro.start), erro.end
+
+
+codecs.register_error('alaias_nao_latin1', _substituir_nao_latin1)
+
+
+# Palavras reservadas, tipos, valores lógicos e operadores escritos como palavras.
+# Uma palavra reconhecida uma única vez é classificada por esta tabela (somente leitura).
+PALAVRAS_RESERVADAS = MappingProxyType({
+    'als': TokenType.INICIO,
+    'cdt': TokenType.COND_SE,
+    'cycle': TokenType.REP_PARA,
+    'during': TokenType.REP_ENQUANTO,
+    'repeat': TokenType.REP_RANGE,
+    'wrt': TokenType.WRT,
+    'input': TokenType.INPUT,
+    'func': TokenType.FUNCTION,
+    'brkln': TokenType.PULAR_LINHA,
+    'in': TokenType.IN,
+    'intn': TokenType.TIPO_VAR, 'den': TokenType.TIPO_VAR, 'txt': TokenType.TIPO_VAR,
+    'bln': TokenType.TIPO_VAR, 'crt': TokenType.TIPO_VAR,
+    'valid': TokenType.VALOR_LOGICO, 'invalid': TokenType.VALOR_LOGICO,
+    'gt': TokenType.OP_REL, 'eq': TokenType.OP_REL, 'ne': TokenType.OP_REL,
+    'lt': TokenType.OP_REL, 'ge': TokenType.OP_REL, 'le': TokenType.OP_REL,
+    'and': TokenType.OPER_LOGICO, 'or': TokenType.OPER_LOGICO,
+})
+
+
+# Operadores relacionais escritos de forma errada (dentro de uma condição) e a
+# sugestão de correção. 'ge' e 'le' são operadores válidos e não aparecem aqui.
+OPERADORES_RELACIONAIS_MALFORMADOS = MappingProxyType({
+    'e': 'eq',      # "e" em vez de "eq" (igual)
+    'g': 'gt',      # "g" em vez de "gt" (maior que)
+    'l': 'lt',      # "l" em vez de "lt" (menor que)
+    'n': 'ne',      # "n" em vez de "ne" (não igual)
+    'igual': 'eq',  # palavra em português
+    'maior': 'gt',  # palavra em português
+    'menor': 'lt',  # palavra em português
+})
+
+# Erros comuns de palavras reservadas e a sugestão de correção
+PALAVRAS_RESERVADAS_MALFORMADAS = MappingProxyType({
+    'wr': 'wrt',        # "wr" em vez de "wrt"
+    'wt': 'wrt',        # "wt" em vez de "wrt"
+    'write': 'wrt',     # palavra em inglês
+    'inp': 'input',     # "inp" em vez de "input"
+    'read': 'input',    # palavra em inglês
+    'scanf': 'input',   # referência C
+    'int': 'intn',      # "int" em vez de "intn"
+    'cd': 'cdt',        # "cd" em vez de "cdt"
+    'if': 'cdt',        # palavra em inglês
+    'else': '!cdt',     # palavra em inglês
+    'elseif': '!cdt+',  # palavra em inglês
+    'al': 'als',        # "al" em vez de "als"
+    'start': 'als',     # palavra em inglês
+    'function': 'func', # "function" em vez de "func"
+    'fn': 'func',       # "fn" em vez de "func"
+})
+
+
+class AutomatoLexico:
+    """
+    Autômato finito determinístico usado pelo motor léxico "afd".
+    Cada caractere é convertido em uma classe pela tabela de 256 posições
+    TABELA_CLASSES e o reconhecimento segue a tabela de transições estado x classe,
+    com a regra do maior lexema (último estado de aceitação visitado).
+    """
+    
+    # Classes de caracteres
+    (C_OUTRO, C_LETRA, C_LETRA_C, C_LETRA_D, C_LETRA_T, C_SUBLINHADO, C_DIGITO,
+     C_PONTO, C_ASPA, C_MENOS, C_MAIS, C_OPER, C_MENOR, C_IGUAL, C_EXCLAMACAO,
+     C_ESPACO, C_ABRE_PARENT, C_FECHA_PARENT, C_ABRE_COLCHETES, C_FECHA_COLCHETES,
+     C_VIRGULA, C_ARROBA, C_NAO_ASCII) = range(23)
+    NUM_CLASSES = 23
+    
+    # Estados (0 é o estado morto: não há transição)
+    (E_MORTO, E_INICIAL, E_PALAVRA, E_INTEIRO, E_PONTO, E_REAL, E_STRING,
+     E_STRING_FIM, E_MENOS, E_COMENTARIO, E_OPER, E_MENOR, E_ATRIB, E_EXCLAMACAO,
+     E_EXCLAMACAO_C, E_EXCLAMACAO_CD, E_SENAO, E_SENAOSE, E_ESPACO, E_ABRE_PARENT,
+     E_FECHA_PARENT, E_ABRE_COLCHETES, E_FECHA_COLCHETES, E_VIRGULA, E_SIMBOLO,
+     E_NAO_ASCII) = range(26)
+    NUM_ESTADOS = 26
+    
+    # Tipos de lexema reconhecidos nos estados de aceitação (0 = não aceita)
+    (K_NENHUM, K_PALAVRA, K_NUMERO, K_TEXTO, K_COMENTARIO, K_TOKEN, K_ESPACO,
+     K_SIMBOLO, K_VERIFICAR) = range(9)
+    
+    PALAVRAS_RESERVADAS = PALAVRAS_RESERVADAS
+    
+    def __init__(self):
+        self.TABELA_CLASSES = self._construir_tabela_classes()
+        self.transicoes, self.aceitacao = self._construir_transicoes()
+        
+        # Tipo de token dos estados que reconhecem um token de lexema fixo
+        self.tipo_estado = {
+            self.E_MENOS: TokenType.OPER_MATEMATICO,
+            self.E_OPER: TokenType.OPER_MATEMATICO,
+            self.E_ATRIB: TokenType.OPER_ATRIB,
+            self.E_SENAO: TokenType.COND_SENAO,
+            self.E_SENAOSE: TokenType.COND_SENAOSE,
+            self.E_ABRE_PARENT: TokenType.ABRE_PARENT,
+            self.E_FECHA_PARENT: TokenType.FECHA_PARENT,
+            self.E_ABRE_COLCHETES: TokenType.ABRE_COLCHETES,
+            self.E_FECHA_COLCHETES: TokenType.FECHA_COLCHETES,
+            self.E_VIRGULA: TokenType.VIRGULA,
+        }
+        
+        # Classes que formam palavras (fronteira de palavra) e classes que, logo
+        # após uma palavra ou número, podem gerar erro de formação
+        palavra = {self.C_LETRA, self.C_LETRA_C, self.C_LETRA_D, self.C_LETRA_T,
+                   self.C_SUBLINHADO, self.C_DIGITO, self.C_NAO_ASCII}
+        self.classes_palavra = frozenset(palavra)
+        self.seguintes_palavra_suspeitos = frozenset({self.C_ARROBA, self.C_NAO_ASCII})
+        self.seguintes_numero_suspeitos = frozenset(palavra | {self.C_PONTO, self.C_ARROBA})
+    
+    def _construir_tabela_classes(self) -> bytes:
+        """Monta a tabela de 256 posições que associa cada byte Latin-1 à sua classe."""
+        tabela = bytearray([self.C_OUTRO] * 256)
+        for codigo in range(128, 256):
+            tabela[codigo] = self.C_NAO_ASCII
+        for char in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ':
+            tabela[ord(char)] = self.C_LETRA
+        tabela[ord('c')] = self.C_LETRA_C
+        tabela[ord('d')] = self.C_LETRA_D
+        tabela[ord('t')] = self.C_LETRA_T
+        for char in '0123456789':
+            tabela[ord(char)] = self.C_DIGITO
+        for char, classe in (('_', self.C_SUBLINHADO), ('.', self.C_PONTO), ('"', self.C_ASPA),
+                             ('-', self.C_MENOS), ('+', self.C_MAIS), ('*', self.C_OPER),
+                             ('/', self.C_OPER), ('<', self.C_MENOR), ('=', self.C_IGUAL),
+                             ('!', self.C_EXCLAMACAO), (' ', self.C_ESPACO), ('\t', self.C_ESPACO),
+                             ('(', self.C_ABRE_PARENT), (')', self.C_FECHA_PARENT),
+                             ('[', self.C_ABRE_COLCHETES), (']', self.C_FECHA_COLCHETES),
+                             (',', self.C_VIRGULA), ('@', self.C_ARROBA)):
+            tabela[ord(char)] = classe
+        return bytes(tabela)
+    
+    def _construir_transicoes(self) -> Tuple[List[int], bytes]:
+        """Monta a tabela de transições (estado * NUM_CLASSES + classe) e a de aceitação."""
+        transicoes = [self.E_MORTO] * (self.NUM_ESTADOS * self.NUM_CLASSES)
+        aceitacao = bytearray(self.NUM_ESTADOS)
+        
+        def transicao(estado, classes, destino):
+            for classe in classes:
+                transicoes[estado * self.NUM_CLASSES + classe] = destino
+        
+        todas = range(self.NUM_CLASSES)
+        letras = (self.C_LETRA, self.C_LETRA_C, self.C_LETRA_D, self.C_LETRA_T, self.C_SUBLINHADO)
+        
+        # Estado inicial
+        transicao(self.E_INICIAL, letras, self.E_PALAVRA)
+        transicao(self.E_INICIAL, (self.C_DIGITO,), self.E_INTEIRO)
+        transicao(self.E_INICIAL, (self.C_ASPA,), self.E_STRING)
+        transicao(self.E_INICIAL, (self.C_MENOS,), self.E_MENOS)
+        transicao(self.E_INICIAL, (self.C_MAIS, self.C_OPER), self.E_OPER)
+        transicao(self.E_INICIAL, (self.C_MENOR,), self.E_MENOR)
+        transicao(self.E_INICIAL, (self.C_EXCLAMACAO,), self.E_EXCLAMACAO)
+        transicao(self.E_INICIAL, (self.C_ESPACO,), self.E_ESPACO)
+        transicao(self.E_INICIAL, (self.C_ABRE_PARENT,), self.E_ABRE_PARENT)
+        transicao(self.E_INICIAL, (self.C_FECHA_PARENT,), self.E_FECHA_PARENT)
+        transicao(self.E_INICIAL, (self.C_ABRE_COLCHETES,), self.E_ABRE_COLCHETES)
+        transicao(self.E_INICIAL, (self.C_FECHA_COLCHETES,), self.E_FECHA_COLCHETES)
+        transicao(self.E_INICIAL, (self.C_VIRGULA,), self.E_VIRGULA)
+        transicao(self.E_INICIAL, (self.C_OUTRO, self.C_PONTO, self.C_IGUAL, self.C_ARROBA), self.E_SIMBOLO)
+        transicao(self.E_INICIAL, (self.C_NAO_ASCII,), self.E_NAO_ASCII)
+        
+        # Palavras e números
+        transicao(self.E_PALAVRA, letras + (self.C_DIGITO,), self.E_PALAVRA)
+        transicao(self.E_INTEIRO, (self.C_DIGITO,), self.E_INTEIRO)
+        transicao(self.E_INTEIRO, (self.C_PONTO,), self.E_PONTO)
+        transicao(self.E_PONTO, (self.C_DIGITO,), self.E_REAL)
+        transicao(self.E_REAL, (self.C_DIGITO,), self.E_REAL)
+        
+        # Strings e comentários
+        transicao(self.E_STRING, todas, self.E_STRING)
+        transicao(self.E_STRING, (self.C_ASPA,), self.E_STRING_FIM)
+        transicao(self.E_MENOS, (self.C_MENOS,), self.E_COMENTARIO)
+        transicao(self.E_COMENTARIO, todas, self.E_COMENTARIO)
+        
+        # Operadores: '<=', '!cdt' e '!cdt+'
+        transicao(self.E_MENOR, (self.C_IGUAL,), self.E_ATRIB)
+        transicao(self.E_EXCLAMACAO, (self.C_LETRA_C,), self.E_EXCLAMACAO_C)
+        transicao(self.E_EXCLAMACAO_C, (self.C_LETRA_D,), self.E_EXCLAMACAO_CD)
+        transicao(self.E_EXCLAMACAO_CD, (self.C_LETRA_T,), self.E_SENAO)
+        transicao(self.E_SENAO, (self.C_MAIS,), self.E_SENAOSE)
+        transicao(self.E_ESPACO, (self.C_ESPACO,), self.E_ESPACO)
+        
+        aceitacao[self.E_PALAVRA] = self.K_PALAVRA
+        aceitacao[self.E_INTEIRO] = self.K_NUMERO
+        aceitacao[self.E_REAL] = self.K_NUMERO
+        aceitacao[self.E_STRING_FIM] = self.K_TEXTO
+        aceitacao[self.E_COMENTARIO] = self.K_COMENTARIO
+        aceitacao[self.E_ESPACO] = self.K_ESPACO
+        aceitacao[self.E_MENOR] = self.K_SIMBOLO
+        aceitacao[self.E_EXCLAMACAO] = self.K_SIMBOLO
+        aceitacao[self.E_SIMBOLO] = self.K_SIMBOLO
+        aceitacao[self.E_NAO_ASCII] = self.K_VERIFICAR
+        for estado in (self.E_MENOS, self.E_OPER, self.E_ATRIB, self.E_SENAO, self.E_SENAOSE,
+                       self.E_ABRE_PARENT, self.E_FECHA_PARENT, self.E_ABRE_COLCHETES,
+                       self.E_FECHA_COLCHETES, self.E_VIRGULA):
+            aceitacao[estado] = self.K_TOKEN
+        
+        return transicoes, bytes(aceitacao)
+    
+    def classes(self, linha: str) -> bytes:
+        """Converte a linha na sequência de classes de seus caracteres."""
+        return linha.encode('latin-1', 'alaias_nao_latin1').translate(self.TABELA_CLASSES)
+
+
+class RegraValidacao:
+    """
+    Regra de validação do programa completo. Todas as regras ativas são
+    alimentadas pelo mesmo percurso dos tokens (AnalisadorLexico._validar_tokens):
+    - consumir(token) recebe cada token, inclusive os erros das regras anteriores;
+    - finalizar() retorna os erros encontrados, emitidos depois do EOF na ordem
+      das regras.
+    Regras com antes_dos_tokens = True têm os erros emitidos antes de todos os
+    tokens; elas indicam em decidido quando o resultado não muda mais, e os tokens
+    só ficam retidos até todas decidirem.
+    Regras com usa_tabela_simbolos = True consultam as declarações em
+    tabela_simbolos, uma TabelaSimbolos única do percurso, que recebe cada token
+    antes das regras.
+    Novas regras são incluídas com AnalisadorLexico.registrar_regra().
+    """
+    
+    nome = ""
+    antes_dos_tokens = False
+    decidido = True
+    usa_tabela_simbolos = False
+    tabela_simbolos = None
+    
+    def consumir(self, token: Token) -> None:
+        pass
+    
+    def finalizar(self) -> List[Token]:
+        return []
+
+
+class ValidadorInicioPrograma(RegraValidacao):
+    """
+    Verifica, token a token, se o primeiro token significativo do programa é 'als'.
+    A decisão é tomada assim que esse token aparece (decidido = True).
+    """
+    
+    nome = "inicio_programa"
+    antes_dos_tokens = True
+    IGNORADOS = frozenset({TokenType.COMENTARIO, TokenType.WHITESPACE, TokenType.NEWLINE, TokenType.EOF})
+    
+    def __init__(self):
+        self.decidido = False
+        self.erro = None
+    
+    def consumir(self, token: Token) -> None:
+        # Ignora tokens que não são significativos para a estrutura
+        if self.decidido or token.tipo in self.IGNORADOS:
+            return
+        
+        self.decidido = True
+        # O primeiro token significativo deve ser 'als'
+        if token.tipo != TokenType.INICIO:
+            self.erro = Token(
+                tipo=TokenType.ERRO_PROGRAMA_SEM_INICIO,
+                lexema="",
+                linha=token.linha,
+                coluna=token.coluna,
+                descricao="Programa deve começar com a palavra reservada 'als'",
+                eh_erro=True
+            )
+    
+    def finalizar(self) -> List[Token]:
+        if not self.decidido:
+            # Não há tokens significativos
+            self.decidido = True
+            self.erro = Token(
+                tipo=TokenType.ERRO_PROGRAMA_SEM_INICIO,
+                lexema="",
+                linha=1,
+                coluna=1,
+                descricao="Programa deve começar com a palavra reservada 'als'",
+                eh_erro=True
+            )
+        return [self.erro] if self.erro else []
+
+
+class ValidadorTiposVariaveis(RegraValidacao):
+    """
+    Verifica, token a token, se as atribuições respeitam o tipo declarado da variável.
+    Mantém apenas uma janela de três tokens; o tipo é o da última declaração
+    anterior à atribuição na tabela_simbolos.
+    """
+    
+    nome = "tipos_variaveis"
+    usa_tabela_simbolos = True
+    
+    def __init__(self):
+        self.janela = deque()
+        self.erros = []
+    
+    def consumir(self, token: Token) -> None:
+        self.janela.append(token)
+        if len(self.janela) == 3:
+            self._avancar()
+    
+    def finalizar(self) -> List[Token]:
+        while self.janela:
+            self._avancar()
+        return self.erros
+    
+    def _avancar(self) -> None:
+        janela = self.janela
+        token_atual = janela[0]
+        
+        # Declaração de variável (tipo identificador), já registrada na tabela_simbolos
+        if (token_atual.tipo == TokenType.TIPO_VAR and
+            len(janela) > 1 and
+            janela[1].tipo == TokenType.IDENTIFICADOR):
+            janela.popleft()
+            janela.popleft()
+            return
+        
+        # Identifica atribuição: identificador <= valor
+        if (token_atual.tipo == TokenType.IDENTIFICADOR and
+            len(janela) > 2 and
+            janela[1].tipo == TokenType.OPER_ATRIB):
+            self._validar_atribuicao(token_atual, janela[2])
+            janela.clear()
+            return
+        
+        janela.popleft()
+    
+    def _validar_atribuicao(self, token_atual: Token, valor_token: Token) -> None:
+        nome_var = token_atual.lexema
+        
+        # Verifica se a variável foi declarada antes da atribuição
+        tipo_var = self.tabela_simbolos.tipo_antes(nome_var, token_atual.linha, token_atual.coluna)
+        if tipo_var is None:
+            return
+        
+        # Validação de tipos
+        erro = None
+        if tipo_var == "intn" and valor_token.tipo == TokenType.VALOR_REAL:
+            erro = Token(
+                tipo=TokenType.ERRO_TIPO_INCOMPATIVEL,
+                lexema=f"{nome_var} <= {valor_token.lexema}",
+                linha=token_atual.linha,
+                coluna=token_atual.coluna,
+                descricao=f"Variável '{nome_var}' do tipo 'intn' não pode receber valor decimal '{valor_token.lexema}'. Use tipo 'den' para valores decimais.",
+                eh_erro=True
+            )
+        elif tipo_var == "bln" and valor_token.tipo not in [TokenType.VALOR_LOGICO]:
+            erro = Token(
+                tipo=TokenType.ERRO_TIPO_INCOMPATIVEL,
+                lexema=f"{nome_var} <= {valor_token.lexema}",
+                linha=token_atual.linha,
+                coluna=token_atual.coluna,
+                descricao=f"Variável '{nome_var}' do tipo 'bln' só pode receber valores lógicos (valid/invalid).",
+                eh_erro=True
+            )
+        elif tipo_var == "txt" and valor_token.tipo != TokenType.VALOR_TEXTO:
+            erro = Token(
+                tipo=TokenType.ERRO_TIPO_INCOMPATIVEL,
+                lexema=f"{nome_var} <= {valor_token.lexema}",
+                linha=token_atual.linha,
+                coluna=token_atual.coluna,
+                descricao=f"Variável '{nome_var}' do tipo 'txt' só pode receber valores de texto entre aspas.",
+                eh_erro=True
+            )
+        
+        if erro:
+            self.erros.append(erro)
+
+
+class ValidadorExpressoesCondicionais(RegraValidacao):
+    """
+    Verifica, token a token, as expressões entre colchetes: operadores relacionais
+    ausentes e operadores lógicos sem expressão relacional completa.
+    Guarda apenas os dois últimos elementos da condição e os operadores lógicos
+    que ainda podem estar entre os três últimos elementos.
+    """
+    
+    nome = "expressoes_condicionais"
+    VALORES = frozenset({TokenType.IDENTIFICADOR, TokenType.VALOR_INTEIRO, TokenType.VALOR_REAL})
+    
+    def __init__(self):
+        self.erros = []
+        self.em_condicao = False
+    
+    def consumir(self, token: Token) -> None:
+        # Procura por abertura de colchetes
+        if not self.em_condicao:
+            if token.tipo == TokenType.ABRE_COLCHETES:
+                self._abrir_condicao()
+            return
+        
+        if token.tipo == TokenType.FECHA_COLCHETES:
+            self._fechar_condicao()
+            return
+        
+        # Ignora whitespace e newlines
+        if token.tipo in (TokenType.WHITESPACE, TokenType.NEWLINE):
+            return
+        
+        posicao = self.num_elementos
+        
+        # Verifica se são dois valores/identificadores consecutivos
+        # sem operador relacional ou lógico entre eles
+        anterior = self.anterior
+        if anterior is not None and anterior.tipo in self.VALORES and token.tipo in self.VALORES:
+            # Verifica se não há operador lógico anterior que justifique
+            tem_operador_logico = (self.antes_anterior is not None and
+                                   self.antes_anterior.tipo == TokenType.OPER_LOGICO)
+            if not tem_operador_logico:
+                erro = Token(
+                    tipo=TokenType.ERRO_OPERADOR_RELACIONAL_AUSENTE,
+                    lexema=f"{anterior.lexema} {token.lexema}",
+                    linha=anterior.linha,
+                    coluna=anterior.coluna,
+                    descricao=f"Operador relacional ausente entre '{anterior.lexema}' e '{token.lexema}'. Use: gt, eq, ne, lt, ge, le",
+                    eh_erro=True
+                )
+                self.erros_pares.append(erro)
+        
+        # Se encontrou um operador lógico (AND/OR)
+        if token.tipo == TokenType.OPER_LOGICO:
+            erro_anterior = None
+            if posicao < 3:  # Precisa de pelo menos: valor op_rel valor AND
+                erro_anterior = Token(
+                    tipo=TokenType.ERRO_OPERADOR_RELACIONAL_AUSENTE,
+                    lexema=token.lexema,
+                    linha=token.linha,
+                    coluna=token.coluna,
+                    descricao=f"Operador lógico '{token.lexema}' sem expressão relacional completa anterior",
+                    eh_erro=True
+                )
+            self.logicos_pendentes.append((posicao, token, erro_anterior))
+        
+        # Operadores lógicos com três elementos depois já têm expressão posterior completa
+        while self.logicos_pendentes and self.logicos_pendentes[0][0] + 3 <= posicao:
+            _, _, erro_anterior = self.logicos_pendentes.popleft()
+            if erro_anterior:
+                self.erros_logicos.append(erro_anterior)
+        
+        self.antes_anterior = anterior
+        self.anterior = token
+        self.num_elementos += 1
+    
+    def finalizar(self) -> List[Token]:
+        # Colchete sem fechamento: a condição vai até o fim dos tokens
+        if self.em_condicao:
+            self._fechar_condicao()
+        return self.erros
+    
+    def _abrir_condicao(self) -> None:
+        self.em_condicao = True
+        self.num_elementos = 0
+        self.anterior = None
+        self.antes_anterior = None
+        self.erros_pares = []
+        self.erros_logicos = []
+        self.logicos_pendentes = deque()
+    
+    def _fechar_condicao(self) -> None:
+        # Os operadores ainda pendentes estão entre os três últimos elementos
+        for _, token, erro_anterior in self.logicos_pendentes:
+            if erro_anterior:
+                self.erros_logicos.append(erro_anterior)
+            # Precisa de pelo menos: AND valor op_rel valor
+            self.erros_logicos.append(Token(
+                tipo=TokenType.ERRO_OPERADOR_RELACIONAL_AUSENTE,
+                lexema=token.lexema,
+                linha=token.linha,
+                coluna=token.coluna,
+                descricao=f"Operador lógico '{token.lexema}' sem expressão relacional completa posterior",
+                eh_erro=True
+            ))
+        
+        self.erros.extend(self.erros_pares)
+        self.erros.extend(self.erros_logicos)
+        self.em_condicao = False
+
+
+class ValidadorComandoInput(RegraValidacao):
+    """
+    Verifica, token a token, a sintaxe do comando input(variavel) e se a variável
+    foi declarada. Como a declaração pode aparecer depois do comando, os erros de
+    variável não declarada só são confirmados em finalizar().
+    """
+    
+    nome = "comando_input"
+    usa_tabela_simbolos = True
+    
+    # Estados: fora de um comando input, após 'input', após '(' e após a variável
+    FORA, APOS_INPUT, APOS_ABRE, APOS_VARIAVEL = range(4)
+    
+    def __init__(self):
+        self.erros = []
+        self.nao_declaradas = []  # [(indice do erro em self.erros, nome_variavel)]
+        self.estado = self.FORA
+        self.token_input = None
+        self.nome_variavel = ""
+    
+    def consumir(self, token: Token) -> None:
+        self._validar(token)
+    
+    def finalizar(self) -> List[Token]:
+        # Comando input interrompido pelo fim dos tokens
+        if self.estado == self.APOS_INPUT:
+            self._erro_sintaxe("input", "Comando 'input' deve ser seguido por parênteses: input(variavel)")
+        elif self.estado == self.APOS_ABRE:
+            self.erros.append(Token(
+                tipo=TokenType.ERRO_INPUT_SEM_VARIAVEL,
+                lexema="input(",
+                linha=self.token_input.linha,
+                coluna=self.token_input.coluna,
+                descricao="Comando 'input' sem variável especificada",
+                eh_erro=True
+            ))
+        elif self.estado == self.APOS_VARIAVEL:
+            self._erro_sintaxe(f"input({self.nome_variavel}", "Comando 'input' deve ser fechado com parênteses: input(variavel)")
+        self.estado = self.FORA
+        
+        # Descarta os erros de variáveis declaradas depois do comando input
+        declarada = self.tabela_simbolos.declarada
+        descartados = {indice for indice, nome in self.nao_declaradas if declarada(nome)}
+        return [erro for indice, erro in enumerate(self.erros) if indice not in descartados]
+    
+    def _validar(self, token: Token) -> None:
+        if self.estado == self.FORA:
+            if token.tipo == TokenType.INPUT:
+                self.token_input = token
+                self.estado = self.APOS_INPUT
+            return
+        
+        # Pula whitespace
+        if token.tipo == TokenType.WHITESPACE:
+            return
+        
+        if self.estado == self.APOS_INPUT:
+            # Verifica se há parênteses após input
+            if token.tipo == TokenType.ABRE_PARENT:
+                self.estado = self.APOS_ABRE
+                return
+            self._erro_sintaxe("input", "Comando 'input' deve ser seguido por parênteses: input(variavel)")
+            # O token seguinte ao input ainda pode iniciar outro comando input
+            self.estado = self.FORA
+            self._validar(token)
+        
+        elif self.estado == self.APOS_ABRE:
+            # Deve ter um identificador
+            if token.tipo != TokenType.IDENTIFICADOR:
+                self.erros.append(Token(
+                    tipo=TokenType.ERRO_INPUT_SEM_VARIAVEL,
+                    lexema=f"input({token.lexema}",
+                    linha=self.token_input.linha,
+                    coluna=self.token_input.coluna,
+                    descricao="Comando 'input' deve conter uma variável válida entre parênteses",
+                    eh_erro=True
+                ))
+                self.estado = self.FORA
+                return
+            
+            # Verifica se a variável foi declarada (confirmado em finalizar)
+            self.nome_variavel = token.lexema
+            if not self.tabela_simbolos.declarada(self.nome_variavel):
+                self.nao_declaradas.append((len(self.erros), self.nome_variavel))
+                self.erros.append(Token(
+                    tipo=TokenType.ERRO_INPUT_VARIAVEL_NAO_DECLARADA,
+                    lexema=f"input({self.nome_variavel})",
+                    linha=self.token_input.linha,
+                    coluna=self.token_input.coluna,
+                    descricao=f"Variável '{self.nome_variavel}' não foi declarada antes do comando input",
+                    eh_erro=True
+                ))
+            self.estado = self.APOS_VARIAVEL
+        
+        elif self.estado == self.APOS_VARIAVEL:
+            # Deve ter parêntese de fechamento
+            if token.tipo != TokenType.FECHA_PARENT:
+                self._erro_sintaxe(f"input({self.nome_variavel}", "Comando 'input' deve ser fechado com parênteses: input(variavel)")
+            self.estado = self.FORA
+    
+    def _erro_sintaxe(self, lexema: str, descricao: str) -> None:
+        self.erros.append(Token(
+            tipo=TokenType.ERRO_INPUT_SINTAXE_INCORRETA,
+            lexema=lexema,
+            linha=self.token_input.linha,
+            coluna=self.token_input.coluna,
+            descricao=descricao,
+            eh_erro=True
+        ))
+
+
+@dataclass
+class MetricasAnalise:
+    """
+    Tempos e contadores de uma chamada de analisar_completo(codigo, metricas=...).
+    - tempos: segundos por fase, na ordem em que as fases ocorreram
+      (divisao_linhas, reconhecimento, validacao, sintatico, delimitadores, simbolos);
+    - tempos_regras: segundos de cada regra de validação dentro da fase validacao
+      (a tabela de símbolos aparece como tabela_simbolos);
+    - tentativas_regex: chamadas de match nos padrões e matches da regex mestre;
+    - tokens_por_tipo, erros_lexicos, erros_sintaticos e nos (nós da árvore);
+    - profundidade_blocos: maior aninhamento de blocos de comandos e
+      profundidade_recursao: quadros da pilha do analisador sintático nesse ponto.
+    """
+    tempos: dict = None
+    tempos_regras: dict = None
+    tentativas_regex: int = 0
+    tokens_por_tipo: dict = None
+    erros_lexicos: int = 0
+    erros_sintaticos: int = 0
+    nos: int = 0
+    profundidade_blocos: int = 0
+    profundidade_recursao: int = 0
+    
+    def __post_init__(self):
+        if self.tempos is None:
+            self.tempos = {}
+        if self.tempos_regras is None:
+            self.tempos_regras = {}
+        if self.tokens_por_tipo is None:
+            self.tokens_por_tipo = {}
+    
+    @contextmanager
+    def medir(self, fase: str):
+        """Soma ao tempo da fase o tempo do bloco with."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tempos[fase] = self.tempos.get(fase, 0.0) + time.perf_counter() - inicio
+    
+    def cronometrar(self, regra: str, funcao):
+        """Retorna funcao envolvida para somar o tempo de cada chamada ao da regra."""
+        tempos = self.tempos_regras
+        tempos.setdefault(regra, 0.0)
+        relogio = time.perf_counter
+        
+        def medida(*argumentos):
+            inicio = relogio()
+            try:
+                return funcao(*argumentos)
+            finally:
+                tempos[regra] += relogio() - inicio
+        return medida
+    
+    @contextmanager
+    def medir_sintatico(self, sintatico: 'AnalisadorSintatico'):
+        """
+        Mede a fase sintatico e, enquanto ela dura, acompanha as entradas em blocos
+        de comandos de sintatico: a cada novo maior aninhamento, registra quantos
+        quadros da pilha separam o bloco de analisar_completo.
+        """
+        analisar_bloco = sintatico._analisar_bloco_comandos
+        base = _profundidade_pilha(sys._getframe()) - 2  # Sem este gerador e o __enter__
+        nivel = 0
+        
+        def analisar_bloco_medido(contexto_pai: str = "") -> Optional[NoSintatico]:
+            nonlocal nivel
+            nivel += 1
+            try:
+                if nivel > self.profundidade_blocos:
+                    self.profundidade_blocos = nivel
+                    # Os quadros desta função (um por nível) não contam
+                    self.profundidade_recursao = _profundidade_pilha(sys._getframe()) - base - (nivel - 1)
+                return analisar_bloco(contexto_pai)
+            finally:
+                nivel -= 1
+        
+        sintatico._analisar_bloco_comandos = analisar_bloco_medido
+        try:
+            with self.medir("sintatico"):
+                yield
+        finally:
+            del sintatico._analisar_bloco_comandos
+    
+    def registrar_resultado(self, tokens: List[Token], arvore: Optional[NoSintatico],
+                            erros_sintaticos: List[Token]) -> None:
+        """Preenche os contadores obtidos do resultado da análise."""
+        for token in tokens:
+            tipo = token.tipo.value
+            self.tokens_por_tipo[tipo] = self.tokens_por_tipo.get(tipo, 0) + 1
+            if token.eh_erro:
+                self.erros_lexicos += 1
+        self.erros_sintaticos += len(erros_sintaticos)
+        pendentes = [arvore] if arvore is not None else []
+        while pendentes:
+            self.nos += 1
+            pendentes.extend(pendentes.pop().filhos)
+    
+    @property
+    def tempo_total(self) -> float:
+        return sum(self.tempos.values())
+    
+    def formatar(self) -> str:
+        """Texto das métricas no formato da aba de estatísticas."""
+        total = self.tempo_total or 1.0
+        resultado = "DESEMPENHO POR FASE:\n"
+        resultado += "-" * 20 + "\n"
+        for fase, segundos in self.tempos.items():
+            resultado += f"{fase:<25}: {segundos * 1000:>10.3f} ms {segundos / total:>6.1%}\n"
+            if fase == "validacao":
+                for regra, segundos_regra in self.tempos_regras.items():
+                    resultado += f"  {regra:<23}: {segundos_regra * 1000:>10.3f} ms\n"
+        resultado += f"{'total':<25}: {self.tempo_total * 1000:>10.3f} ms\n\n"
+        
+        resultado += "CONTADORES:\n"
+        resultado += "-" * 11 + "\n"
+        resultado += f"Tentativas de regex: {self.tentativas_regex}\n"
+        resultado += f"Tokens de erro léxico: {self.erros_lexicos}\n"
+        resultado += f"Erros sintáticos: {self.erros_sintaticos}\n"
+        resultado += f"Nós criados: {self.nos}\n"
+        resultado += f"Maior aninhamento de blocos: {self.profundidade_blocos}\n"
+        resultado += f"Profundidade de recursão (quadros): {self.profundidade_recursao}\n"
+        resultado += "Tokens por tipo:\n"
+        for tipo, quantidade in sorted(self.tokens_por_tipo.items(), key=lambda item: -item[1]):
+            resultado += f"  {tipo:<23}: {quantidade:>6}\n"
+        return resultado
+
+
+class _RegexContado:
+    """Envolve uma regex compilada contando as tentativas de reconhecimento."""
+    
+    __slots__ = ('regex', 'metricas')
+    
+    def __init__(self, regex, metricas: MetricasAnalise):
+        self.regex = regex
+        self.metricas = metricas
+    
+    def match(self, *argumentos):
+        self.metricas.tentativas_regex += 1
+        return self.regex.match(*argumentos)
+    
+    def finditer(self, *argumentos):
+        for match in self.regex.finditer(*argumentos):
+            self.metricas.tentativas_regex += 1
+            yield match
+
+
+def _profundidade_pilha(quadro) -> int:
+    """Número de quadros da pilha de chamadas até quadro, inclusive."""
+    profundidade = 0
+    while quadro is not None:
+        profundidade += 1
+        quadro = quadro.f_back
+    return profundidade
+
+
+_SEM_MEDICAO = nullcontext()
+
+
+def _sem_medicao(*_) -> nullcontext:
+    """Substitui MetricasAnalise.medir e medir_sintatico quando nada é medido."""
+    return _SEM_MEDICAO
+
+
 class AnalisadorLexico:
     def __init__(self):
         # Constantes para limites
@@ -893,31 +2843,88 @@ class AnalisadorLexico:
         
         # Compilar os padrões regex
         self.compiled_patterns = [
-            (token_type, re.compile(pattern), desc) 
+            (token_type, re.compile(pattern), desc)
             for token_type, pattern, desc in self.token_patterns
         ]
-    
-    def _verificar_string_nao_fechada(self, linha: str, posicao: int) -> Optional[Token]:
-        if linha[posicao] == '"':
-            # Procura pelo fechamento da string
-            pos_atual = posicao + 1
-            while pos_atual < len(linha) and linha[pos_atual] != '"':
-                pos_atual += 1
-            
-            if pos_atual >= len(linha):
-                # String não fechada
-                lexema = linha[posicao:]
-                return Token(
-                    tipo=TokenType.ERRO_STRING_NAO_FECHADA,
-                    lexema=lexema,
-                    linha=0,  # Será definido pelo chamador
-                    coluna=posicao + 1,
-                    descricao=f"String não fechada: '{lexema}'",
-                    eh_erro=True
-                )
+
+        # Motores de análise léxica disponíveis em analisar()
+        self.MOTORES = ("mestre", "padroes", "afd")
+        
+        # Tamanho mínimo do código (em caracteres) para a análise paralela de analisar()
+        self.LIMIAR_PARALELO = 1 << 20
+
+        # Regex mestre: uma única alternância com grupos nomeados.
+        # Os grupos P<i> correspondem às entradas de token_patterns (mesma ordem).
+        # Palavras reservadas e identificadores são reconhecidos uma única vez pelo
+        # grupo PALAVRA e classificados por PALAVRAS_RESERVADAS; '!cdt' e '!cdt+'
+        # formam o grupo SENAO. Números são tratados pelo grupo NUMERO e palavras
+        # recebem a guarda (?!@) para que os casos de identificador mal formado
+        # caiam em VERIFICAR, que delega a posição ao reconhecimento padrão
+        # (_reconhecer_token).
+        tipos_palavra = set(PALAVRAS_RESERVADAS.values())
+        alternativas = [
+            r'(?P<STRING_ABERTA>"[^"]*\Z)',
+            r'(?P<NUMERO>\b[0-9]+(?:\.[0-9]+)?(?![\w@.]))',
+        ]
+        for indice, (token_type, pattern, desc) in enumerate(self.token_patterns):
+            if token_type in tipos_palavra or token_type in (TokenType.VALOR_REAL, TokenType.VALOR_INTEIRO,
+                                                             TokenType.COND_SENAO):
+                continue
+            if token_type == TokenType.COND_SENAOSE:
+                alternativas.append(r'(?P<SENAO>!cdt\+?)')
+            elif token_type == TokenType.IDENTIFICADOR:
+                alternativas.append(f'(?P<PALAVRA>{pattern}(?!@))')
+            elif token_type == TokenType.WHITESPACE:
+                alternativas.append(f'(?P<ESPACO>{pattern})')
+            else:
+                alternativas.append(f'(?P<P{indice}>{pattern})')
+        alternativas.append(r'(?P<SIMBOLO>\W)')
+        alternativas.append(r'(?P<VERIFICAR>\w)')
+        self.regex_mestre = re.compile('|'.join(alternativas))
+        # A mesma regex sobre bytes, usada por analisar_arquivo(usar_mmap=True) nas
+        # linhas só com ASCII, onde \w, \W e \b de bytes coincidem com os de str
+        self.regex_mestre_bytes = re.compile('|'.join(alternativas).encode('ascii'))
+        self.regex_nao_ascii = re.compile(rb'[\x80-\xff]')
+
+        self.descricoes = {token_type: desc for token_type, _, desc in self.token_patterns}
+        
+        # Autômato do motor "afd"
+        self.automato = AutomatoLexico()
+        
+        # Regras de validação do programa completo, na ordem em que emitem erros,
+        # e nomes das regras desativadas (que nem chegam a ser criadas)
+        self.regras_validacao = [
+            ValidadorInicioPrograma,
+            ValidadorTiposVariaveis,
+            ValidadorExpressoesCondicionais,
+            ValidadorComandoInput,
+        ]
+        self.regras_desativadas = set()
+        
+        # Cache em disco dos resultados (CacheAnalise), usado por analisar_completo
+        # e analisar_arquivo quando definido
+        self.cache = None
+        
+        # Memória dos últimos resultados de analisar_completo (MemoriaAnalise),
+        # consultada antes do cache em disco quando definida
+        self.memoria = None
+
+    def _verificar_string_nao_fechada(self, indice: IndiceLinha, posicao: int) -> Optional[Token]:
+        if posicao == indice.ultima_aspa:
+            # String não fechada: nenhuma aspa depois desta
+            lexema = indice.linha[posicao:]
+            return Token(
+                tipo=TokenType.ERRO_STRING_NAO_FECHADA,
+                lexema=lexema,
+                linha=0,  # Será definido pelo chamador
+                coluna=posicao + 1,
+                descricao=f"String não fechada: '{lexema}'",
+                eh_erro=True
+            )
         return None
     
-    def _verificar_numero_malformado(self, linha: str, posicao: int) -> Optional[Token]:
+    def _verificar_numero_malformado(self, indice: IndiceLinha, posicao: int) -> Optional[Token]:
+        linha = indice.linha
         if linha[posicao].isdigit():
             pos_atual = posicao
             tem_ponto = False
@@ -964,21 +2971,16 @@ class AnalisadorLexico:
         
         return None
     
-    def _verificar_identificador_malformado(self, linha: str, posicao: int) -> Optional[Token]:
+    def _verificar_identificador_malformado(self, indice: IndiceLinha, posicao: int) -> Optional[Token]:
         """Verifica se há um identificador mal formado."""
-        char = linha[posicao]
+        char = indice.linha[posicao]
         
         # Identificador começando com número
         if char.isdigit():
-            pos_atual = posicao
-            lexema = ""
+            fim, _, ultima_alfa = indice.sequencia(posicao)
             
-            # Coleta o identificador mal formado
-            while pos_atual < len(linha) and (linha[pos_atual].isalnum() or linha[pos_atual] in '_@'):
-                lexema += linha[pos_atual]
-                pos_atual += 1
-            
-            if any(c.isalpha() or c in '_@' for c in lexema):
+            if ultima_alfa >= posicao:
+                lexema = indice.linha[posicao:fim]
                 return Token(
                     tipo=TokenType.ERRO_IDENTIFICADOR_MALFORMADO,
                     lexema=lexema,
@@ -990,17 +2992,10 @@ class AnalisadorLexico:
         
         # Identificador com caracteres inválidos
         if char.isalpha() or char == '_':
-            pos_atual = posicao
-            lexema = ""
-            tem_caracter_invalido = False
-            
-            while pos_atual < len(linha) and (linha[pos_atual].isalnum() or linha[pos_atual] in '_@'):
-                lexema += linha[pos_atual]
-                if linha[pos_atual] == '@':
-                    tem_caracter_invalido = True
-                pos_atual += 1
+            fim, ultima_arroba, _ = indice.sequencia(posicao)
+            lexema = indice.linha[posicao:fim]
             
-            if tem_caracter_invalido:
+            if ultima_arroba >= posicao:
                 return Token(
                     tipo=TokenType.ERRO_IDENTIFICADOR_MALFORMADO,
                     lexema=lexema,
@@ -1023,558 +3018,824 @@ class AnalisadorLexico:
         
         return None
     
-    def _verificar_operador_relacional_malformado(self, linha: str, posicao: int) -> Optional[Token]:
-        # Lista de operadores relacionais válidos
-        operadores_validos = {'gt', 'eq', 'ne', 'lt', 'ge', 'le'}
-        
-        # Lista de possíveis erros comuns de operadores relacionais
-        operadores_malformados = {
-            'e': 'eq',      # "e" em vez de "eq" (igual)
-            'g': 'gt',      # "g" em vez de "gt" (maior que)
-            'l': 'lt',      # "l" em vez de "lt" (menor que)
-            'n': 'ne',      # "n" em vez de "ne" (não igual)
-            'ge': 'ge',     # parcialmente correto
-            'le': 'le',     # parcialmente correto
-            'igual': 'eq',  # palavra em português
-            'maior': 'gt',  # palavra em português
-            'menor': 'lt',  # palavra em português
-        }
-        
-        # Extrai a próxima palavra
-        match = re.match(r'\b[a-zA-Z_][a-zA-Z0-9_]*\b', linha[posicao:])
-        if match:
-            lexema = match.group(0)
-            
-            # Verifica se está dentro de colchetes (contexto de condição)
-            inicio_colchete = linha.rfind('[', 0, posicao)
-            fim_colchete = linha.find(']', posicao)
-            
-            if inicio_colchete != -1 and fim_colchete != -1:
-                # Está dentro de uma condição, verifica se é um operador malformado
-                if lexema in operadores_malformados and lexema not in operadores_validos:
-                    sugestao = operadores_malformados[lexema]
-                    return Token(
-                        tipo=TokenType.ERRO_OPERADOR_RELACIONAL_MALFORMADO,
-                        lexema=lexema,
-                        linha=0,  # Será definido pelo chamador
-                        coluna=posicao + 1,
-                        descricao=f"Operador relacional mal formado: '{lexema}'. Sugestão: use '{sugestao}'",
-                        eh_erro=True
-                    )
+    def _verificar_operador_relacional_malformado(self, indice: IndiceLinha, posicao: int) -> Optional[Token]:
+        # Palavra na posição, verificada contra a tabela e depois contra o contexto
+        # de condição (dentro de colchetes)
+        lexema = indice.palavra(posicao)
+        if lexema in OPERADORES_RELACIONAIS_MALFORMADOS and indice.dentro_de_colchetes(posicao):
+            sugestao = OPERADORES_RELACIONAIS_MALFORMADOS[lexema]
+            return Token(
+                tipo=TokenType.ERRO_OPERADOR_RELACIONAL_MALFORMADO,
+                lexema=lexema,
+                linha=0,  # Será definido pelo chamador
+                coluna=posicao + 1,
+                descricao=f"Operador relacional mal formado: '{lexema}'. Sugestão: use '{sugestao}'",
+                eh_erro=True
+            )
         
         return None
     
-    def _verificar_palavra_reservada_malformada(self, linha: str, posicao: int) -> Optional[Token]:
-        # Lista de palavras reservadas válidas
-        palavras_validas = {
-            'als', 'cdt', '!cdt', '!cdt+', 'cycle', 'during', 'repeat', 
-            'wrt', 'input', 'func', 'brkln', 'intn', 'den', 'txt', 'bln', 'crt', 'in'
-        }
-        
-        # Lista de possíveis erros comuns de palavras reservadas
-        palavras_malformadas = {
-            'wr': 'wrt',        # "wr" em vez de "wrt"
-            'wt': 'wrt',        # "wt" em vez de "wrt"
-            'write': 'wrt',     # palavra em inglês
-            'inp': 'input',     # "inp" em vez de "input"
-            'read': 'input',    # palavra em inglês
-            'scanf': 'input',   # referência C
-            'int': 'intn',      # "int" em vez de "intn"
-            'cd': 'cdt',        # "cd" em vez de "cdt"
-            'if': 'cdt',        # palavra em inglês
-            'else': '!cdt',     # palavra em inglês
-            'elseif': '!cdt+',  # palavra em inglês
-            'al': 'als',        # "al" em vez de "als"
-            'start': 'als',     # palavra em inglês
-            'function': 'func', # "function" em vez de "func"
-            'fn': 'func',       # "fn" em vez de "func"
-        }
-        
-        # Extrai a próxima palavra
-        match = re.match(r'\b[a-zA-Z_][a-zA-Z0-9_]*\b', linha[posicao:])
-        if match:
-            lexema = match.group(0)
-            
-            # Verifica se é uma palavra reservada malformada
-            if lexema in palavras_malformadas and lexema not in palavras_validas:
-                sugestao = palavras_malformadas[lexema]
-                return Token(
-                    tipo=TokenType.ERRO_PALAVRA_RESERVADA_MALFORMADA,
-                    lexema=lexema,
-                    linha=0,  # Será definido pelo chamador
-                    coluna=posicao + 1,
-                    descricao=f"Palavra reservada mal formada: '{lexema}'. Sugestão: use '{sugestao}'",
-                    eh_erro=True
-                )
+    def _verificar_palavra_reservada_malformada(self, indice: IndiceLinha, posicao: int) -> Optional[Token]:
+        # Palavra na posição (a mesma já calculada pelas verificações anteriores)
+        lexema = indice.palavra(posicao)
+        if lexema in PALAVRAS_RESERVADAS_MALFORMADAS:
+            sugestao = PALAVRAS_RESERVADAS_MALFORMADAS[lexema]
+            return Token(
+                tipo=TokenType.ERRO_PALAVRA_RESERVADA_MALFORMADA,
+                lexema=lexema,
+                linha=0,  # Será definido pelo chamador
+                coluna=posicao + 1,
+                descricao=f"Palavra reservada mal formada: '{lexema}'. Sugestão: use '{sugestao}'",
+                eh_erro=True
+            )
         
         return None
 
-    def _validar_inicio_programa(self, tokens: List[Token]) -> Optional[Token]:
-        for token in tokens:
-            # Ignora tokens que não são significativos para a estrutura
-            if token.tipo in [TokenType.COMENTARIO, TokenType.WHITESPACE, TokenType.NEWLINE, TokenType.EOF]:
-                continue
-            
-            # O primeiro token significativo deve ser 'als'
-            if token.tipo == TokenType.INICIO:
-                return None  # Programa válido
-            else:
-                # Programa não começa com 'als'
-                return Token(
-                    tipo=TokenType.ERRO_PROGRAMA_SEM_INICIO,
-                    lexema="",
-                    linha=token.linha,
-                    coluna=token.coluna,
-                    descricao="Programa deve começar com a palavra reservada 'als'",
-                    eh_erro=True
-                )
+    def _reconhecer_token(self, indice: IndiceLinha, coluna: int, num_linha: int) -> Tuple[Optional[Token], int]:
+        """
+        Reconhece o token que começa em indice.linha[coluna] testando as verificações
+        de erro e depois cada padrão, em ordem.
+        Retorna o token (None para espaço em branco) e a coluna seguinte.
+        """
+        linha = indice.linha
         
-        # Se chegou aqui, não há tokens significativos
+        # Verifica erros específicos primeiro
+        erro_string = self._verificar_string_nao_fechada(indice, coluna)
+        if erro_string:
+            erro_string.linha = num_linha
+            return erro_string, len(linha)  # Pula para o final da linha
+
+        for verificacao in (self._verificar_numero_malformado,
+                            self._verificar_identificador_malformado,
+                            self._verificar_operador_relacional_malformado,
+                            self._verificar_palavra_reservada_malformada):
+            erro = verificacao(indice, coluna)
+            if erro:
+                erro.linha = num_linha
+                # Pula o lexema mal formado
+                return erro, coluna + len(erro.lexema)
+
+        # Tenta fazer match com cada padrão
+        for token_type, pattern, desc in self.compiled_patterns:
+            match = pattern.match(linha, coluna)
+
+            if match:
+                lexema = match.group(0)
+
+                # Pula whitespace (mas não quebras de linha)
+                if token_type == TokenType.WHITESPACE:
+                    return None, match.end()
+
+                return self._criar_token(token_type, lexema, num_linha, coluna, desc), match.end()
+
+        return self._criar_token_simbolo(linha[coluna], num_linha, coluna), coluna + 1
+
+    def _criar_token(self, token_type: TokenType, lexema: str, num_linha: int, coluna: int, desc: str) -> Token:
+        """Cria o token reconhecido, aplicando os limites de tamanho."""
+        # Verifica se identificador é muito longo
+        if token_type == TokenType.IDENTIFICADOR and len(lexema) > self.MAX_IDENTIFICADOR_LENGTH:
+            return Token(
+                tipo=TokenType.ERRO_IDENTIFICADOR_MUITO_LONGO,
+                lexema=lexema,
+                linha=num_linha,
+                coluna=coluna + 1,
+                descricao=f"Identificador muito longo (máximo {self.MAX_IDENTIFICADOR_LENGTH} caracteres): '{lexema}'",
+                eh_erro=True
+            )
+        elif token_type == TokenType.VALOR_INTEIRO and len(lexema) > self.MAX_NUMERO_LENGTH:
+            return Token(
+                tipo=TokenType.ERRO_NUMERO_MUITO_LONGO,
+                lexema=lexema,
+                linha=num_linha,
+                coluna=coluna + 1,
+                descricao=f"Número muito longo (máximo {self.MAX_NUMERO_LENGTH} caracteres): '{lexema}'",
+                eh_erro=True
+            )
+
         return Token(
-            tipo=TokenType.ERRO_PROGRAMA_SEM_INICIO,
-            lexema="",
-            linha=1,
-            coluna=1,
-            descricao="Programa deve começar com a palavra reservada 'als'",
+            tipo=token_type,
+            lexema=lexema,
+            linha=num_linha,
+            coluna=coluna + 1,
+            descricao=desc
+        )
+
+    def _criar_token_numero(self, lexema: str, num_linha: int, coluna: int) -> Token:
+        """Cria o token de um número bem formado (inteiro ou real), aplicando o limite de tamanho."""
+        if len(lexema) > self.MAX_NUMERO_LENGTH:
+            return Token(
+                tipo=TokenType.ERRO_NUMERO_MUITO_LONGO,
+                lexema=lexema,
+                linha=num_linha,
+                coluna=coluna + 1,
+                descricao=f"Número muito longo (máximo {self.MAX_NUMERO_LENGTH} caracteres): '{lexema}'",
+                eh_erro=True
+            )
+        
+        token_type = TokenType.VALOR_REAL if '.' in lexema else TokenType.VALOR_INTEIRO
+        return Token(
+            tipo=token_type,
+            lexema=lexema,
+            linha=num_linha,
+            coluna=coluna + 1,
+            descricao=self.descricoes[token_type]
+        )
+    
+    def _criar_token_simbolo(self, char: str, num_linha: int, coluna: int) -> Token:
+        """Cria o token de erro para um caractere que não inicia nenhum token."""
+        # Verifica se é um símbolo inválido específico
+        if char in '@$%#&!':
+            return Token(
+                tipo=TokenType.ERRO_SIMBOLO_INVALIDO,
+                lexema=char,
+                linha=num_linha,
+                coluna=coluna + 1,
+                descricao=f"Símbolo não pertencente ao conjunto de símbolos terminais da linguagem: '{char}'",
+                eh_erro=True
+            )
+
+        # Caractere não reconhecido genérico
+        return Token(
+            tipo=TokenType.ERRO,
+            lexema=char,
+            linha=num_linha,
+            coluna=coluna + 1,
+            descricao=f"Caractere não reconhecido: '{char}'",
             eh_erro=True
         )
+
+    def _criar_token_palavra(self, indice: Optional[IndiceLinha], lexema: str, num_linha: int, coluna: int) -> Token:
+        """
+        Cria o token de uma palavra completa (sem '@' nem continuação fora do ASCII),
+        já reconhecida uma única vez pelo motor. Só as palavras das tabelas de erros
+        comuns passam pelas verificações por IndiceLinha (e só elas precisam de
+        indice); o único outro erro possível é o de tamanho, tratado em _criar_token.
+        """
+        if lexema in OPERADORES_RELACIONAIS_MALFORMADOS or lexema in PALAVRAS_RESERVADAS_MALFORMADAS:
+            token = (self._verificar_operador_relacional_malformado(indice, coluna) or
+                     self._verificar_palavra_reservada_malformada(indice, coluna))
+            if token:
+                token.linha = num_linha
+                return token
+        
+        token_type = PALAVRAS_RESERVADAS.get(lexema, TokenType.IDENTIFICADOR)
+        return self._criar_token(token_type, lexema, num_linha, coluna, self.descricoes[token_type])
     
-    def _validar_tipos_variaveis(self, tokens: List[Token]) -> List[Token]:
-        erros_tipo = []
-        variaveis = {}  # {nome_variavel: tipo}
-        
-        i = 0
-        while i < len(tokens):
-            token_atual = tokens[i]
+    def _analisar_linha_padroes(self, linha: str, num_linha: int, tokens: List[Token]) -> None:
+        """Analisa uma linha testando cada padrão em cada posição (motor "padroes")."""
+        indice = IndiceLinha(linha)
+        coluna = 0
+        while coluna < len(linha):
+            token, coluna = self._reconhecer_token(indice, coluna, num_linha)
+            if token:
+                tokens.append(token)
+
+    def _analisar_linha_mestre(self, linha: str, num_linha: int, tokens: List[Token]) -> None:
+        """
+        Analisa uma linha com a regex mestre (motor "mestre").
+        Cada posição é resolvida por um único match; apenas os casos que podem
+        gerar erro de formação (grupo VERIFICAR) usam o reconhecimento padrão.
+        """
+        indice = IndiceLinha(linha)
+        descricoes = self.descricoes
+        coluna = 0
+        while coluna < len(linha):
+            for match in self.regex_mestre.finditer(linha, coluna):
+                grupo = match.lastgroup
+                lexema = match.group()
+                inicio = match.start()
+
+                if grupo == 'PALAVRA':
+                    token = self._criar_token_palavra(indice, lexema, num_linha, inicio)
+                elif grupo == 'ESPACO':
+                    continue
+                elif grupo == 'VERIFICAR':
+                    token, coluna = self._reconhecer_token(indice, inicio, num_linha)
+                    if token:
+                        tokens.append(token)
+                    break  # Reinicia o finditer após a coluna retornada
+                elif grupo == 'NUMERO':
+                    token = self._criar_token_numero(lexema, num_linha, inicio)
+                elif grupo == 'SIMBOLO':
+                    token = self._criar_token_simbolo(lexema, num_linha, inicio)
+                elif grupo == 'SENAO':
+                    token_type = TokenType.COND_SENAOSE if lexema.endswith('+') else TokenType.COND_SENAO
+                    token = self._criar_token(token_type, lexema, num_linha, inicio, descricoes[token_type])
+                elif grupo == 'STRING_ABERTA':
+                    token = Token(
+                        tipo=TokenType.ERRO_STRING_NAO_FECHADA,
+                        lexema=lexema,
+                        linha=num_linha,
+                        coluna=inicio + 1,
+                        descricao=f"String não fechada: '{lexema}'",
+                        eh_erro=True
+                    )
+                else:
+                    token_type, _, desc = self.compiled_patterns[int(grupo[1:])]
+                    token = self._criar_token(token_type, lexema, num_linha, inicio, desc)
+
+                tokens.append(token)
+            else:
+                break
+
+    def _analisar_linha_afd(self, linha: str, num_linha: int, tokens: List[Token]) -> None:
+        """
+        Analisa uma linha com o autômato finito determinístico (motor "afd").
+        Posições que podem gerar erro de formação (caracteres fora do ASCII,
+        palavras seguidas de '@', números seguidos de '.' ou letras) usam o
+        reconhecimento padrão, garantindo a mesma saída dos demais motores.
+        """
+        automato = self.automato
+        classes = automato.classes(linha)
+        transicoes = automato.transicoes
+        aceitacao = automato.aceitacao
+        num_classes = automato.NUM_CLASSES
+        e_string = automato.E_STRING
+        e_comentario = automato.E_COMENTARIO
+        indice = None
+        tamanho = len(linha)
+        coluna = 0
+        
+        while coluna < tamanho:
+            # Executa o autômato guardando o último estado de aceitação (maior lexema)
+            estado = automato.E_INICIAL
+            posicao = coluna
+            tipo_aceito = automato.K_NENHUM
+            estado_aceito = estado
+            fim = coluna
+            while posicao < tamanho:
+                estado = transicoes[estado * num_classes + classes[posicao]]
+                if not estado:
+                    break
+                posicao += 1
+                if estado == e_comentario:
+                    # O comentário vai até o fim da linha
+                    posicao = tamanho
+                elif estado == e_string:
+                    # Avança direto para a próxima aspa (ou para o fim da linha)
+                    proxima_aspa = linha.find('"', posicao)
+                    posicao = tamanho if proxima_aspa == -1 else proxima_aspa
+                if aceitacao[estado]:
+                    tipo_aceito = aceitacao[estado]
+                    estado_aceito = estado
+                    fim = posicao
             
-            # Identifica declaração de variável: tipo identificador
-            if (token_atual.tipo == TokenType.TIPO_VAR and 
-                i + 1 < len(tokens) and 
-                tokens[i + 1].tipo == TokenType.IDENTIFICADOR):
-                
-                tipo_var = token_atual.lexema
-                nome_var = tokens[i + 1].lexema
-                variaveis[nome_var] = tipo_var
-                i += 2
+            if tipo_aceito == automato.K_NENHUM:
+                # Só a string sem aspa de fechamento termina sem aceitação
+                lexema = linha[coluna:]
+                tokens.append(Token(
+                    tipo=TokenType.ERRO_STRING_NAO_FECHADA,
+                    lexema=lexema,
+                    linha=num_linha,
+                    coluna=coluna + 1,
+                    descricao=f"String não fechada: '{lexema}'",
+                    eh_erro=True
+                ))
+                coluna = tamanho
                 continue
             
-            # Identifica atribuição: identificador <= valor
-            if (token_atual.tipo == TokenType.IDENTIFICADOR and
-                i + 2 < len(tokens) and
-                tokens[i + 1].tipo == TokenType.OPER_ATRIB):
-                
-                nome_var = token_atual.lexema
-                valor_token = tokens[i + 2]
-                
-                # Verifica se a variável foi declarada
-                if nome_var in variaveis:
-                    tipo_var = variaveis[nome_var]
-                    
-                    # Validação de tipos
-                    erro = None
-                    if tipo_var == "intn" and valor_token.tipo == TokenType.VALOR_REAL:
-                        erro = Token(
-                            tipo=TokenType.ERRO_TIPO_INCOMPATIVEL,
-                            lexema=f"{nome_var} <= {valor_token.lexema}",
-                            linha=token_atual.linha,
-                            coluna=token_atual.coluna,
-                            descricao=f"Variável '{nome_var}' do tipo 'intn' não pode receber valor decimal '{valor_token.lexema}'. Use tipo 'den' para valores decimais.",
-                            eh_erro=True
-                        )
-                    elif tipo_var == "bln" and valor_token.tipo not in [TokenType.VALOR_LOGICO]:
-                        erro = Token(
-                            tipo=TokenType.ERRO_TIPO_INCOMPATIVEL,
-                            lexema=f"{nome_var} <= {valor_token.lexema}",
-                            linha=token_atual.linha,
-                            coluna=token_atual.coluna,
-                            descricao=f"Variável '{nome_var}' do tipo 'bln' só pode receber valores lógicos (valid/invalid).",
-                            eh_erro=True
-                        )
-                    elif tipo_var == "txt" and valor_token.tipo != TokenType.VALOR_TEXTO:
-                        erro = Token(
-                            tipo=TokenType.ERRO_TIPO_INCOMPATIVEL,
-                            lexema=f"{nome_var} <= {valor_token.lexema}",
-                            linha=token_atual.linha,
-                            coluna=token_atual.coluna,
-                            descricao=f"Variável '{nome_var}' do tipo 'txt' só pode receber valores de texto entre aspas.",
-                            eh_erro=True
-                        )
-                    
-                    if erro:
-                        erros_tipo.append(erro)
-                
-                i += 3
+            if tipo_aceito == automato.K_ESPACO:
+                coluna = fim
                 continue
             
-            i += 1
-        
-        return erros_tipo
-
-    def _validar_expressoes_condicionais(self, tokens: List[Token]) -> List[Token]:
-        erros = []
-        i = 0
-        
-        while i < len(tokens):
-            token = tokens[i]
-            
-            # Procura por abertura de colchetes
-            if token.tipo == TokenType.ABRE_COLCHETES:
-                j = i + 1
-                elementos_significativos = []
-                
-                # Coleta tokens até o fechamento dos colchetes
-                while j < len(tokens) and tokens[j].tipo != TokenType.FECHA_COLCHETES:
-                    token_atual = tokens[j]
-                    # Ignora whitespace e newlines
-                    if token_atual.tipo not in [TokenType.WHITESPACE, TokenType.NEWLINE]:
-                        elementos_significativos.append(token_atual)
-                    j += 1
-                
-                # Valida a estrutura da expressão condicional
-                if len(elementos_significativos) >= 2:
-                    # Verifica se há dois valores consecutivos sem operador relacional
-                    # mas ignora se há operadores lógicos entre eles
-                    for k in range(len(elementos_significativos) - 1):
-                        token_atual = elementos_significativos[k]
-                        token_proximo = elementos_significativos[k + 1]
-                        
-                        # Verifica se são dois valores/identificadores consecutivos
-                        # sem operador relacional ou lógico entre eles
-                        if (token_atual.tipo in [TokenType.IDENTIFICADOR, TokenType.VALOR_INTEIRO, TokenType.VALOR_REAL] and
-                            token_proximo.tipo in [TokenType.IDENTIFICADOR, TokenType.VALOR_INTEIRO, TokenType.VALOR_REAL]):
-                            
-                            # Verifica se não há operador lógico anterior que justifique
-                            tem_operador_logico = False
-                            if k > 0 and elementos_significativos[k - 1].tipo == TokenType.OPER_LOGICO:
-                                tem_operador_logico = True
-                            
-                            if not tem_operador_logico:
-                                erro = Token(
-                                    tipo=TokenType.ERRO_OPERADOR_RELACIONAL_AUSENTE,
-                                    lexema=f"{token_atual.lexema} {token_proximo.lexema}",
-                                    linha=token_atual.linha,
-                                    coluna=token_atual.coluna,
-                                    descricao=f"Operador relacional ausente entre '{token_atual.lexema}' e '{token_proximo.lexema}'. Use: gt, eq, ne, lt, ge, le",
-                                    eh_erro=True
-                                )
-                                erros.append(erro)
-                
-                # Valida a estrutura de expressões com operadores lógicos
-                self._validar_expressao_logica(elementos_significativos, erros)
-                
-                i = j  # Pula para depois dos colchetes
-            else:
-                i += 1
-        
-        return erros
-    
-    def _validar_expressao_logica(self, elementos: List[Token], erros: List[Token]) -> None:
-        """Valida a estrutura de expressões lógicas compostas."""
-        i = 0
-        while i < len(elementos):
-            token = elementos[i]
-            
-            # Se encontrou um operador lógico (AND/OR)
-            if token.tipo == TokenType.OPER_LOGICO:
-                # Verifica se há elementos suficientes antes e depois
-                if i < 3:  # Precisa de pelo menos: valor op_rel valor AND
-                    erro = Token(
-                        tipo=TokenType.ERRO_OPERADOR_RELACIONAL_AUSENTE,
-                        lexema=token.lexema,
-                        linha=token.linha,
-                        coluna=token.coluna,
-                        descricao=f"Operador lógico '{token.lexema}' sem expressão relacional completa anterior",
-                        eh_erro=True
-                    )
-                    erros.append(erro)
-                
-                if i + 3 >= len(elementos):  # Precisa de pelo menos: AND valor op_rel valor
-                    erro = Token(
-                        tipo=TokenType.ERRO_OPERADOR_RELACIONAL_AUSENTE,
-                        lexema=token.lexema,
-                        linha=token.linha,
-                        coluna=token.coluna,
-                        descricao=f"Operador lógico '{token.lexema}' sem expressão relacional completa posterior",
-                        eh_erro=True
-                    )
-                    erros.append(erro)
-            
-            i += 1
-
-    def _validar_comando_input(self, tokens: List[Token]) -> List[Token]:
-        """Valida a sintaxe do comando input."""
-        erros = []
-        variaveis_declaradas = set()
-        
-        # Primeiro, coleta todas as variáveis declaradas
-        i = 0
-        while i < len(tokens):
-            token = tokens[i]
-            if (token.tipo == TokenType.TIPO_VAR and 
-                i + 1 < len(tokens) and 
-                tokens[i + 1].tipo == TokenType.IDENTIFICADOR):
-                variaveis_declaradas.add(tokens[i + 1].lexema)
-                i += 2
+            # Palavras e números precisam de fronteira de palavra antes e de um
+            # caractere seguinte que não gere erro de formação
+            if tipo_aceito == automato.K_PALAVRA or tipo_aceito == automato.K_NUMERO:
+                suspeitos = (automato.seguintes_palavra_suspeitos if tipo_aceito == automato.K_PALAVRA
+                             else automato.seguintes_numero_suspeitos)
+                if ((coluna > 0 and classes[coluna - 1] in automato.classes_palavra) or
+                        (fim < tamanho and classes[fim] in suspeitos)):
+                    tipo_aceito = automato.K_VERIFICAR
+            
+            if tipo_aceito == automato.K_VERIFICAR:
+                if indice is None:
+                    indice = IndiceLinha(linha)
+                token, coluna = self._reconhecer_token(indice, coluna, num_linha)
+                if token:
+                    tokens.append(token)
+                continue
+            
+            lexema = linha[coluna:fim]
+            if tipo_aceito == automato.K_PALAVRA:
+                if indice is None and (lexema in OPERADORES_RELACIONAIS_MALFORMADOS or
+                                       lexema in PALAVRAS_RESERVADAS_MALFORMADAS):
+                    indice = IndiceLinha(linha)
+                token = self._criar_token_palavra(indice, lexema, num_linha, coluna)
+            elif tipo_aceito == automato.K_NUMERO:
+                token = self._criar_token_numero(lexema, num_linha, coluna)
+            elif tipo_aceito == automato.K_TEXTO:
+                token = self._criar_token(TokenType.VALOR_TEXTO, lexema, num_linha, coluna,
+                                          self.descricoes[TokenType.VALOR_TEXTO])
+            elif tipo_aceito == automato.K_COMENTARIO:
+                token = self._criar_token(TokenType.COMENTARIO, lexema, num_linha, coluna,
+                                          self.descricoes[TokenType.COMENTARIO])
+            elif tipo_aceito == automato.K_SIMBOLO:
+                token = self._criar_token_simbolo(lexema, num_linha, coluna)
             else:
-                i += 1
-        
-        # Agora valida os comandos input
-        i = 0
-        while i < len(tokens):
-            token = tokens[i]
+                token_type = automato.tipo_estado[estado_aceito]
+                token = self._criar_token(token_type, lexema, num_linha, coluna, self.descricoes[token_type])
             
-            if token.tipo == TokenType.INPUT:
-                # Verifica se há parênteses após input
-                j = i + 1
-                # Pula whitespace
-                while j < len(tokens) and tokens[j].tipo == TokenType.WHITESPACE:
-                    j += 1
-                
-                if j >= len(tokens) or tokens[j].tipo != TokenType.ABRE_PARENT:
-                    erro = Token(
-                        tipo=TokenType.ERRO_INPUT_SINTAXE_INCORRETA,
-                        lexema="input",
-                        linha=token.linha,
-                        coluna=token.coluna,
-                        descricao="Comando 'input' deve ser seguido por parênteses: input(variavel)",
-                        eh_erro=True
-                    )
-                    erros.append(erro)
-                    i += 1
-                    continue
-                
-                j += 1  # Pula o (
-                # Pula whitespace
-                while j < len(tokens) and tokens[j].tipo == TokenType.WHITESPACE:
-                    j += 1
-                
-                if j >= len(tokens):
-                    erro = Token(
-                        tipo=TokenType.ERRO_INPUT_SEM_VARIAVEL,
-                        lexema="input(",
-                        linha=token.linha,
-                        coluna=token.coluna,
-                        descricao="Comando 'input' sem variável especificada",
-                        eh_erro=True
-                    )
-                    erros.append(erro)
-                    i = j
-                    continue
-                
-                # Deve ter um identificador
-                if tokens[j].tipo != TokenType.IDENTIFICADOR:
-                    erro = Token(
-                        tipo=TokenType.ERRO_INPUT_SEM_VARIAVEL,
-                        lexema=f"input({tokens[j].lexema}",
-                        linha=token.linha,
-                        coluna=token.coluna,
-                        descricao="Comando 'input' deve conter uma variável válida entre parênteses",
-                        eh_erro=True
-                    )
-                    erros.append(erro)
-                    i = j + 1
+            tokens.append(token)
+            coluna = fim
+    
+    def _analisar_linha_bytes(self, buffer, inicio_linha: int, fim_linha: int, num_linha: int,
+                              tokens: List[Token]) -> None:
+        """
+        Analisa a linha buffer[inicio_linha:fim_linha] de um buffer de bytes (mmap)
+        que contém apenas ASCII, com a regex mestre de bytes.
+        Só os lexemas dos tokens gerados são decodificados; a linha inteira só é
+        decodificada nos casos que usam as verificações por IndiceLinha.
+        """
+        indice = None
+        descricoes = self.descricoes
+        coluna = inicio_linha
+        while coluna < fim_linha:
+            for match in self.regex_mestre_bytes.finditer(buffer, coluna, fim_linha):
+                grupo = match.lastgroup
+                if grupo == 'ESPACO':
                     continue
                 
-                # Verifica se a variável foi declarada
-                nome_variavel = tokens[j].lexema
-                if nome_variavel not in variaveis_declaradas:
-                    erro = Token(
-                        tipo=TokenType.ERRO_INPUT_VARIAVEL_NAO_DECLARADA,
-                        lexema=f"input({nome_variavel})",
-                        linha=token.linha,
-                        coluna=token.coluna,
-                        descricao=f"Variável '{nome_variavel}' não foi declarada antes do comando input",
-                        eh_erro=True
-                    )
-                    erros.append(erro)
-                
-                j += 1  # Pula o identificador
-                # Pula whitespace
-                while j < len(tokens) and tokens[j].tipo == TokenType.WHITESPACE:
-                    j += 1
-                
-                # Deve ter parêntese de fechamento
-                if j >= len(tokens) or tokens[j].tipo != TokenType.FECHA_PARENT:
-                    erro = Token(
-                        tipo=TokenType.ERRO_INPUT_SINTAXE_INCORRETA,
-                        lexema=f"input({nome_variavel}",
-                        linha=token.linha,
-                        coluna=token.coluna,
-                        descricao="Comando 'input' deve ser fechado com parênteses: input(variavel)",
+                inicio = match.start() - inicio_linha
+                lexema = match.group().decode('ascii')
+                if grupo == 'PALAVRA':
+                    if indice is None and (lexema in OPERADORES_RELACIONAIS_MALFORMADOS or
+                                           lexema in PALAVRAS_RESERVADAS_MALFORMADAS):
+                        indice = IndiceLinha(buffer[inicio_linha:fim_linha].decode('ascii'))
+                    token = self._criar_token_palavra(indice, lexema, num_linha, inicio)
+                elif grupo == 'VERIFICAR':
+                    if indice is None:
+                        indice = IndiceLinha(buffer[inicio_linha:fim_linha].decode('ascii'))
+                    token, coluna = self._reconhecer_token(indice, inicio, num_linha)
+                    coluna += inicio_linha
+                    if token:
+                        tokens.append(token)
+                    break  # Reinicia o finditer após a coluna retornada
+                elif grupo == 'NUMERO':
+                    token = self._criar_token_numero(lexema, num_linha, inicio)
+                elif grupo == 'SIMBOLO':
+                    token = self._criar_token_simbolo(lexema, num_linha, inicio)
+                elif grupo == 'SENAO':
+                    token_type = TokenType.COND_SENAOSE if lexema.endswith('+') else TokenType.COND_SENAO
+                    token = self._criar_token(token_type, lexema, num_linha, inicio, descricoes[token_type])
+                elif grupo == 'STRING_ABERTA':
+                    token = Token(
+                        tipo=TokenType.ERRO_STRING_NAO_FECHADA,
+                        lexema=lexema,
+                        linha=num_linha,
+                        coluna=inicio + 1,
+                        descricao=f"String não fechada: '{lexema}'",
                         eh_erro=True
                     )
-                    erros.append(erro)
+                else:
+                    token_type, _, desc = self.compiled_patterns[int(grupo[1:])]
+                    token = self._criar_token(token_type, lexema, num_linha, inicio, desc)
                 
-                i = j + 1 if j < len(tokens) else len(tokens)
+                tokens.append(token)
             else:
-                i += 1
-        
-        return erros
-
-    def analisar_completo(self, codigo: str) -> Tuple[List[Token], Optional[NoSintatico], List[Token]]:
+                break
+    
+    def configuracao(self) -> tuple:
+        """
+        Configuração que determina o resultado da análise, em uma tupla imutável
+        (usada nas chaves da MemoriaAnalise): os padrões de tokens, os limites e
+        os nomes das regras de validação ativas.
+        """
+        regras = tuple(f"{classe.__module__}.{classe.__qualname__}" for classe in self.regras_validacao
+                       if classe.nome not in self.regras_desativadas)
+        return tuple(self.token_patterns), self.MAX_IDENTIFICADOR_LENGTH, self.MAX_NUMERO_LENGTH, regras
+    
+    def impressao_digital(self) -> bytes:
+        """
+        Identifica a versão do analisador nas chaves do CacheAnalise: o hash do
+        código-fonte deste módulo, a configuração (padrões de tokens, limites e
+        regras de validação ativas) e a versão do Python (formato do marshal).
+        """
+        padroes, max_identificador, max_numero, regras = self.configuracao()
+        configuracao = repr((list(padroes), max_identificador, max_numero, list(regras), sys.version_info[:2]))
+        return _hash_modulo() + configuracao.encode('utf-8')
+    
+    def analisar_completo(self, codigo: str, tokens: Optional[List[Token]] = None,
+                          arvore_compacta: bool = False,
+                          sintatico: Optional[AnalisadorSintatico] = None,
+                          construir_arvore: bool = True,
+                          metricas: Optional[MetricasAnalise] = None) -> Tuple[List[Token], Optional[NoSintatico], List[Token]]:
         """
         Realiza análise léxica e sintática completa.
+        Se tokens for informado (por exemplo, por um LexicoIncremental), a análise
+        léxica não é refeita e esses tokens são usados como os tokens do código.
+        Com arvore_compacta, a árvore é guardada em uma ArvoreCompacta e a raiz
+        retornada é um NoView, que se comporta como um NoSintatico.
+        Com sintatico (um AnalisadorSintatico mantido entre as chamadas), a análise
+        sintática usa reanalisar e reaproveita os comandos não editados da chamada
+        anterior.
+        Com construir_arvore=False, a sintaxe é apenas verificada (reconhecer):
+        os erros são os mesmos, nenhum nó é criado e a árvore retornada é None.
+        Os erros sintáticos são seguidos dos erros de delimitadores
+        (validar_delimitadores) e de símbolos (validar_simbolos).
+        Com self.cache definido, o resultado de uma análise sem tokens, sem
+        sintatico e sem arvore_compacta é buscado no cache antes de ser calculado
+        e gravado nele depois; um acerto retorna objetos novos, iguais aos da
+        análise.
+        Com self.memoria definida, o resultado de uma análise sem tokens e sem
+        sintatico depende apenas do código, da configuração do analisador e do
+        limite de erros e é guardado em memória: as chamadas seguintes com o
+        mesmo código o retornam sem analisar nada, em listas novas. Nesse caso a
+        árvore retornada, inclusive pela primeira chamada, é sempre um
+        NoSomenteLeitura (com os mesmos atributos e a mesma impressão de
+        NoSintatico, com ou sem arvore_compacta), e os tokens são compartilhados
+        entre as chamadas e devem ser tratados como somente leitura. Quem usa a
+        análise incremental consulta a memória antes e guarda o resultado com
+        MemoriaAnalise.gravar_incremental.
+        Com metricas (uma MetricasAnalise), o tempo de cada fase e os contadores da
+        análise são registrados nela; a memória e o cache são ignorados para que
+        todas as fases sejam executadas. Sem metricas, nada é medido.
         Retorna: (tokens_lexicos, arvore_sintatica, erros_sintaticos)
         """
-        # Análise léxica
-        tokens_lexicos = self.analisar(codigo)
+        chave_memoria = None
+        if self.memoria is not None and metricas is None and tokens is None and sintatico is None:
+            chave_memoria = self.memoria.chave(self.configuracao(), codigo, construir_arvore,
+                                               AnalisadorSintatico.MAX_ERROS)
+            resultado = self.memoria.obter(chave_memoria)
+            if resultado is not None:
+                return resultado
+        
+        chave = None
+        if (self.cache is not None and metricas is None and tokens is None
+                and sintatico is None and not arvore_compacta):
+            modo = b"completo" if construir_arvore else b"reconhecer"
+            chave = self.cache.chave(self.impressao_digital(), modo, codigo.encode('utf-8', 'surrogatepass'))
+            dados = self.cache.obter(chave)
+            if dados is not None:
+                resultado = _restaurar_resultado(dados)
+                if chave_memoria is not None:
+                    return self.memoria.gravar(chave_memoria, *resultado)
+                return resultado
         
-        # Análise sintática
-        analisador_sintatico = AnalisadorSintatico()
-        arvore_sintatica, erros_sintaticos = analisador_sintatico.analisar(tokens_lexicos)
+        # Análise léxica
+        if tokens is not None:
+            tokens_lexicos = tokens
+        elif metricas is not None:
+            tokens_lexicos = self._analisar_medido(codigo, metricas)
+        else:
+            tokens_lexicos = self.analisar(codigo)
         
-        # Adiciona validação de delimitadores
-        erros_delimitadores = analisador_sintatico.validar_delimitadores()
-        erros_sintaticos.extend(erros_delimitadores)
+        medir = metricas.medir if metricas is not None else _sem_medicao
+        medir_sintatico = metricas.medir_sintatico if metricas is not None else _sem_medicao
         
+        # Análise sintática
+        analisador_sintatico = sintatico if sintatico is not None else AnalisadorSintatico()
+        with medir_sintatico(analisador_sintatico):
+            if not construir_arvore:
+                arvore_sintatica, erros_sintaticos = None, analisador_sintatico.reconhecer(tokens_lexicos)
+            elif arvore_compacta:
+                arvore_sintatica, erros_sintaticos = analisador_sintatico.analisar_compacto(tokens_lexicos)
+            elif sintatico is not None:
+                arvore_sintatica, erros_sintaticos = analisador_sintatico.reanalisar(tokens_lexicos)
+            else:
+                arvore_sintatica, erros_sintaticos = analisador_sintatico.analisar(tokens_lexicos)
+        
+        # Adiciona validação de delimitadores e de símbolos (em uma nova lista: a do
+        # analisador sintático é reaproveitada pela próxima reanálise), dentro do
+        # mesmo limite max_erros
+        num_erros = len(erros_sintaticos)
+        with medir("delimitadores"):
+            erros_delimitadores = analisador_sintatico.validar_delimitadores()
+        with medir("simbolos"):
+            erros_simbolos = analisador_sintatico.validar_simbolos()
+        erros_sintaticos = erros_sintaticos + erros_delimitadores + erros_simbolos
+        if analisador_sintatico.max_erros is not None:
+            del erros_sintaticos[max(analisador_sintatico.max_erros, num_erros):]
+        
+        if metricas is not None:
+            metricas.registrar_resultado(tokens_lexicos, arvore_sintatica, erros_sintaticos)
+        if chave is not None:
+            self.cache.gravar(chave, (_serializar_tokens(tokens_lexicos), _serializar_tokens(erros_sintaticos),
+                                      _serializar_arvore(arvore_sintatica, tokens_lexicos)))
+        if chave_memoria is not None:
+            return self.memoria.gravar(chave_memoria, tokens_lexicos, arvore_sintatica, erros_sintaticos)
         return tokens_lexicos, arvore_sintatica, erros_sintaticos
 
-    def analisar(self, codigo: str) -> List[Token]:
-        tokens = []
-        linhas = codigo.split('\n')
+    def _analisar_medido(self, codigo: str, metricas: MetricasAnalise) -> List[Token]:
+        """
+        Análise léxica de analisar_completo com metricas: a mesma de analisar
+        (motor "mestre"), mas com a divisão em linhas, o reconhecimento e a
+        validação executados um após o outro e medidos separadamente. Durante o
+        reconhecimento, a regex mestre e os padrões contam as tentativas em
+        _RegexContado, o que acrescenta um pequeno custo a essa fase.
+        """
+        with metricas.medir("divisao_linhas"):
+            linhas = codigo.split('\n')
         
-        for num_linha, linha in enumerate(linhas, 1):
-            coluna = 0
-            
-            while coluna < len(linha):
-                token_encontrado = False
-                
-                # Verifica erros específicos primeiro
-                erro_string = self._verificar_string_nao_fechada(linha, coluna)
-                if erro_string:
-                    erro_string.linha = num_linha
-                    tokens.append(erro_string)
-                    coluna = len(linha)  # Pula para o final da linha
-                    continue
-                
-                erro_numero = self._verificar_numero_malformado(linha, coluna)
-                if erro_numero:
-                    erro_numero.linha = num_linha
-                    tokens.append(erro_numero)
-                    # Pula o número mal formado
-                    coluna += len(erro_numero.lexema)
-                    continue
-                
-                erro_identificador = self._verificar_identificador_malformado(linha, coluna)
-                if erro_identificador:
-                    erro_identificador.linha = num_linha
-                    tokens.append(erro_identificador)
-                    # Pula o identificador mal formado
-                    coluna += len(erro_identificador.lexema)
-                    continue
-                
-                erro_operador_relacional = self._verificar_operador_relacional_malformado(linha, coluna)
-                if erro_operador_relacional:
-                    erro_operador_relacional.linha = num_linha
-                    tokens.append(erro_operador_relacional)
-                    coluna += len(erro_operador_relacional.lexema)
-                    continue
-                
-                erro_palavra_reservada = self._verificar_palavra_reservada_malformada(linha, coluna)
-                if erro_palavra_reservada:
-                    erro_palavra_reservada.linha = num_linha
-                    tokens.append(erro_palavra_reservada)
-                    coluna += len(erro_palavra_reservada.lexema)
-                    continue
-                
-                # Tenta fazer match com cada padrão
-                for token_type, pattern, desc in self.compiled_patterns:
-                    match = pattern.match(linha, coluna)
-                    
-                    if match:
-                        lexema = match.group(0)
-                        
-                        # Verifica se identificador é muito longo
-                        if token_type == TokenType.IDENTIFICADOR and len(lexema) > self.MAX_IDENTIFICADOR_LENGTH:
-                            token = Token(
-                                tipo=TokenType.ERRO_IDENTIFICADOR_MUITO_LONGO,
-                                lexema=lexema,
-                                linha=num_linha,
-                                coluna=coluna + 1,
-                                descricao=f"Identificador muito longo (máximo {self.MAX_IDENTIFICADOR_LENGTH} caracteres): '{lexema}'",
-                                eh_erro=True
-                            )
-                        elif token_type == TokenType.VALOR_INTEIRO and len(lexema) > self.MAX_NUMERO_LENGTH:
-                            token = Token(
-                                tipo=TokenType.ERRO_NUMERO_MUITO_LONGO,
-                                lexema=lexema,
-                                linha=num_linha,
-                                coluna=coluna + 1,
-                                descricao=f"Número muito longo (máximo {self.MAX_NUMERO_LENGTH} caracteres): '{lexema}'",
-                                eh_erro=True
-                            )
-                        else:
-                            # Pula whitespace (mas não quebras de linha)
-                            if token_type == TokenType.WHITESPACE:
-                                coluna = match.end()
-                                token_encontrado = True
-                                break
-                            
-                            token = Token(
-                                tipo=token_type,
-                                lexema=lexema,
-                                linha=num_linha,
-                                coluna=coluna + 1,
-                                descricao=desc
-                            )
-                        
-                        tokens.append(token)
-                        coluna = match.end()
-                        token_encontrado = True
-                        break
-                
-                if not token_encontrado:
-                    # Verifica se é um símbolo inválido específico
-                    char = linha[coluna]
-                    if char in '@$%#&!':
-                        token = Token(
-                            tipo=TokenType.ERRO_SIMBOLO_INVALIDO,
-                            lexema=char,
-                            linha=num_linha,
-                            coluna=coluna + 1,
-                            descricao=f"Símbolo não pertencente ao conjunto de símbolos terminais da linguagem: '{char}'",
-                            eh_erro=True
-                        )
-                    else:
-                        # Caractere não reconhecido genérico
-                        token = Token(
-                            tipo=TokenType.ERRO,
-                            lexema=char,
-                            linha=num_linha,
-                            coluna=coluna + 1,
-                            descricao=f"Caractere não reconhecido: '{char}'",
-                            eh_erro=True
-                        )
-                    
-                    tokens.append(token)
-                    coluna += 1
-          # Adiciona token EOF
-        tokens.append(Token(
+        regex_mestre, padroes = self.regex_mestre, self.compiled_patterns
+        self.regex_mestre = _RegexContado(regex_mestre, metricas)
+        self.compiled_patterns = [(tipo, _RegexContado(padrao, metricas), desc) for tipo, padrao, desc in padroes]
+        try:
+            with metricas.medir("reconhecimento"):
+                tokens = list(self._tokens_lexicos(linhas, self._analisar_linha_mestre))
+        finally:
+            self.regex_mestre, self.compiled_patterns = regex_mestre, padroes
+        
+        with metricas.medir("validacao"):
+            return list(self._validar_tokens(iter(tokens), metricas))
+    
+    def analisar(self, codigo: str, motor: str = "mestre", paralelo: bool = False,
+                 processos: Optional[int] = None) -> List[Token]:
+        """
+        Realiza a análise léxica do código.
+        O parâmetro motor escolhe o mecanismo de reconhecimento:
+        "mestre" (regex única com grupos nomeados), "padroes" (um padrão por vez)
+        ou "afd" (autômato com tabela de classes de caracteres).
+        Todos produzem exatamente a mesma sequência de tokens.
+        Com paralelo=True e um código de pelo menos LIMIAR_PARALELO caracteres, o
+        código é dividido em partes nas quebras de linha (nenhum token atravessa
+        uma linha), as partes são analisadas em um ProcessPoolExecutor com
+        processos processos (padrão: número de núcleos) e os tokens são juntados
+        na ordem das partes; as regras de validação do programa completo
+        percorrem o resultado juntado. A saída é idêntica à da análise sequencial.
+        Com um único processo, ou quando o código não pode ser dividido (uma só
+        linha longa), a análise é sequencial: os processos só acrescentariam o
+        custo de enviar as partes e devolver os tokens.
+        """
+        if paralelo and len(codigo) >= self.LIMIAR_PARALELO:
+            processos = processos or os.cpu_count() or 1
+            if processos > 1:
+                partes, primeiras_linhas = self._dividir_partes(codigo, processos)
+                if len(partes) > 1:
+                    self._selecionar_motor(motor)  # Um motor inválido falha antes de criar os processos
+                    return list(self._validar_tokens(
+                        self._tokens_paralelos(partes, primeiras_linhas, motor, processos)))
+        return list(self._gerar_tokens(codigo.split('\n'), motor))
+    
+    @staticmethod
+    def _dividir_partes(codigo: str, processos: int) -> Tuple[List[str], List[int]]:
+        """
+        Divide o código em cerca de processos * 4 partes terminadas em quebras de
+        linha; retorna as partes e o número da primeira linha de cada uma.
+        """
+        tamanho_parte = max(1, len(codigo) // (processos * 4))
+        partes = []
+        primeiras_linhas = []
+        inicio = 0
+        num_linha = 1
+        while True:
+            # Cada parte termina na primeira quebra de linha depois do tamanho alvo
+            fim = codigo.find('\n', inicio + tamanho_parte)
+            parte = codigo[inicio:] if fim == -1 else codigo[inicio:fim]
+            partes.append(parte)
+            primeiras_linhas.append(num_linha)
+            num_linha += parte.count('\n') + 1
+            if fim == -1:
+                break
+            inicio = fim + 1
+        return partes, primeiras_linhas
+    
+    def _tokens_paralelos(self, partes: List[str], primeiras_linhas: List[int], motor: str,
+                          processos: int) -> Iterator[Token]:
+        """
+        Gera os tokens de analisar com paralelo=True, na ordem das partes,
+        seguidos do token EOF. Cada parte vai a um processo como texto com o número
+        da sua primeira linha e volta como tuplas de tipos básicos.
+        """
+        limites = (self.MAX_IDENTIFICADOR_LENGTH, self.MAX_NUMERO_LENGTH)
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            for dados in executor.map(_analisar_parte_lexica, partes, primeiras_linhas,
+                                      [motor] * len(partes), [limites] * len(partes)):
+                with _coletor_pausado():
+                    tokens = _restaurar_tokens(dados)
+                yield from tokens
+        
+        yield Token(
             tipo=TokenType.EOF,
             lexema="",
-            linha=len(linhas) + 1,
+            linha=primeiras_linhas[-1] + partes[-1].count('\n') + 1,
             coluna=1,
             descricao="Fim do arquivo"
-        ))
-        
-        # Valida se o programa começa com 'als'
-        erro_inicio = self._validar_inicio_programa(tokens)
-        if erro_inicio:
-            tokens.insert(0, erro_inicio)
-        
-        # Validação de tipos
-        erros_tipo = self._validar_tipos_variaveis(tokens)
-        tokens.extend(erros_tipo)
+        )
+    
+    def analisar_compacto(self, codigo: str, motor: str = "mestre") -> TokenStore:
+        """
+        Realiza a análise léxica guardando os tokens em um TokenStore.
+        Produz os mesmos tokens de analisar(), mas cada Token só existe enquanto
+        é copiado para as colunas do armazenamento.
+        """
+        store = TokenStore(codigo)
+        store.extend(self._gerar_tokens(codigo.split('\n'), motor))
+        return store
+    
+    def iter_tokens(self, fluxo: TextIO, motor: str = "mestre", tamanho_bloco: int = 65536) -> Iterator[Token]:
+        """
+        Gera os tokens de um fluxo de texto (arquivo aberto, StringIO, ...) à medida
+        que são reconhecidos, lendo o fluxo em blocos de tamanho_bloco caracteres.
+        Produz a mesma sequência de analisar(), mas mantém em memória apenas a
+        linha atual: o código completo nunca é carregado.
+        """
+        return self._gerar_tokens(self._ler_linhas(fluxo, tamanho_bloco), motor)
+    
+    def _ler_linhas(self, fluxo: TextIO, tamanho_bloco: int) -> Iterator[str]:
+        """Lê o fluxo em blocos e gera suas linhas, inclusive as que atravessam blocos."""
+        pedacos = []  # Partes da linha atual lidas em blocos anteriores
+        while True:
+            bloco = fluxo.read(tamanho_bloco)
+            if not bloco:
+                break
+            
+            inicio = 0
+            fim = bloco.find('\n')
+            while fim != -1:
+                pedacos.append(bloco[inicio:fim])
+                yield ''.join(pedacos)
+                pedacos = []
+                inicio = fim + 1
+                fim = bloco.find('\n', inicio)
+            pedacos.append(bloco[inicio:])
+        
+        # Última linha (vazia se o fluxo termina com quebra de linha), como em split('\n')
+        yield ''.join(pedacos)
+    
+    def _linhas_buffer(self, buffer) -> Iterator[Tuple[int, int]]:
+        """
+        Gera (início, fim) de cada linha de um buffer de bytes, com as mesmas
+        quebras de linha da leitura em modo texto ('\n', '\r\n' e '\r').
+        """
+        tamanho = len(buffer)
+        inicio = 0
+        proximo_n = buffer.find(b'\n')
+        proximo_r = buffer.find(b'\r')
+        while proximo_n != -1 or proximo_r != -1:
+            if proximo_r == -1 or (proximo_n != -1 and proximo_n < proximo_r):
+                yield inicio, proximo_n
+                inicio = proximo_n + 1
+            else:
+                yield inicio, proximo_r
+                inicio = proximo_r + 1
+                if proximo_n == inicio:
+                    inicio += 1  # '\r\n' é uma única quebra
+                proximo_r = buffer.find(b'\r', inicio)
+            if proximo_n != -1 and proximo_n < inicio:
+                proximo_n = buffer.find(b'\n', inicio)
+        
+        # Última linha (vazia se o buffer termina com quebra de linha)
+        yield inicio, tamanho
+    
+    def _tokens_buffer(self, buffer) -> Iterator[Token]:
+        """
+        Gera os tokens de um buffer de bytes em UTF-8 linha a linha, seguidos do
+        token EOF. Linhas só com ASCII são analisadas direto nos bytes; as demais
+        são decodificadas e analisadas pelo motor "mestre".
+        """
+        tokens_linha = []
+        num_linha = 0
+        proximo_nao_ascii = self.regex_nao_ascii.search(buffer)
+        proximo_nao_ascii = proximo_nao_ascii.start() if proximo_nao_ascii else len(buffer)
+        
+        for num_linha, (inicio, fim) in enumerate(self._linhas_buffer(buffer), 1):
+            if proximo_nao_ascii < inicio:
+                proximo_nao_ascii = self.regex_nao_ascii.search(buffer, inicio)
+                proximo_nao_ascii = proximo_nao_ascii.start() if proximo_nao_ascii else len(buffer)
+            
+            if proximo_nao_ascii >= fim:
+                self._analisar_linha_bytes(buffer, inicio, fim, num_linha, tokens_linha)
+            else:
+                self._analisar_linha_mestre(buffer[inicio:fim].decode('utf-8'), num_linha, tokens_linha)
+            yield from tokens_linha
+            tokens_linha.clear()
         
-        # Validação de expressões condicionais
-        erros_condicionais = self._validar_expressoes_condicionais(tokens)
-        tokens.extend(erros_condicionais)
+        yield Token(
+            tipo=TokenType.EOF,
+            lexema="",
+            linha=num_linha + 1,
+            coluna=1,
+            descricao="Fim do arquivo"
+        )
+    
+    def _selecionar_motor(self, motor: str):
+        """Retorna o método que analisa uma linha com o motor indicado."""
+        if motor == "mestre":
+            return self._analisar_linha_mestre
+        elif motor == "afd":
+            return self._analisar_linha_afd
+        elif motor == "padroes":
+            return self._analisar_linha_padroes
+        raise ValueError(f"Motor léxico desconhecido: '{motor}'. Use um de: {', '.join(self.MOTORES)}")
+    
+    def _tokens_lexicos(self, linhas: Iterable[str], analisar_linha) -> Iterator[Token]:
+        """Gera os tokens reconhecidos linha a linha, seguidos do token EOF."""
+        tokens_linha = []
+        num_linha = 0
         
-        # Validação de comandos input
-        erros_input = self._validar_comando_input(tokens)
-        tokens.extend(erros_input)
+        for num_linha, linha in enumerate(linhas, 1):
+            analisar_linha(linha, num_linha, tokens_linha)
+            yield from tokens_linha
+            tokens_linha.clear()
         
-        return tokens
+        # Adiciona token EOF
+        yield Token(
+            tipo=TokenType.EOF,
+            lexema="",
+            linha=num_linha + 1,
+            coluna=1,
+            descricao="Fim do arquivo"
+        )
+    
+    def _gerar_tokens(self, linhas: Iterable[str], motor: str) -> Iterator[Token]:
+        """Seleciona o motor (falhando imediatamente se for inválido) e gera os tokens validados."""
+        analisar_linha = self._selecionar_motor(motor)
+        return self._validar_tokens(self._tokens_lexicos(linhas, analisar_linha))
+    
+    def registrar_regra(self, classe_regra: type, antes_de: Optional[str] = None) -> None:
+        """
+        Inclui uma regra de validação (subclasse de RegraValidacao) no final da
+        lista ou antes da regra chamada antes_de.
+        """
+        if any(regra.nome == classe_regra.nome for regra in self.regras_validacao):
+            raise ValueError(f"Já existe uma regra de validação chamada '{classe_regra.nome}'")
+        if antes_de is None:
+            self.regras_validacao.append(classe_regra)
+        else:
+            self.regras_validacao.insert(self._posicao_regra(antes_de), classe_regra)
+        self._regras_alteradas()
+    
+    def desativar_regra(self, nome: str) -> None:
+        """Desativa a regra de validação: ela deixa de ser criada e de receber tokens."""
+        self._posicao_regra(nome)
+        self.regras_desativadas.add(nome)
+        self._regras_alteradas()
+    
+    def ativar_regra(self, nome: str) -> None:
+        self._posicao_regra(nome)
+        self.regras_desativadas.discard(nome)
+        self._regras_alteradas()
+    
+    def _regras_alteradas(self) -> None:
+        # Os resultados guardados em memória foram produzidos com as regras antigas
+        # (as chaves do cache em disco já incluem as regras ativas)
+        if self.memoria is not None:
+            self.memoria.limpar()
+    
+    def _posicao_regra(self, nome: str) -> int:
+        for posicao, regra in enumerate(self.regras_validacao):
+            if regra.nome == nome:
+                return posicao
+        nomes = ', '.join(regra.nome for regra in self.regras_validacao)
+        raise ValueError(f"Regra de validação desconhecida: '{nome}'. Use uma de: {nomes}")
+    
+    def _validar_tokens(self, tokens: Iterator[Token],
+                        metricas: Optional[MetricasAnalise] = None) -> Iterator[Token]:
+        """
+        Gera os tokens léxicos e os erros das regras de validação ativas, com um
+        único percurso dos tokens compartilhado por todas as regras:
+        - os erros das regras antes_dos_tokens (início com 'als') vêm antes de
+          todos os tokens, por isso os tokens são retidos apenas até essas regras
+          decidirem (no primeiro token significativo);
+        - os erros das demais regras (tipos, expressões condicionais, comandos
+          input) vêm depois do EOF, na ordem das regras, e cada regra também
+          recebe os erros gerados pelas regras anteriores.
+        Com metricas, o tempo de cada regra (e o da tabela de símbolos) é somado
+        em metricas.tempos_regras.
+        """
+        regras = [classe() for classe in self.regras_validacao if classe.nome not in self.regras_desativadas]
+        iniciais = [regra for regra in regras if regra.antes_dos_tokens]
+        finais = [regra for regra in regras if not regra.antes_dos_tokens]
+        
+        # Uma única tabela de símbolos, preenchida antes das regras que a consultam
+        tabela = TabelaSimbolos()
+        usam_tabela = False
+        for regra in regras:
+            if regra.usa_tabela_simbolos:
+                regra.tabela_simbolos = tabela
+                usam_tabela = True
+        
+        if metricas is not None:
+            if usam_tabela:
+                tabela.consumir = metricas.cronometrar("tabela_simbolos", tabela.consumir)
+            for regra in regras:
+                regra.consumir = metricas.cronometrar(regra.nome, regra.consumir)
+                regra.finalizar = metricas.cronometrar(regra.nome, regra.finalizar)
+        
+        retidos = []
+        if iniciais:
+            for token in tokens:
+                retidos.append(token)
+                for regra in iniciais:
+                    regra.consumir(token)
+                if all(regra.decidido for regra in iniciais):
+                    break
+        erros_iniciais = [erro for regra in iniciais for erro in regra.finalizar()]
+        
+        consumidores = [regra.consumir for regra in finais]
+        if usam_tabela:
+            consumidores.insert(0, tabela.consumir)
+        for token in chain(erros_iniciais, retidos, tokens):
+            for consumir in consumidores:
+                consumir(token)
+            yield token
+        
+        for posicao, regra in enumerate(finais):
+            for erro in regra.finalizar():
+                for seguinte in finais[posicao + 1:]:
+                    seguinte.consumir(erro)
+                yield erro
+    
     def imprimir_tokens(self, tokens: List[Token]) -> str:
         resultado = f"{'Token':<25} {'Lexema':<20} {'Linha':<6} {'Coluna':<7} {'Descrição'}\n"
         resultado += "-" * 100 + "\n"
@@ -1605,28 +3866,552 @@ class AnalisadorLexico:
             'tokens_validos': total_tokens - total_erros
         }
     
-    def analisar_arquivo(self, caminho_arquivo: str) -> List[Token]:
+    def analisar_arquivo(self, caminho_arquivo: str, usar_mmap: bool = False) -> List[Token]:
         """
         Analisa um arquivo e retorna os tokens.
+        Com usar_mmap=True o arquivo é mapeado em memória e analisado direto nos
+        bytes, sem ser lido nem decodificado por inteiro: só os lexemas dos tokens
+        são criados como strings. A saída é a mesma da leitura em modo texto.
+        Com self.cache definido, os tokens são buscados no cache pelo hash dos
+        bytes do arquivo (nos dois modos) e gravados nele depois de uma falha.
+        Erros de leitura são informados e resultam em uma lista vazia.
         """
         try:
-            with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
-                codigo = arquivo.read()
-            return self.analisar(codigo)
+            return self._tokens_arquivo(caminho_arquivo, usar_mmap)
         except FileNotFoundError:
             print(f"Erro: Arquivo '{caminho_arquivo}' não encontrado.")
             return []
         except Exception as e:
             print(f"Erro ao ler arquivo: {e}")
             return []
+    
+    def _tokens_arquivo(self, caminho_arquivo: str, usar_mmap: bool) -> List[Token]:
+        """analisar_arquivo sem o tratamento dos erros de leitura (OSError, UnicodeDecodeError)."""
+        chave = None
+        if self.cache is not None:
+            resumo = hashlib.sha256()
+            with open(caminho_arquivo, 'rb') as arquivo:
+                for bloco in iter(lambda: arquivo.read(1 << 20), b''):
+                    resumo.update(bloco)
+            chave = self.cache.chave(self.impressao_digital(), b"arquivo", resumo.digest())
+            dados = self.cache.obter(chave)
+            if dados is not None:
+                return _restaurar_resultado(dados)[0]
+        
+        if usar_mmap:
+            with open(caminho_arquivo, 'rb') as arquivo:
+                if os.fstat(arquivo.fileno()).st_size == 0:
+                    # Arquivos vazios não podem ser mapeados
+                    tokens = list(self._validar_tokens(self._tokens_buffer(b'')))
+                else:
+                    with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                        tokens = list(self._validar_tokens(self._tokens_buffer(buffer)))
+        else:
+            with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
+                tokens = list(self.iter_tokens(arquivo))
+        
+        if chave is not None:
+            self.cache.gravar(chave, (_serializar_tokens(tokens), [], None))
+        return tokens
+
+
+class LexicoIncremental:
+    """
+    Mantém os tokens léxicos de um documento separados por linha, para que uma
+    edição reanalise apenas as linhas alteradas.
+    Como nenhum token atravessa linhas, os tokens das demais linhas continuam
+    válidos; quando a edição muda a quantidade de linhas, o campo linha dos
+    tokens seguintes é corrigido somente quando a lista completa é montada.
+    Apenas o reconhecimento é incremental: tokens() e atualizar() passam as
+    regras de validação (tabela de símbolos, tipos, condições, input) por todos
+    os tokens do documento, então o custo deles é O(n) no tamanho do documento,
+    e não o de analisar uma linha.
+    """
+    
+    def __init__(self, analisador: 'AnalisadorLexico', codigo: str = "", motor: str = "mestre"):
+        self.analisador = analisador
+        self._analisar_linha = analisador._selecionar_motor(motor)
+        self.linhas: List[str] = []
+        self.tokens_por_linha: List[List[Token]] = []
+        self._substituir_linhas(0, 0, codigo.split('\n'))
+    
+    @property
+    def codigo(self) -> str:
+        return '\n'.join(self.linhas)
+    
+    def editar(self, linha_inicio: int, linha_fim: int, novo_texto: str):
+        """
+        Substitui as linhas linha_inicio..linha_fim (numeradas a partir de 1,
+        inclusive) por novo_texto, que pode conter várias linhas.
+        Com linha_fim = linha_inicio - 1 o texto é inserido antes de linha_inicio.
+        Somente as linhas de novo_texto são analisadas.
+        """
+        if not 1 <= linha_inicio <= len(self.linhas) + 1 or not linha_inicio - 1 <= linha_fim <= len(self.linhas):
+            raise ValueError(f"Intervalo de linhas inválido: {linha_inicio}..{linha_fim} (o documento tem {len(self.linhas)} linhas)")
+        self._substituir_linhas(linha_inicio - 1, linha_fim, novo_texto.split('\n'))
+    
+    def atualizar(self, codigo: str) -> List[Token]:
+        """
+        Compara codigo com o texto atual, reanalisa apenas o trecho de linhas que
+        mudou e retorna os tokens do novo código (os mesmos de analisar(codigo)).
+        A comparação e a validação (tokens()) percorrem o documento inteiro.
+        """
+        novas = codigo.split('\n')
+        antigas = self.linhas
+        limite = min(len(antigas), len(novas))
+        
+        inicio = 0
+        while inicio < limite and antigas[inicio] == novas[inicio]:
+            inicio += 1
+        fim_antigas, fim_novas = len(antigas), len(novas)
+        while fim_antigas > inicio and fim_novas > inicio and antigas[fim_antigas - 1] == novas[fim_novas - 1]:
+            fim_antigas -= 1
+            fim_novas -= 1
+        
+        if inicio != fim_antigas or inicio != fim_novas:
+            self._substituir_linhas(inicio, fim_antigas, novas[inicio:fim_novas])
+        return self.tokens()
+    
+    def _substituir_linhas(self, inicio: int, fim: int, novas_linhas: List[str]):
+        """Troca as linhas de índice inicio..fim-1 por novas_linhas, analisando só as novas."""
+        analisar_linha = self._analisar_linha
+        novos_tokens = []
+        for num_linha, linha in enumerate(novas_linhas, inicio + 1):
+            tokens_linha = []
+            analisar_linha(linha, num_linha, tokens_linha)
+            novos_tokens.append(tokens_linha)
+        
+        # Apenas referências são movidas; os tokens das outras linhas não são copiados
+        self.linhas[inicio:fim] = novas_linhas
+        self.tokens_por_linha[inicio:fim] = novos_tokens
+    
+    def tokens_lexicos(self) -> List[Token]:
+        """Retorna os tokens léxicos do documento, seguidos do token EOF."""
+        resultado = []
+        for num_linha, tokens_linha in enumerate(self.tokens_por_linha, 1):
+            if tokens_linha:
+                deslocamento = num_linha - tokens_linha[0].linha
+                if deslocamento:
+                    # Linha deslocada por edições anteriores: corrige seus tokens uma única vez
+                    for token in tokens_linha:
+                        token.linha += deslocamento
+                resultado.extend(tokens_linha)
+        
+        resultado.append(Token(
+            tipo=TokenType.EOF,
+            lexema="",
+            linha=len(self.linhas) + 1,
+            coluna=1,
+            descricao="Fim do arquivo"
+        ))
+        return resultado
+    
+    def tokens(self) -> List[Token]:
+        """
+        Retorna os tokens do documento com os erros das validações do programa
+        completo, exatamente como analisar(codigo). As validações dependem do
+        programa inteiro e por isso percorrem todos os tokens a cada chamada (O(n)).
+        """
+        return list(self.analisador._validar_tokens(iter(self.tokens_lexicos())))
+
+
+# Hash SHA-256 do código-fonte deste módulo, calculado na primeira chave do cache
+_hash_fonte = None
+
+
+def _hash_modulo() -> bytes:
+    global _hash_fonte
+    if _hash_fonte is None:
+        try:
+            with open(__file__, 'rb') as arquivo:
+                _hash_fonte = hashlib.sha256(arquivo.read()).digest()
+        except (OSError, NameError):
+            _hash_fonte = b""  # Sem o arquivo-fonte: só a configuração identifica a versão
+    return _hash_fonte
+
+
+def _serializar_tokens(tokens: List[Token]) -> list:
+    """Converte os tokens em tuplas de tipos básicos (código do tipo no lugar do TokenType)."""
+    return [(CODIGO_TIPO[t.tipo], t.lexema, t.linha, t.coluna, t.descricao, t.eh_erro) for t in tokens]
+
+
+def _restaurar_tokens(dados: list) -> List[Token]:
+    return [Token(TIPOS_TOKEN[tipo], lexema, linha, coluna, descricao, eh_erro)
+            for tipo, lexema, linha, coluna, descricao, eh_erro in dados]
+
+
+def _serializar_arvore(raiz: Optional[NoSintatico], tokens: List[Token]) -> Optional[tuple]:
+    """
+    Converte a árvore em uma lista plana, em pré-ordem, de tuplas
+    (tipo, valor, pai, token, linha, coluna), sem recursão. pai é a posição do nó
+    pai na lista (-1 na raiz) e token é o índice em tokens; os tokens da árvore que
+    não estão em tokens são serializados à parte, com índices a partir de
+    len(tokens). -1 indica um nó sem token.
+    """
+    if raiz is None:
+        return None
+    indices = {id(token): indice for indice, token in enumerate(tokens)}
+    extras = []
+    nos = []
+    pendentes = [(raiz, -1)]
+    while pendentes:
+        no, pai = pendentes.pop()
+        token = no.token
+        if token is None:
+            referencia = -1
+        else:
+            referencia = indices.get(id(token))
+            if referencia is None:
+                referencia = indices[id(token)] = len(tokens) + len(extras)
+                extras.append(token)
+        posicao = len(nos)
+        nos.append((no.tipo, no.valor, pai, referencia, no.linha, no.coluna))
+        pendentes.extend((filho, posicao) for filho in reversed(no.filhos))
+    return nos, _serializar_tokens(extras)
+
+
+def _restaurar_arvore(dados: Optional[tuple], tokens: List[Token]) -> Optional[NoSintatico]:
+    if dados is None:
+        return None
+    dados_nos, extras = dados
+    referencias = tokens + _restaurar_tokens(extras) + [None]  # -1: nó sem token
+    nos = [NoSintatico(tipo, valor, [], referencias[referencia], linha, coluna)
+           for tipo, valor, _, referencia, linha, coluna in dados_nos]
+    # Em pré-ordem, os filhos de cada nó aparecem na ordem original
+    for no, dados_no in zip(nos, dados_nos):
+        pai = dados_no[2]
+        if pai >= 0:
+            nos[pai].filhos.append(no)
+    return nos[0]
+
+
+@contextmanager
+def _coletor_pausado():
+    """
+    Pausa o coletor de lixo enquanto objetos restaurados são criados em massa:
+    eles não formam ciclos, e as coletas disparadas por centenas de milhares de
+    alocações dominariam o tempo.
+    """
+    coletor_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if coletor_ativo:
+            gc.enable()
+
+
+def _restaurar_resultado(dados: tuple) -> Tuple[List[Token], Optional[NoSintatico], List[Token]]:
+    """Restaura (tokens, árvore, erros) de uma entrada do CacheAnalise."""
+    tokens_dados, erros_dados, arvore_dados = dados
+    with _coletor_pausado():
+        tokens = _restaurar_tokens(tokens_dados)
+        return tokens, _restaurar_arvore(arvore_dados, tokens), _restaurar_tokens(erros_dados)
+
+
+class CacheAnalise:
+    """
+    Cache em disco dos resultados de análise, endereçado pelo conteúdo: a chave
+    é o hash SHA-256 dos bytes do código somado à impressão digital do analisador
+    (AnalisadorLexico.impressao_digital), então uma mudança no código-fonte do
+    analisador, nos padrões de tokens ou nas regras ativas invalida as entradas.
+    - Cada entrada é um arquivo <chave>.cache com tuplas de tipos básicos
+      gravadas com marshal (tokens, erros e árvore em pré-ordem).
+    - A gravação é atômica: o arquivo é escrito com um nome temporário no mesmo
+      diretório e renomeado com os.replace, então vários processos podem gravar
+      ao mesmo tempo e um leitor nunca vê uma entrada pela metade.
+    - Um acerto atualiza a data de modificação da entrada; quando o tamanho total
+      passa de tamanho_maximo, as entradas usadas há mais tempo são removidas
+      (LRU) até o total ficar abaixo de 90% do limite.
+    - acertos, falhas, gravacoes e remocoes contam as operações deste objeto.
+    """
+    
+    EXTENSAO = ".cache"
+    FORMATO = 1  # Versão do formato das entradas
+    
+    def __init__(self, diretorio: str, tamanho_maximo: int = 256 * 2**20):
+        self.diretorio = diretorio
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.falhas = 0
+        self.gravacoes = 0
+        self.remocoes = 0
+        self._tamanho_total = None  # Estimativa; recalculada ao passar do limite
+        os.makedirs(diretorio, exist_ok=True)
+    
+    @staticmethod
+    def chave(*partes: bytes) -> str:
+        """Chave de uma entrada: hash SHA-256 das partes."""
+        resumo = hashlib.sha256()
+        for parte in partes:
+            resumo.update(len(parte).to_bytes(8, 'little'))
+            resumo.update(parte)
+        return resumo.hexdigest()
+    
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave + self.EXTENSAO)
+    
+    def obter(self, chave: str) -> Optional[tuple]:
+        """Retorna os dados da entrada (acerto) ou None (falha)."""
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, 'rb') as arquivo:
+                dados = marshal.loads(arquivo.read())  # marshal.load lê o arquivo aos poucos
+        except FileNotFoundError:
+            self.falhas += 1
+            return None
+        except (EOFError, ValueError, TypeError, OSError):
+            dados = None
+        if not isinstance(dados, tuple) or not dados or dados[0] != self.FORMATO:
+            # Entrada corrompida ou de outro formato: descartada
+            self._remover(caminho)
+            self.falhas += 1
+            return None
+        
+        try:
+            os.utime(caminho)  # Usada agora: última a ser removida
+        except OSError:
+            pass
+        self.acertos += 1
+        return dados[1:]
+    
+    def gravar(self, chave: str, dados: tuple) -> None:
+        """Grava a entrada (uma tupla de tipos básicos) de forma atômica e aplica o limite de tamanho."""
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        try:
+            with os.fdopen(descritor, 'wb') as arquivo:
+                tamanho = arquivo.write(marshal.dumps((self.FORMATO,) + dados))
+            os.replace(temporario, self._caminho(chave))
+        except BaseException:
+            self._remover(temporario)
+            raise
+        self.gravacoes += 1
+        
+        if self._tamanho_total is None:
+            self._reduzir()
+        else:
+            self._tamanho_total += tamanho
+            if self._tamanho_total > self.tamanho_maximo:
+                self._reduzir()
+    
+    def _reduzir(self) -> None:
+        """Recalcula o tamanho total e, acima do limite, remove as entradas menos usadas."""
+        entradas = []
+        with os.scandir(self.diretorio) as itens:
+            for item in itens:
+                if item.name.endswith(self.EXTENSAO):
+                    try:
+                        info = item.stat()
+                    except OSError:
+                        continue  # Removida por outro processo
+                    entradas.append((info.st_mtime, info.st_size, item.path))
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        
+        if total > self.tamanho_maximo:
+            alvo = self.tamanho_maximo * 0.9
+            entradas.sort()
+            for _, tamanho, caminho in entradas:
+                if total <= alvo:
+                    break
+                if self._remover(caminho):
+                    self.remocoes += 1
+                total -= tamanho
+        self._tamanho_total = total
+    
+    @staticmethod
+    def _remover(caminho: str) -> bool:
+        try:
+            os.remove(caminho)
+            return True
+        except OSError:
+            return False
+    
+    def limpar(self) -> None:
+        """Remove todas as entradas."""
+        with os.scandir(self.diretorio) as itens:
+            for item in itens:
+                if item.name.endswith(self.EXTENSAO) and self._remover(item.path):
+                    self.remocoes += 1
+        self._tamanho_total = 0
+    
+    def estatisticas(self) -> dict:
+        consultas = self.acertos + self.falhas
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acertos': self.acertos / consultas if consultas else 0.0,
+            'gravacoes': self.gravacoes,
+            'remocoes': self.remocoes,
+        }
+
+
+class MemoriaAnalise:
+    """
+    Memória LRU, no próprio processo, dos resultados de analisar_completo,
+    endereçada pelo hash SHA-256 do código e pela configuração do analisador
+    (AnalisadorLexico.memoria).
+    - Cada entrada guarda os tokens e os erros em tuplas e a raiz da árvore, sem
+      copiá-la. obter e gravar retornam listas novas e a árvore como um
+      NoSomenteLeitura, então nenhuma lista nem nó guardado é entregue a quem
+      chama; os tokens são compartilhados e devem ser tratados como somente leitura.
+    - Um acerto custa o hash do código e a cópia das tuplas para listas.
+    - Um resultado da análise incremental (gravar_incremental) compartilha os
+      tokens com o LexicoIncremental, que corrige o campo linha deles quando uma
+      edição posterior desloca as linhas. A entrada guarda também as linhas dos
+      tokens; um acerto as compara (O(n)) e entrega, no lugar dos tokens
+      corrigidos desde então, cópias com a linha guardada.
+    - Ao passar de max_entradas entradas ou de max_bytes bytes (estimados com
+      sys.getsizeof, com um nó da árvore por token; veja gravar_incremental), as
+      entradas usadas há mais tempo são removidas.
+    - acertos, falhas e remocoes contam as operações.
+    """
+    
+    def __init__(self, max_entradas: int = 32, max_bytes: int = 64 * 2**20):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        self.tamanho_bytes = 0
+        self._entradas = OrderedDict()  # chave -> (tokens, raiz, erros, bytes, linhas, trocas)
+    
+    @staticmethod
+    def chave(configuracao: tuple, codigo: str, construir_arvore: bool = True,
+              max_erros: Optional[int] = None) -> tuple:
+        """
+        Chave de um resultado: o hash SHA-256 do código, a configuração do
+        analisador (AnalisadorLexico.configuracao: padrões, limites e regras
+        ativas, os mesmos dados da impressão digital), o modo e o limite de erros.
+        """
+        resumo = hashlib.sha256(codigo.encode('utf-8', 'surrogatepass')).digest()
+        return resumo, configuracao, construir_arvore, max_erros
+    
+    def obter(self, chave: tuple) -> Optional[Tuple[List[Token], Optional[NoSomenteLeitura], List[Token]]]:
+        """Retorna (tokens, árvore, erros) como gravar (acerto) ou None (falha)."""
+        entrada = self._entradas.get(chave)
+        if entrada is None:
+            self.falhas += 1
+            return None
+        self._entradas.move_to_end(chave)
+        self.acertos += 1
+        tokens, raiz, erros, _, linhas, trocas = entrada
+        if linhas is not None:
+            self._copiar_deslocados(tokens + erros, linhas, trocas)
+        return self._resultado(tokens, raiz, erros, trocas)
+    
+    def gravar(self, chave: tuple, tokens: List[Token], arvore,
+               erros: List[Token]) -> Tuple[List[Token], Optional[NoSomenteLeitura], List[Token]]:
+        """
+        Guarda um resultado e o retorna como obter o retornará: tokens e erros em
+        listas novas e a árvore como um NoSomenteLeitura. Os tokens não podem
+        pertencer a um LexicoIncremental (use gravar_incremental).
+        """
+        tokens = tuple(tokens)
+        erros = tuple(erros)
+        tamanho = self._bytes_tokens(tokens) + self._bytes_tokens(erros)
+        if isinstance(arvore, NoView):
+            tamanho += arvore.arvore.tamanho_bytes()
+        elif arvore is not None:
+            no = NoSintatico("")
+            tamanho += len(tokens) * (sys.getsizeof(no) + sys.getsizeof(no.__dict__) + sys.getsizeof(no.filhos))
+        return self._guardar(chave, tokens, arvore, erros, None, tamanho)
+    
+    def gravar_incremental(self, chave: tuple, tokens: List[Token], arvore,
+                           erros: List[Token]) -> Tuple[List[Token], Optional[NoSomenteLeitura], List[Token]]:
+        """
+        Como gravar, para o resultado de uma análise incremental (tokens de um
+        LexicoIncremental e árvore de AnalisadorSintatico.reanalisar): guarda
+        também a linha de cada token, que as próximas edições podem corrigir.
+        Os tokens e os nós são os do documento, compartilhados com as outras
+        entradas, e não entram no tamanho estimado; só as tuplas, os erros e as
+        linhas contam.
+        """
+        tokens = tuple(tokens)
+        erros = tuple(erros)
+        linhas = array('i', [token.linha for token in chain(tokens, erros)])
+        tamanho = sys.getsizeof(tokens) + self._bytes_tokens(erros) + sys.getsizeof(linhas)
+        return self._guardar(chave, tokens, arvore, erros, linhas, tamanho)
+    
+    def _guardar(self, chave: tuple, tokens: Tuple[Token, ...], arvore, erros: Tuple[Token, ...],
+                 linhas: Optional[array], tamanho: int) -> Tuple[List[Token], Optional[NoSomenteLeitura], List[Token]]:
+        anterior = self._entradas.pop(chave, None)
+        if anterior is not None:
+            self.tamanho_bytes -= anterior[3]
+        trocas = {}
+        self._entradas[chave] = (tokens, arvore, erros, tamanho, linhas, trocas)
+        self.tamanho_bytes += tamanho
+        while self._entradas and (len(self._entradas) > self.max_entradas or self.tamanho_bytes > self.max_bytes):
+            _, removida = self._entradas.popitem(last=False)
+            self.tamanho_bytes -= removida[3]
+            self.remocoes += 1
+        return self._resultado(tokens, arvore, erros, trocas)
+    
+    @staticmethod
+    def _resultado(tokens: Tuple[Token, ...], arvore, erros: Tuple[Token, ...],
+                   trocas: dict) -> Tuple[List[Token], Optional[NoSomenteLeitura], List[Token]]:
+        raiz = NoSomenteLeitura(arvore, trocas) if arvore is not None else None
+        if trocas:
+            return ([trocas.get(id(token), token) for token in tokens], raiz,
+                    [trocas.get(id(erro), erro) for erro in erros])
+        return list(tokens), raiz, list(erros)
+    
+    @staticmethod
+    def _copiar_deslocados(tokens: Tuple[Token, ...], linhas: array, trocas: dict) -> None:
+        """
+        Acrescenta a trocas uma cópia, com a linha guardada, de cada token cuja
+        linha o LexicoIncremental corrigiu depois que a entrada foi guardada.
+        """
+        atuais = array('i', [token.linha for token in tokens])
+        if atuais == linhas:
+            return
+        for token, linha, atual in zip(tokens, linhas, atuais):
+            if atual != linha and id(token) not in trocas:
+                trocas[id(token)] = Token(token.tipo, token.lexema, linha, token.coluna,
+                                          token.descricao, token.eh_erro)
+    
+    @staticmethod
+    def _bytes_tokens(tokens: Tuple[Token, ...]) -> int:
+        """Estimativa da memória dos tokens: a tupla, os lexemas e o tamanho de um Token."""
+        tamanho = sys.getsizeof(tokens) + sum(sys.getsizeof(token.lexema) for token in tokens)
+        if tokens:
+            tamanho += len(tokens) * (sys.getsizeof(tokens[0]) + sys.getsizeof(tokens[0].__dict__))
+        return tamanho
+    
+    def limpar(self) -> None:
+        self.remocoes += len(self._entradas)
+        self._entradas.clear()
+        self.tamanho_bytes = 0
+    
+    def __len__(self) -> int:
+        return len(self._entradas)
+    
+    def estatisticas(self) -> dict:
+        consultas = self.acertos + self.falhas
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acertos': self.acertos / consultas if consultas else 0.0,
+            'remocoes': self.remocoes,
+            'entradas': len(self._entradas),
+            'tamanho_bytes': self.tamanho_bytes,
+        }
 
 
 class InterfaceGrafica:
+    # Máximo de nós exibidos na aba da árvore sintática
+    LIMITE_NOS_ARVORE = 200000
+    
     def __init__(self):
         self.analisador = AnalisadorLexico()
+        # Analisar de novo sem editar o código não refaz a análise
+        self.analisador.memoria = MemoriaAnalise()
+        self.lexico_incremental = LexicoIncremental(self.analisador)
+        self.sintatico_incremental = AnalisadorSintatico()
         self.tokens_atuais = []
         self.arvore_sintatica = None
         self.erros_sintaticos = []
+        # Métricas da última análise, quando "Medir fases" está marcado
+        self.metricas = None
         
         # Configuração da janela principal
         self.root = tk.Tk()
@@ -1678,6 +4463,12 @@ class InterfaceGrafica:
                                command=self.limpar_codigo)
         btn_limpar.grid(row=0, column=2)
         
+        # Análise instrumentada: tempos por fase e contadores na aba de estatísticas
+        self.medir_fases = tk.BooleanVar(value=False)
+        check_medir = ttk.Checkbutton(frame_botoes_arquivo, text="Medir fases",
+                                      variable=self.medir_fases)
+        check_medir.grid(row=0, column=3, padx=(10, 0))
+        
         # Botão de análise
         btn_analisar = ttk.Button(frame_esquerda, text="ANALISAR CÓDIGO (LÉXICO + SINTÁTICO)", 
                                  command=self.analisar_codigo, style='Accent.TButton')
@@ -1851,7 +4642,23 @@ wrt "Análise concluída"
             self.label_status.config(text="Analisando código (léxico + sintático)...", fg='#f39c12')
             self.root.update()
             
-            self.tokens_atuais, self.arvore_sintatica, self.erros_sintaticos = self.analisador.analisar_completo(codigo)
+            if self.medir_fases.get():
+                # Análise completa, sem reaproveitamento, para que todas as fases sejam medidas
+                self.metricas = MetricasAnalise()
+                self.tokens_atuais, self.arvore_sintatica, self.erros_sintaticos = self.analisador.analisar_completo(
+                    codigo, metricas=self.metricas)
+            else:
+                self.metricas = None
+                memoria = self.analisador.memoria
+                chave = memoria.chave(self.analisador.configuracao(), codigo, True,
+                                      self.sintatico_incremental.max_erros)
+                resultado = memoria.obter(chave)
+                if resultado is None:
+                    # Apenas as linhas alteradas desde a última análise são reanalisadas
+                    tokens = self.lexico_incremental.atualizar(codigo)
+                    resultado = memoria.gravar_incremental(chave, *self.analisador.analisar_completo(
+                        codigo, tokens, sintatico=self.sintatico_incremental))
+                self.tokens_atuais, self.arvore_sintatica, self.erros_sintaticos = resultado
             
             # Atualizar resultados
             self.atualizar_tokens()
@@ -1964,11 +4771,14 @@ wrt "Análise concluída"
         if not self.arvore_sintatica:
             self.texto_arvore.insert('1.0', "Nenhuma árvore sintática gerada devido a erros.")
         else:
-            resultado = "ÁRVORE SINTÁTICA GERADA:\n"
-            resultado += "=" * 50 + "\n\n"
-            resultado += str(self.arvore_sintatica)
+            self.texto_arvore.insert(tk.END, "ÁRVORE SINTÁTICA GERADA:\n" + "=" * 50 + "\n\n")
+            
+            # A árvore é inserida em blocos de linhas, sem montar uma string única
+            escritor = EscritorArvore(max_nos=self.LIMITE_NOS_ARVORE)
+            for bloco in escritor.blocos(self.arvore_sintatica):
+                self.texto_arvore.insert(tk.END, bloco)
             
-            resultado += "\n\nEXPLICAÇÃO DA ÁRVORE SINTÁTICA:\n"
+            resultado = "\n\nEXPLICAÇÃO DA ÁRVORE SINTÁTICA:\n"
             resultado += "-" * 40 + "\n"
             resultado += "• PROGRAMA: Nó raiz que representa todo o programa\n"
             resultado += "• INICIO: Palavra reservada 'als'\n"
@@ -1983,7 +4793,7 @@ wrt "Análise concluída"
             resultado += "• VALOR_*: Valores literais (inteiros, reais, texto, lógicos)\n"
             resultado += "• IDENTIFICADOR: Nomes de variáveis\n"
             
-            self.texto_arvore.insert('1.0', resultado)
+            self.texto_arvore.insert(tk.END, resultado)
     
     def atualizar_estatisticas(self):
         """Atualiza a aba de estatísticas com informações léxicas e sintáticas."""
@@ -2036,16 +4846,21 @@ wrt "Análise concluída"
         for tipo, quantidade in sorted(stats['tipos_tokens'].items()):
             resultado += f"{tipo:<25}: {quantidade:>3}\n"
         
+        if self.metricas is not None:
+            resultado += "\n" + self.metricas.formatar()
+        
         self.texto_stats.insert('1.0', resultado)
     
     def _contar_nos_arvore(self, no: NoSintatico) -> int:
-        """Conta recursivamente o número de nós na árvore sintática."""
+        """Conta o número de nós na árvore sintática (NoSintatico ou NoView)."""
         if not no:
             return 0
         
-        count = 1  # Conta o nó atual
-        for filho in no.filhos:
-            count += self._contar_nos_arvore(filho)
+        count = 0
+        pendentes = [no]
+        while pendentes:
+            count += 1  # Conta o nó atual
+            pendentes.extend(pendentes.pop().filhos)
         
         return count
     
@@ -2053,9 +4868,171 @@ wrt "Análise concluída"
         self.root.mainloop()
 
 
+def verificar_arquivos(caminhos: List[str]) -> int:
+    """
+    Verifica a sintaxe dos arquivos sem construir a árvore sintática
+    (analisar_completo com construir_arvore=False) e imprime um erro por linha
+    no formato arquivo:linha:coluna: descrição.
+    Um arquivo que não pode ser lido ou decodificado como UTF-8 é informado em
+    stderr como arquivo: erro de leitura: motivo e conta como uma falha.
+    Retorna o código de saída: 0 se nenhum arquivo tem erros, 1 caso contrário.
+    """
+    analisador = AnalisadorLexico()
+    total_erros = 0
+    for caminho in caminhos:
+        try:
+            tokens = analisador._tokens_arquivo(caminho, usar_mmap=True)
+        except (OSError, UnicodeDecodeError) as erro:
+            motivo = erro.strerror if isinstance(erro, OSError) and erro.strerror else erro
+            print(f"{caminho}: erro de leitura: {motivo}", file=sys.stderr)
+            total_erros += 1
+            continue
+        _, _, erros_sintaticos = analisador.analisar_completo("", tokens, construir_arvore=False)
+        erros = [t for t in tokens if t.eh_erro] + erros_sintaticos
+        for erro in erros:
+            print(f"{caminho}:{erro.linha}:{erro.coluna}: {erro.descricao}")
+        total_erros += len(erros)
+    print(f"{len(caminhos)} arquivo(s) verificado(s), {total_erros} erro(s)")
+    return 1 if total_erros else 0
+
+
+# Analisador léxico de cada processo da análise léxica paralela, criado na primeira parte
+_analisador_partes = None
+
+
+def _analisar_parte_lexica(parte: str, primeira_linha: int, motor: str, limites: Tuple[int, int]) -> list:
+    """
+    Tarefa de um processo de analisar(paralelo=True): reconhece os tokens das
+    linhas de parte (sem as regras de validação, que precisam do programa
+    completo) e os retorna serializados.
+    """
+    global _analisador_partes
+    if _analisador_partes is None:
+        _analisador_partes = AnalisadorLexico()
+    _analisador_partes.MAX_IDENTIFICADOR_LENGTH, _analisador_partes.MAX_NUMERO_LENGTH = limites
+    
+    analisar_linha = _analisador_partes._selecionar_motor(motor)
+    tokens = []
+    with _coletor_pausado():
+        for num_linha, linha in enumerate(parte.split('\n'), primeira_linha):
+            analisar_linha(linha, num_linha, tokens)
+        return _serializar_tokens(tokens)
+
+
+# Analisador léxico de cada processo do modo lote, criado na primeira tarefa
+_analisador_lote = None
+
+
+def _analisar_parte_lote(caminhos: List[str], diretorio_cache: Optional[str] = None) -> Tuple[List[dict], int, int]:
+    """
+    Tarefa de um processo do modo lote: analisa os arquivos (analisar_completo,
+    sem construir a árvore) e retorna um resultado serializável por arquivo,
+    com os acertos e falhas do cache nesta tarefa.
+    """
+    global _analisador_lote
+    if _analisador_lote is None:
+        _analisador_lote = AnalisadorLexico()
+        if diretorio_cache is not None:
+            _analisador_lote.cache = CacheAnalise(diretorio_cache)
+    cache = _analisador_lote.cache
+    acertos, falhas = (cache.acertos, cache.falhas) if cache is not None else (0, 0)
+    
+    resultados = []
+    for caminho in caminhos:
+        try:
+            with open(caminho, 'r', encoding='utf-8') as arquivo:
+                codigo = arquivo.read()
+        except (OSError, UnicodeDecodeError) as e:
+            resultados.append({"arquivo": caminho, "falha": str(e)})
+            continue
+        tokens, _, erros_sintaticos = _analisador_lote.analisar_completo(codigo, construir_arvore=False)
+        resultados.append({
+            "arquivo": caminho,
+            "tokens": len(tokens),
+            "erros_lexicos": [token.para_dict() for token in tokens if token.eh_erro],
+            "erros_sintaticos": [erro.para_dict() for erro in erros_sintaticos],
+        })
+    if cache is not None:
+        acertos, falhas = cache.acertos - acertos, cache.falhas - falhas
+    return resultados, acertos, falhas
+
+
+def analisar_lote(diretorio: str, ordem: str = "conclusao", processos: Optional[int] = None,
+                  destino: Optional[TextIO] = None, cache: Optional[str] = None) -> int:
+    """
+    Analisa todos os arquivos .als de diretorio (e subdiretórios) em paralelo, em
+    um ProcessPoolExecutor com processos processos (padrão: número de núcleos),
+    e escreve em destino (padrão: saída padrão) um objeto JSON por linha para
+    cada arquivo, na ordem de conclusão ("conclusao") ou na ordem dos caminhos
+    ("entrada"). Os arquivos são enviados aos processos em partes, para que o
+    custo de comunicação não domine em lotes de arquivos pequenos.
+    Com cache (um diretório), os processos compartilham um CacheAnalise nele e
+    arquivos inalterados desde o lote anterior não são analisados de novo.
+    Retorna o código de saída: 0 se nenhum arquivo tem erros, 1 caso contrário,
+    e 2 se diretorio não existe ou não é um diretório.
+    """
+    if ordem not in ("conclusao", "entrada"):
+        raise ValueError(f"Ordem desconhecida: '{ordem}'. Use 'conclusao' ou 'entrada'")
+    if not os.path.isdir(diretorio):
+        print(f"Erro: '{diretorio}' não é um diretório.", file=sys.stderr)
+        return 2
+    destino = destino if destino is not None else sys.stdout
+    processos = processos or os.cpu_count() or 1
+    
+    caminhos = []
+    for raiz, subdiretorios, arquivos in os.walk(diretorio):
+        subdiretorios.sort()
+        caminhos.extend(os.path.join(raiz, nome) for nome in sorted(arquivos) if nome.endswith('.als'))
+    tamanho_parte = max(1, min(64, len(caminhos) // (processos * 4)))
+    partes = [caminhos[i:i + tamanho_parte] for i in range(0, len(caminhos), tamanho_parte)]
+    
+    com_erros = acertos = falhas = 0
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        if ordem == "entrada":
+            resultados = executor.map(_analisar_parte_lote, partes, [cache] * len(partes))
+        else:
+            futuros = [executor.submit(_analisar_parte_lote, parte, cache) for parte in partes]
+            resultados = (futuro.result() for futuro in as_completed(futuros))
+        for parte, acertos_parte, falhas_parte in resultados:
+            acertos += acertos_parte
+            falhas += falhas_parte
+            for resultado in parte:
+                destino.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+                if "falha" in resultado or resultado["erros_lexicos"] or resultado["erros_sintaticos"]:
+                    com_erros += 1
+            destino.flush()
+    
+    print(f"{len(caminhos)} arquivo(s) analisado(s), {com_erros} com erros", file=sys.stderr)
+    if cache is not None:
+        print(f"Cache: {acertos} acerto(s), {falhas} falha(s)", file=sys.stderr)
+    return 1 if com_erros else 0
+
+
 def main():
 
-    if len(sys.argv) > 1 and sys.argv[1] == '--console':
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        # Modo lote: todos os .als de um diretório, em paralelo, com saída em JSON
+        # Opções: --ordem conclusao|entrada, --processos N e --cache <diretorio>
+        opcoes = dict(zip(sys.argv[3::2], sys.argv[4::2]))
+        desconhecidas = set(opcoes) - {'--ordem', '--processos', '--cache'}
+        processos = opcoes.get('--processos')
+        if (len(sys.argv) == 2 or sys.argv[2].startswith('--') or desconhecidas or len(sys.argv[3:]) % 2
+                or opcoes.get('--ordem', 'conclusao') not in ('conclusao', 'entrada')
+                or processos is not None and not (processos.isdigit() and int(processos) > 0)):
+            print("Uso: python analisador.py --batch <diretorio> [--ordem conclusao|entrada] [--processos N]"
+                  " [--cache <diretorio>]", file=sys.stderr)
+            sys.exit(2)
+        processos = int(processos) if processos is not None else None
+        sys.exit(analisar_lote(sys.argv[2], opcoes.get('--ordem', 'conclusao'), processos,
+                               cache=opcoes.get('--cache')))
+    elif len(sys.argv) > 1 and sys.argv[1] == '--verificar':
+        # Modo verificação (por exemplo, em integração contínua): só a sintaxe
+        if len(sys.argv) == 2:
+            # Uma lista de arquivos vazia falha em vez de abrir a interface gráfica
+            print("Uso: python analisador.py --verificar <arquivo> [<arquivo> ...]", file=sys.stderr)
+            sys.exit(2)
+        sys.exit(verificar_arquivos(sys.argv[2:]))
+    elif len(sys.argv) > 1 and sys.argv[1] == '--console':
         # Modo console
         analisador = AnalisadorLexico()
         
@@ -0,0 +1,1057 @@
+"""
+Benchmarks do analisador ALAIAS.
+
+Uso:
+    python benchmark.py                 # executa todos os benchmarks
+    python benchmark.py linha_longa     # executa apenas o benchmark indicado
+    python benchmark.py motores         # compara a saída e o tempo dos motores léxicos
+    python benchmark.py incremental     # latência da reanálise após editar uma linha
+    python benchmark.py memoria_tokens  # memória da lista de Token contra o TokenStore
+    python benchmark.py identificadores # análise de código com muitos identificadores
+    python benchmark.py mmap            # memória de analisar_arquivo com e sem mmap
+    python benchmark.py validacao       # custo das regras de validação do programa completo
+    python benchmark.py sintatico       # tokens por segundo do analisador sintático
+    python benchmark.py expressoes      # custo por operador e profundidade de parênteses
+    python benchmark.py memoria_arvore  # bytes por nó: NoSintatico x ArvoreCompacta
+    python benchmark.py escrita_arvore  # escrita da árvore em fluxo para árvores de até 1M nós
+    python benchmark.py recuperacao     # erros e tempo do sintático em entradas corrompidas
+    python benchmark.py reanalise_sintatica # reanálise sintática após editar uma linha
+    python benchmark.py reconhecimento  # tempo e pico de memória: árvore x só verificação
+    python benchmark.py lote            # arquivos por segundo do modo --batch por número de processos
+    python benchmark.py cache           # análise sem cache, com o cache vazio e com o cache preenchido
+    python benchmark.py memoria         # acerto da memória LRU de analisar_completo por tamanho do programa
+    python benchmark.py paralelo        # análise léxica sequencial x paralela (partes de linhas) de um arquivo grande
+    python benchmark.py fases           # tokens/s e pico de memória por fase, de 1 KB a 100 MB, gravados em JSON
+        [--tamanhos 1KB,1MB,100MB] [--saida benchmark_fases.json] [--semente N]
+        [--profundidade N] [--complexidade N] [--densidade-erros 0.05]
+    python benchmark.py instrumentacao  # custo de analisar_completo com MetricasAnalise e as métricas obtidas
+"""
+import glob
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Optional, Tuple
+
+from analisador import (AnalisadorLexico, AnalisadorSintatico, CacheAnalise, LexicoIncremental, MemoriaAnalise,
+                        MetricasAnalise, analisar_lote)
+
+
+# Trecho de programa repetido para montar entradas grandes
+TRECHO = 'intn idade idade <= 10 + 2 wrt "texto" cdt [ idade ge 18 ] wrt idade '
+
+# Fragmentos (válidos e inválidos) usados para sortear programas na comparação de motores
+FRAGMENTOS = [
+    'als', 'cdt', '!cdt', '!cdt+', '!cdtx', 'cycle', 'during', 'repeat', 'wrt', 'input', 'func',
+    'brkln', 'in', 'intn', 'den', 'txt', 'bln', 'crt', 'valid', 'invalid', 'gt', 'eq', 'ne',
+    'lt', 'ge', 'le', 'and', 'or', '<=', '<', '=', '+', '-', '--', '*', '/', '(', ')', '[', ']',
+    ',', '12', '3.5', '12.', '1.2.3', '2.a3', '123abc', '12_x', '1234567890123456', 'idade',
+    '_a', 'a_b1', 'a' * 31, 'nome@x', '@', '$', '%', '#', '&', '!', '~', '§', 'ç', 'açúcar',
+    '²3', '"ok"', '"aberta', '"', 'e', 'g', 'igual', 'wr', 'inp', 'int', 'cd', 'else', 'fn',
+    ' ', '\t', '\r', '.', 'x.5', 'als@', '1@',
+]
+
+
+def gerar_linha_unica(tamanho: int) -> str:
+    """Gera um programa com aproximadamente `tamanho` bytes em uma única linha."""
+    return 'als ' + TRECHO * (tamanho // len(TRECHO))
+
+
+def gerar_programa_aleatorio(semente: int, num_linhas: int = 8) -> str:
+    """Sorteia um programa (possivelmente inválido) a partir de FRAGMENTOS."""
+    sorteio = random.Random(semente)
+    linhas = []
+    for _ in range(num_linhas):
+        partes = []
+        for _ in range(sorteio.randint(0, 12)):
+            partes.append(sorteio.choice(FRAGMENTOS))
+            partes.append(sorteio.choice(['', ' ', ' ', '\t']))
+        linhas.append(''.join(partes))
+    return '\n'.join(linhas)
+
+
+def cronometrar(funcao, *args, **kwargs) -> float:
+    """Executa a função uma vez e retorna o tempo decorrido em segundos."""
+    inicio = time.perf_counter()
+    funcao(*args, **kwargs)
+    return time.perf_counter() - inicio
+
+
+def benchmark_linha_longa():
+    """
+    Análise léxica de programas em uma única linha, de 128 KB a 1 MB.
+    Com o índice por linha (IndiceLinha) o tempo por KB deve ficar constante,
+    ou seja, o tempo total cresce linearmente com o tamanho da linha.
+    """
+    analisador = AnalisadorLexico()
+    print("ANÁLISE LÉXICA DE UMA ÚNICA LINHA LONGA")
+    print(f"{'Motor':<10} {'Tamanho':>10} {'Tempo (s)':>10} {'us/KB':>10}")
+    print("-" * 44)
+    
+    for motor in analisador.MOTORES:
+        tamanho = 128 * 1024
+        while tamanho <= 1024 * 1024:
+            codigo = gerar_linha_unica(tamanho)
+            tempo = cronometrar(analisador.analisar, codigo, motor=motor)
+            print(f"{motor:<10} {len(codigo) // 1024:>8}KB {tempo:>10.3f} {tempo * 1e6 / (len(codigo) / 1024):>10.1f}")
+            tamanho *= 2
+    print()
+
+
+def benchmark_motores():
+    """
+    Comparação diferencial dos motores léxicos: todos devem produzir exatamente
+    os mesmos tokens que o motor "padroes" para os exemplos e para programas
+    sorteados. Em seguida mede o tempo de cada motor no mesmo código.
+    """
+    analisador = AnalisadorLexico()
+    print("COMPARAÇÃO DOS MOTORES LÉXICOS")
+    
+    pasta_exemplos = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exemplos')
+    programas = []
+    for caminho in sorted(glob.glob(os.path.join(pasta_exemplos, '*.als'))):
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            programas.append(arquivo.read())
+    programas.extend(gerar_programa_aleatorio(semente) for semente in range(2000))
+    
+    divergencias = 0
+    for codigo in programas:
+        referencia = [vars(token) for token in analisador.analisar(codigo, motor="padroes")]
+        for motor in analisador.MOTORES:
+            if [vars(token) for token in analisador.analisar(codigo, motor=motor)] != referencia:
+                divergencias += 1
+                print(f"Divergência no motor '{motor}' para o código: {codigo!r}")
+    print(f"{len(programas)} programas comparados, {divergencias} divergência(s)\n")
+    
+    codigo = '\n'.join(programas[:len(programas) // 10]) * 5
+    print(f"{'Motor':<10} {'Tempo (s)':>10} {'us/KB':>10}")
+    print("-" * 32)
+    for motor in analisador.MOTORES:
+        tempo = cronometrar(analisador.analisar, codigo, motor=motor)
+        print(f"{motor:<10} {tempo:>10.3f} {tempo * 1e6 / (len(codigo) / 1024):>10.1f}")
+    print()
+    
+    if divergencias:
+        sys.exit(1)
+
+
+def benchmark_streaming():
+    """
+    Pico de memória de iter_tokens() ao percorrer arquivos de 256 KB a 2 MB sem
+    guardar os tokens. O pico deve depender do tamanho da linha, não do arquivo.
+    """
+    analisador = AnalisadorLexico()
+    print("MEMÓRIA DE iter_tokens() POR TAMANHO DE ARQUIVO")
+    print(f"{'Tamanho':>10} {'Tokens':>10} {'Tempo (s)':>10} {'Pico (KB)':>10}")
+    print("-" * 44)
+    
+    linha = TRECHO.strip() + '\n'
+    for kilobytes in (256, 512, 1024, 2048):
+        with tempfile.NamedTemporaryFile('w', suffix='.als', delete=False, encoding='utf-8') as arquivo:
+            arquivo.write('als\n')
+            for _ in range(kilobytes * 1024 // len(linha)):
+                arquivo.write(linha)
+            caminho = arquivo.name
+        
+        try:
+            with open(caminho, 'r', encoding='utf-8') as fluxo:
+                tracemalloc.start()
+                inicio = time.perf_counter()
+                total = sum(1 for _ in analisador.iter_tokens(fluxo))
+                tempo = time.perf_counter() - inicio
+                _, pico = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            print(f"{kilobytes:>8}KB {total:>10} {tempo:>10.3f} {pico / 1024:>10.1f}")
+        finally:
+            os.remove(caminho)
+    print()
+
+
+def benchmark_incremental():
+    """
+    Reanálise de um programa de 50 mil linhas após editar um caractere.
+    O tempo de editar() deve ser próximo ao de analisar uma única linha,
+    independentemente do tamanho do programa. atualizar() e tokens(), o caminho
+    usado pela interface, também passam as regras de validação por todos os
+    tokens e por isso custam O(n): são medidos à parte.
+    """
+    analisador = AnalisadorLexico()
+    print("REANÁLISE INCREMENTAL (50 MIL LINHAS)")
+    
+    linhas = ['als'] + [TRECHO.strip()] * 50000
+    codigo = '\n'.join(linhas)
+    documento = LexicoIncremental(analisador, codigo)
+    
+    repeticoes = 200
+    meio = len(linhas) // 2
+    inicio = time.perf_counter()
+    for vez in range(repeticoes):
+        documento.editar(meio, meio, linhas[meio - 1] + 'x' * (vez % 2))
+    tempo_edicao = (time.perf_counter() - inicio) / repeticoes
+    
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        analisador.analisar(linhas[meio - 1])
+    tempo_linha = (time.perf_counter() - inicio) / repeticoes
+    
+    repeticoes_documento = 5
+    inicio = time.perf_counter()
+    for vez in range(repeticoes_documento):
+        linhas[meio - 1] = TRECHO.strip() + 'x' * (vez % 2)
+        documento.atualizar('\n'.join(linhas))
+    tempo_atualizar = (time.perf_counter() - inicio) / repeticoes_documento
+    
+    tempo_completo = cronometrar(analisador.analisar, codigo)
+    tempo_tokens_lexicos = cronometrar(documento.tokens_lexicos)
+    tempo_tokens = cronometrar(documento.tokens)
+    
+    print(f"{'Operação':<40} {'Tempo (ms)':>12}")
+    print("-" * 53)
+    print(f"{'editar() de uma linha':<40} {tempo_edicao * 1e3:>12.3f}")
+    print(f"{'analisar() de uma linha isolada':<40} {tempo_linha * 1e3:>12.3f}")
+    print(f"{'tokens_lexicos() do documento':<40} {tempo_tokens_lexicos * 1e3:>12.3f}")
+    print(f"{'tokens() do documento (com validação)':<40} {tempo_tokens * 1e3:>12.3f}")
+    print(f"{'atualizar() após editar uma linha':<40} {tempo_atualizar * 1e3:>12.3f}")
+    print(f"{'analisar() do programa completo':<40} {tempo_completo * 1e3:>12.3f}")
+    print()
+
+
+def medir_memoria(funcao, *args):
+    """Executa a função e retorna (resultado, bytes ainda alocados pelo resultado)."""
+    tracemalloc.start()
+    antes, _ = tracemalloc.get_traced_memory()
+    resultado = funcao(*args)
+    depois, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, depois - antes
+
+
+def medir_pico_memoria(funcao, *args):
+    """Executa a função e retorna (resultado, pico de bytes alocados durante a execução)."""
+    tracemalloc.start()
+    antes, _ = tracemalloc.get_traced_memory()
+    resultado = funcao(*args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, pico - antes
+
+
+def benchmark_memoria_tokens():
+    """
+    Memória retida pelos tokens de programas de 128 KB a 512 KB: lista de
+    objetos Token (analisar) contra as colunas do TokenStore (analisar_compacto).
+    """
+    analisador = AnalisadorLexico()
+    print("MEMÓRIA DOS TOKENS: LISTA DE Token x TokenStore")
+    print(f"{'Tamanho':>10} {'Tokens':>10} {'Lista (B/token)':>16} {'Store (B/token)':>16} {'Redução':>8}")
+    print("-" * 64)
+    
+    linha = TRECHO.strip()
+    for kilobytes in (128, 256, 512):
+        codigo = '\n'.join(['als'] + [linha] * (kilobytes * 1024 // (len(linha) + 1)))
+        tokens, memoria_lista = medir_memoria(analisador.analisar, codigo)
+        total = len(tokens)
+        del tokens
+        store, memoria_store = medir_memoria(analisador.analisar_compacto, codigo)
+        del store
+        print(f"{kilobytes:>8}KB {total:>10} {memoria_lista / total:>16.1f} {memoria_store / total:>16.1f} "
+              f"{memoria_lista / memoria_store:>7.1f}x")
+    print()
+
+
+def benchmark_identificadores():
+    """
+    Análise léxica de código formado quase só por identificadores e palavras
+    reservadas, o caso em que a classificação de palavras pesa mais.
+    """
+    analisador = AnalisadorLexico()
+    print("ANÁLISE DE CÓDIGO COM MUITOS IDENTIFICADORES")
+    
+    sorteio = random.Random(0)
+    nomes = ['idade', 'contador', 'x', 'total_geral', 'valor1', 'nome', 'soma', 'media',
+             'resultado', 'wrt', 'intn', 'cdt', 'and', 'gt', 'input', 'valid']
+    codigo = '\n'.join(['als'] + [' '.join(sorteio.choice(nomes) for _ in range(12)) for _ in range(8000)])
+    
+    print(f"{'Motor':<10} {'Tempo (s)':>10} {'us/KB':>10}")
+    print("-" * 32)
+    for motor in analisador.MOTORES:
+        tempo = min(cronometrar(analisador.analisar, codigo, motor=motor) for _ in range(3))
+        print(f"{motor:<10} {tempo:>10.3f} {tempo * 1e6 / (len(codigo) / 1024):>10.1f}")
+    print()
+
+
+def benchmark_mmap():
+    """
+    Pico de memória de analisar_arquivo() em modo texto e com usar_mmap=True,
+    comparado à memória retida pela lista de tokens resultante. Com mmap o
+    arquivo não é lido para a memória do processo, então o pico deve ficar
+    próximo do tamanho da saída.
+    """
+    analisador = AnalisadorLexico()
+    print("MEMÓRIA DE analisar_arquivo() COM E SEM MMAP")
+    print(f"{'Tamanho':>10} {'Modo':>6} {'Tempo (s)':>10} {'Saída (KB)':>11} {'Pico (KB)':>10} {'Pico/Saída':>11}")
+    print("-" * 63)
+    
+    linha = TRECHO.strip() + '\n'
+    for kilobytes in (256, 512, 1024):
+        with tempfile.NamedTemporaryFile('w', suffix='.als', delete=False, encoding='utf-8') as arquivo:
+            arquivo.write('als\n')
+            for _ in range(kilobytes * 1024 // len(linha)):
+                arquivo.write(linha)
+            caminho = arquivo.name
+        
+        try:
+            for modo, usar_mmap in (('texto', False), ('mmap', True)):
+                tracemalloc.start()
+                inicio = time.perf_counter()
+                tokens = analisador.analisar_arquivo(caminho, usar_mmap=usar_mmap)
+                tempo = time.perf_counter() - inicio
+                saida, pico = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                del tokens
+                print(f"{kilobytes:>8}KB {modo:>6} {tempo:>10.3f} {saida / 1024:>11.1f} {pico / 1024:>10.1f} "
+                      f"{pico / saida:>11.2f}")
+        finally:
+            os.remove(caminho)
+    print()
+
+
+def benchmark_validacao():
+    """
+    Tempo do percurso de validação sobre os mesmos tokens léxicos com todas as
+    regras, com cada regra desativada e sem nenhuma regra. As regras são
+    alimentadas por um único percurso dos tokens.
+    """
+    analisador = AnalisadorLexico()
+    print("VALIDAÇÃO DO PROGRAMA COMPLETO")
+    
+    codigo = '\n'.join(['als'] + [TRECHO.strip(), 'input(idade) cdt [ idade 18 ] wrt idade'] * 5000)
+    tokens = list(analisador._tokens_lexicos(codigo.split('\n'), analisador._analisar_linha_mestre))
+    nomes = [regra.nome for regra in analisador.regras_validacao]
+    
+    def validar():
+        return list(analisador._validar_tokens(iter(tokens)))
+    
+    print(f"{'Regras ativas':<45} {'Tempo (s)':>10} {'ns/token':>10}")
+    print("-" * 67)
+    cenarios = [('todas', [])] + [(f'todas menos {nome}', [nome]) for nome in nomes] + [('nenhuma', nomes)]
+    for descricao, desativadas in cenarios:
+        for nome in desativadas:
+            analisador.desativar_regra(nome)
+        tempo = min(cronometrar(validar) for _ in range(3))
+        for nome in desativadas:
+            analisador.ativar_regra(nome)
+        print(f"{descricao:<45} {tempo:>10.3f} {tempo * 1e9 / len(tokens):>10.1f}")
+    print()
+
+
+def gerar_programa_valido(num_blocos: int) -> str:
+    """
+    Gera um programa sintaticamente correto repetindo um bloco com as principais
+    construções. Como a linguagem não tem fim de bloco, cada repetição começa com
+    'cdt', que encerra as estruturas abertas pela anterior e mantém a árvore rasa.
+    As variáveis são declaradas uma única vez, no início, para não haver
+    redeclarações (validar_simbolos).
+    """
+    bloco = """cdt [ idade ge 18 and altura gt 1.5 ]
+    wrt idade
+    cycle [ idade lt 100 ]
+        idade <= idade + 1
+    repeat idade in 5
+        idade <= 0
+        altura <= 1.5
+        idade <= (idade + 2) * 3 - 1
+        input(idade)
+        wrt "idade"
+        func calcular()
+        calcular()
+        brkln
+"""
+    return 'als\nintn idade\nden altura\n' + bloco * num_blocos
+
+
+def benchmark_sintatico():
+    """
+    Vazão do analisador sintático (tokens por segundo) sobre os mesmos tokens
+    léxicos, para programas corretos de tamanhos crescentes.
+    """
+    analisador = AnalisadorLexico()
+    print("VAZÃO DO ANALISADOR SINTÁTICO")
+    print(f"{'Tokens':>10} {'Tempo (s)':>10} {'Tokens/s':>12}")
+    print("-" * 34)
+    
+    for num_blocos in (500, 1000, 2000):
+        tokens = analisador.analisar(gerar_programa_valido(num_blocos))
+        tempo = min(cronometrar(AnalisadorSintatico().analisar, tokens) for _ in range(3))
+        print(f"{len(tokens):>10} {tempo:>10.3f} {len(tokens) / tempo:>12.0f}")
+    print()
+
+
+def benchmark_expressoes():
+    """
+    Análise sintática de expressões longas (muitos operadores) e profundas
+    (muitos níveis de parênteses). A análise de expressões é iterativa, então a
+    profundidade não é limitada pela pilha do Python.
+    """
+    analisador = AnalisadorLexico()
+    print("ANÁLISE DE EXPRESSÕES")
+    print(f"{'Expressão':<28} {'Operadores':>10} {'Tempo (s)':>10} {'ns/operador':>12}")
+    print("-" * 63)
+    
+    for operadores in (10000, 100000):
+        casos = [
+            ('plana', 'x <= 1' + ' + idade * 2' * (operadores // 2)),
+            ('parênteses aninhados', 'x <= ' + '(1 + ' * operadores + '1' + ')' * operadores),
+        ]
+        for nome, expressao in casos:
+            tokens = analisador.analisar('als\n' + expressao)
+            sintatico = AnalisadorSintatico()
+            tempo = min(cronometrar(sintatico.analisar, tokens) for _ in range(3))
+            print(f"{nome:<28} {operadores:>10} {tempo:>10.3f} {tempo * 1e9 / operadores:>12.1f}")
+    print()
+
+
+def benchmark_memoria_arvore():
+    """
+    Bytes por nó da árvore sintática: objetos NoSintatico (analisar) contra a
+    arena ArvoreCompacta (analisar_compacto), medidos com tracemalloc.
+    """
+    analisador = AnalisadorLexico()
+    print("MEMÓRIA DA ÁRVORE SINTÁTICA")
+    print(f"{'Nós':>10} {'NoSintatico (B/nó)':>20} {'Arena (B/nó)':>14} {'Redução':>8}")
+    print("-" * 56)
+    
+    for num_blocos in (200, 1000):
+        tokens = analisador.analisar(gerar_programa_valido(num_blocos))
+        _, bytes_objetos = medir_memoria(AnalisadorSintatico().analisar, tokens)
+        sintatico = AnalisadorSintatico()
+        _, bytes_arena = medir_memoria(sintatico.analisar_compacto, tokens)
+        num_nos = len(sintatico.arvore_compacta)
+        print(f"{num_nos:>10} {bytes_objetos / num_nos:>20.1f} {bytes_arena / num_nos:>14.1f} "
+              f"{bytes_objetos / bytes_arena:>7.1f}x")
+    print()
+
+
+def benchmark_escrita_arvore():
+    """
+    Escrita da árvore sintática com EscritorArvore em um destino que apenas conta
+    os caracteres, para árvores de até cerca de 1 milhão de nós. O tempo por nó
+    deve se manter constante com o crescimento da árvore.
+    """
+    class DestinoContador:
+        def __init__(self):
+            self.caracteres = 0
+        
+        def write(self, texto):
+            self.caracteres += len(texto)
+    
+    analisador = AnalisadorLexico()
+    print("ESCRITA DA ÁRVORE SINTÁTICA")
+    print(f"{'Árvore':<8} {'Nós':>10} {'Tempo (s)':>10} {'ns/nó':>8} {'Caracteres':>12}")
+    print("-" * 52)
+    
+    for num_blocos in (2000, 17000):
+        tokens = analisador.analisar(gerar_programa_valido(num_blocos))
+        compacto = AnalisadorSintatico()
+        compacto.analisar_compacto(tokens)
+        num_nos = len(compacto.arvore_compacta)
+        objetos = AnalisadorSintatico()
+        objetos.analisar(tokens)
+        
+        for nome, sintatico in (('objetos', objetos), ('arena', compacto)):
+            destino = DestinoContador()
+            tempo = cronometrar(sintatico.escrever_arvore, destino)
+            print(f"{nome:<8} {num_nos:>10} {tempo:>10.3f} {tempo * 1e9 / num_nos:>8.0f} {destino.caracteres:>12}")
+    print()
+
+
+def gerar_programa_corrompido(num_blocos: int, num_falhas: int, semente: int = 0) -> str:
+    """
+    Gera um programa correto (gerar_programa_valido) e substitui num_falhas linhas
+    sorteadas por uma sequência de tokens que não forma nenhum comando.
+    """
+    rng = random.Random(semente)
+    linhas = gerar_programa_valido(num_blocos).split('\n')
+    lixo = ') + 2.5 ] * ( / gt 7 - ' * 20
+    for indice in rng.sample(range(1, len(linhas)), num_falhas):
+        linhas[indice] = lixo
+    return '\n'.join(linhas)
+
+
+# Variáveis declaradas no início dos programas sintéticos, por tipo, e funções
+VARIAVEIS_SINTETICAS = {
+    'intn': ['idade', 'peso', 'contador', 'total'],
+    'den': ['altura', 'media'],
+    'txt': ['nome'],
+    'bln': ['ativo'],
+}
+FUNCOES_SINTETICAS = ['calcular', 'mostrar']
+
+# Linhas com um único defeito (léxico, de tipo ou sintático) injetadas nos
+# programas sintéticos com densidade_erros > 0
+LINHAS_COM_ERRO = [
+    'idade <= 2.a3',              # número mal formado
+    'wrt "texto sem fim',          # string não fechada
+    'id@de <= 1',                 # identificador mal formado
+    'idade <= 1.5',               # intn recebendo valor decimal
+    'idade <=',                   # atribuição sem expressão
+    'altura <= idade + * 2',      # operador sem operando
+    'wrt ( idade + 1',            # parêntese não fechado
+    'input idade',                # input sem parênteses
+    'cdt [ idade 18 ]',           # condição sem operador relacional
+    'cycle idade lt 3 ]',         # condição sem '['
+]
+
+
+def gerar_programa(tamanho: int, semente: int = 0, profundidade: int = 3, complexidade: int = 3,
+                   densidade_erros: float = 0.0) -> str:
+    """
+    Gera um programa ALAIAS sintético de aproximadamente tamanho caracteres,
+    sempre o mesmo para a mesma semente.
+    - profundidade: máximo de estruturas cdt/cycle/during/repeat aninhadas. Como a
+      linguagem não tem fim de bloco, uma estrutura só fica dentro de outra quando
+      é o primeiro comando do bloco; os comandos seguintes ficam na mais interna.
+      Tudo o que vem depois de um '!cdt+' ou '!cdt' fica dentro dele (a árvore
+      ficaria tão profunda quanto o programa é longo), por isso eles só aparecem
+      na última estrutura.
+    - complexidade: máximo de operadores de cada expressão (com subexpressões
+      entre parênteses) e de termos and/or de cada condição.
+    - densidade_erros: fração das linhas de comando trocadas por uma linha de
+      LINHAS_COM_ERRO; com 0.0 o programa não tem nenhum erro léxico ou sintático.
+    """
+    rng = random.Random(semente)
+    inteiras = VARIAVEIS_SINTETICAS['intn']
+    numericas = inteiras + VARIAVEIS_SINTETICAS['den']
+    
+    def termo(variaveis, decimal, operadores):
+        if operadores > 1 and rng.random() < 0.3:
+            return '( ' + expressao(variaveis, decimal, rng.randint(1, operadores - 1)) + ' )'
+        if rng.random() < 0.6:
+            return rng.choice(variaveis)
+        if decimal and rng.random() < 0.5:
+            return f"{rng.randint(0, 999)}.{rng.randint(0, 99)}"
+        return str(rng.randint(0, 9999))
+    
+    def expressao(variaveis, decimal, operadores):
+        partes = [termo(variaveis, decimal, operadores)]
+        for _ in range(rng.randint(0, operadores)):
+            partes.append(rng.choice('+-*/'))
+            partes.append(termo(variaveis, decimal, operadores))
+        return ' '.join(partes)
+    
+    def relacao():
+        return (f"{expressao(numericas, True, complexidade // 2)} "
+                f"{rng.choice(('gt', 'eq', 'ne', 'lt', 'ge', 'le'))} "
+                f"{expressao(numericas, True, complexidade // 2)}")
+    
+    def condicao():
+        partes = [relacao()]
+        for _ in range(rng.randint(0, max(0, complexidade - 1))):
+            partes.append(rng.choice(('and', 'or')))
+            partes.append(relacao())
+        return ' '.join(partes)
+    
+    def comando_simples():
+        sorteio = rng.random()
+        if sorteio < 0.35:
+            # O primeiro valor de uma atribuição precisa ser compatível com o tipo
+            if rng.random() < 0.6:
+                return f"{rng.choice(inteiras)} <= {expressao(inteiras, False, complexidade)}"
+            return f"{rng.choice(VARIAVEIS_SINTETICAS['den'])} <= {expressao(numericas, True, complexidade)}"
+        if sorteio < 0.55:
+            return f"wrt {expressao(numericas, True, complexidade)}"
+        if sorteio < 0.62:
+            return f'wrt "mensagem {rng.randint(0, 999)}"'
+        if sorteio < 0.68:
+            return f'nome <= "texto {rng.randint(0, 999)}"'
+        if sorteio < 0.73:
+            return f"ativo <= {rng.choice(('valid', 'invalid'))}"
+        if sorteio < 0.82:
+            return f"input({rng.choice(numericas)})"
+        if sorteio < 0.9:
+            return f"{rng.choice(FUNCOES_SINTETICAS)}()"
+        if sorteio < 0.95:
+            return "brkln"
+        return f"-- comentário {rng.randint(0, 999)}"
+    
+    linhas = ['als', f"-- Programa sintético (semente {semente})"]
+    for tipo, nomes in VARIAVEIS_SINTETICAS.items():
+        linhas.extend(f"{tipo} {nome}" for nome in nomes)
+    linhas.extend(f"func {nome}()" for nome in FUNCOES_SINTETICAS)
+    total = sum(len(linha) + 1 for linha in linhas)
+    
+    def acrescentar(linha, nivel):
+        nonlocal total
+        if densidade_erros and rng.random() < densidade_erros:
+            linha = rng.choice(LINHAS_COM_ERRO)
+        linha = '    ' * nivel + linha
+        linhas.append(linha)
+        total += len(linha) + 1
+    
+    def estrutura(nivel):
+        tipo = rng.choice(('cdt', 'cycle', 'during', 'repeat'))
+        if tipo == 'repeat':
+            acrescentar(f"repeat {rng.choice(inteiras)} in {rng.randint(1, 100)}", nivel)
+        else:
+            acrescentar(f"{tipo} [ {condicao()} ]", nivel)
+        bloco(nivel + 1)
+    
+    def bloco(nivel):
+        if nivel < profundidade and rng.random() < 0.5:
+            estrutura(nivel)
+        for _ in range(rng.randint(1, 4)):
+            acrescentar(comando_simples(), nivel)
+    
+    while total < tamanho:
+        if profundidade > 0 and rng.random() < 0.5:
+            estrutura(0)
+        else:
+            acrescentar(comando_simples(), 0)
+    
+    if profundidade > 0:
+        acrescentar(f"cdt [ {condicao()} ]", 0)
+        bloco(1)
+        acrescentar(f"!cdt+ [ {condicao()} ]", 0)
+        bloco(1)
+        acrescentar("!cdt", 0)
+        bloco(1)
+    return '\n'.join(linhas)
+
+
+def benchmark_recuperacao():
+    """
+    Análise sintática de programas com falhas injetadas. Com a recuperação em
+    modo pânico, cada linha com defeito gera um erro e o restante dela é
+    descartado sem criar erros em cascata.
+    """
+    analisador = AnalisadorLexico()
+    print("RECUPERAÇÃO DE ERROS SINTÁTICOS")
+    print(f"{'Tokens':>10} {'Falhas':>8} {'Erros':>8} {'Suprimidos':>11} {'Tempo (s)':>10}")
+    print("-" * 51)
+    
+    for num_falhas in (10, 100, 1000):
+        tokens = analisador.analisar(gerar_programa_corrompido(1000, num_falhas))
+        sintatico = AnalisadorSintatico(max_erros=None)
+        tempo = min(cronometrar(sintatico.analisar, tokens) for _ in range(3))
+        print(f"{len(tokens):>10} {num_falhas:>8} {len(sintatico.erros_sintaticos):>8} "
+              f"{sintatico.erros_suprimidos:>11} {tempo:>10.3f}")
+    print()
+
+
+def benchmark_reanalise_sintatica():
+    """
+    Análise sintática de um programa grande após editar uma linha no meio.
+    Com reanalisar, apenas o comando de nível superior atingido pela edição é
+    analisado de novo; os demais são reaproveitados da análise anterior.
+    """
+    analisador = AnalisadorLexico()
+    print("REANÁLISE SINTÁTICA INCREMENTAL")
+    
+    linhas = gerar_programa_valido(2000).split('\n')
+    documento = LexicoIncremental(analisador, '\n'.join(linhas))
+    sintatico = AnalisadorSintatico()
+    sintatico.analisar(documento.tokens_lexicos())
+    
+    repeticoes = 20
+    meio = len(linhas) // 2
+    tempo_completo = tempo_incremental = 0.0
+    for vez in range(repeticoes):
+        documento.editar(meio, meio, linhas[meio - 1] + ' + 1' * (vez % 2))
+        tokens = documento.tokens_lexicos()
+        tempo_completo += cronometrar(AnalisadorSintatico().analisar, tokens)
+        tempo_incremental += cronometrar(sintatico.reanalisar, tokens)
+    
+    print(f"{'Tokens':>10} {'Completa (ms)':>14} {'reanalisar (ms)':>16}")
+    print("-" * 42)
+    print(f"{len(tokens):>10} {tempo_completo / repeticoes * 1e3:>14.1f} "
+          f"{tempo_incremental / repeticoes * 1e3:>16.1f}")
+    print()
+
+
+def benchmark_reconhecimento():
+    """
+    Análise sintática com árvore (analisar) contra a verificação sem árvore
+    (reconhecer, usada por analisar_completo(..., construir_arvore=False) e por
+    --verificar): tempo e pico de memória sobre os mesmos tokens léxicos.
+    """
+    analisador = AnalisadorLexico()
+    print("RECONHECIMENTO SEM ÁRVORE")
+    print(f"{'Tokens':>10} {'Árvore (s)':>11} {'Sem árvore (s)':>15} "
+          f"{'Pico árvore (MB)':>17} {'Pico sem árvore (MB)':>21}")
+    print("-" * 78)
+    
+    for num_blocos in (500, 2000):
+        tokens = analisador.analisar(gerar_programa_valido(num_blocos))
+        tempo_arvore = min(cronometrar(AnalisadorSintatico().analisar, tokens) for _ in range(3))
+        tempo_reconhecer = min(cronometrar(AnalisadorSintatico().reconhecer, tokens) for _ in range(3))
+        _, pico_arvore = medir_pico_memoria(AnalisadorSintatico().analisar, tokens)
+        _, pico_reconhecer = medir_pico_memoria(AnalisadorSintatico().reconhecer, tokens)
+        print(f"{len(tokens):>10} {tempo_arvore:>11.3f} {tempo_reconhecer:>15.3f} "
+              f"{pico_arvore / 2**20:>17.1f} {pico_reconhecer / 2**20:>21.1f}")
+    print()
+
+
+def benchmark_lote():
+    """
+    Modo lote (analisar_lote, usado por --batch) sobre 1000 programas gerados,
+    com 1 processo e com um processo por núcleo. A vazão deve crescer quase
+    linearmente com o número de núcleos.
+    """
+    print("MODO LOTE (1000 ARQUIVOS)")
+    num_nucleos = os.cpu_count() or 1
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        for indice in range(1000):
+            subdiretorio = os.path.join(diretorio, f"parte{indice % 10}")
+            os.makedirs(subdiretorio, exist_ok=True)
+            with open(os.path.join(subdiretorio, f"programa{indice}.als"), 'w', encoding='utf-8') as arquivo:
+                arquivo.write(gerar_programa_valido(2 + indice % 8))
+        
+        print(f"{'Processos':>10} {'Tempo (s)':>10} {'Arquivos/s':>12} {'Aceleração':>11}")
+        print("-" * 46)
+        tempo_base = None
+        for processos in sorted({1, num_nucleos}):
+            with open(os.devnull, 'w', encoding='utf-8') as destino:
+                tempo = cronometrar(analisar_lote, diretorio, "conclusao", processos, destino)
+            tempo_base = tempo_base or tempo
+            print(f"{processos:>10} {tempo:>10.2f} {1000 / tempo:>12.0f} {tempo_base / tempo:>10.2f}x")
+    print()
+
+
+def benchmark_cache():
+    """
+    analisar_completo e analisar_arquivo sem cache, com o CacheAnalise vazio
+    (análise + gravação) e com a entrada já gravada (leitura). Um acerto deve
+    custar uma fração da análise.
+    """
+    print("CACHE EM DISCO")
+    codigo = gerar_programa_valido(2000)
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "programa.als")
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(codigo)
+        analisador = AnalisadorLexico()
+        
+        print(f"{'Operação':<20} {'Sem cache (s)':>14} {'Vazio (s)':>10} {'Preenchido (s)':>15} {'Aceleração':>11}")
+        print("-" * 74)
+        for nome, funcao, argumento in (("analisar_completo", analisador.analisar_completo, codigo),
+                                        ("analisar_arquivo", analisador.analisar_arquivo, caminho)):
+            analisador.cache = None
+            tempo_sem_cache = cronometrar(funcao, argumento)
+            analisador.cache = CacheAnalise(os.path.join(diretorio, "cache"))
+            tempo_vazio = cronometrar(funcao, argumento)
+            tempo_preenchido = cronometrar(funcao, argumento)
+            print(f"{nome:<20} {tempo_sem_cache:>14.3f} {tempo_vazio:>10.3f} {tempo_preenchido:>15.3f} "
+                  f"{tempo_sem_cache / tempo_preenchido:>10.1f}x")
+        print(f"Estatísticas: {analisador.cache.estatisticas()}")
+    print()
+
+
+def benchmark_memoria():
+    """
+    analisar_completo repetido com a mesma entrada: a primeira chamada analisa e
+    guarda o resultado na MemoriaAnalise, as seguintes só calculam o hash do
+    código e copiam as listas (microssegundos em programas pequenos).
+    Depois, o caminho da interface gráfica (LexicoIncremental + sintatico, com a
+    memória consultada antes de atualizar e o resultado guardado com
+    gravar_incremental): editar uma linha e analisar deve custar quase o mesmo
+    com a memória e sem ela, e analisar de novo sem editar ou voltar ao texto de
+    antes da edição deve ser um acerto.
+    """
+    print("MEMÓRIA LRU DE analisar_completo")
+    print(f"{'Blocos':>8} {'Tokens':>8} {'Análise (ms)':>13} {'Acerto (µs)':>12} {'Aceleração':>11}")
+    print("-" * 56)
+    repeticoes = 200
+    for num_blocos in (1, 10, 100, 1000):
+        codigo = gerar_programa_valido(num_blocos)
+        analisador = AnalisadorLexico()
+        analisador.memoria = MemoriaAnalise()
+        inicio = time.perf_counter()
+        tokens, _, _ = analisador.analisar_completo(codigo)
+        tempo_analise = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            analisador.analisar_completo(codigo)
+        tempo_acerto = (time.perf_counter() - inicio) / repeticoes
+        print(f"{num_blocos:>8} {len(tokens):>8} {tempo_analise * 1000:>13.2f} {tempo_acerto * 1e6:>12.1f} "
+              f"{tempo_analise / tempo_acerto:>10.0f}x")
+    print(f"Estatísticas (último programa): {analisador.memoria.estatisticas()}")
+    print()
+    
+    print("CAMINHO DA INTERFACE (2000 BLOCOS, INSERIR UMA LINHA E DESFAZER)")
+    linhas = gerar_programa_valido(2000).split('\n')
+    meio = len(linhas) // 2
+    print(f"{'Memória':<8} {'Inserir + analisar (ms)':>23} {'Analisar sem editar (ms)':>25} {'Desfazer (ms)':>14}")
+    print("-" * 73)
+    for com_memoria in (False, True):
+        analisador = AnalisadorLexico()
+        memoria = MemoriaAnalise() if com_memoria else None
+        documento = LexicoIncremental(analisador)
+        sintatico = AnalisadorSintatico()
+        
+        def analisar_como_interface(codigo):
+            # Mesmos passos de InterfaceGrafica.analisar_codigo
+            chave = None
+            if memoria is not None:
+                chave = memoria.chave(analisador.configuracao(), codigo, True, sintatico.max_erros)
+                resultado = memoria.obter(chave)
+                if resultado is not None:
+                    return resultado
+            resultado = analisador.analisar_completo(codigo, documento.atualizar(codigo), sintatico=sintatico)
+            if memoria is not None:
+                resultado = memoria.gravar_incremental(chave, *resultado)
+            return resultado
+        
+        original = '\n'.join(linhas)
+        analisar_como_interface(original)
+        repeticoes = 5
+        tempo_edicao = tempo_repeticao = tempo_desfazer = 0.0
+        for vez in range(repeticoes):
+            # Editar inserindo uma linha desloca as linhas dos tokens seguintes
+            editado = '\n'.join(linhas[:meio] + ['idade <= %d' % vez] + linhas[meio:])
+            tempo_edicao += cronometrar(analisar_como_interface, editado)
+            tempo_repeticao += cronometrar(analisar_como_interface, editado)
+            tempo_desfazer += cronometrar(analisar_como_interface, original)
+        print(f"{'sim' if com_memoria else 'não':<8} {tempo_edicao / repeticoes * 1000:>23.1f} "
+              f"{tempo_repeticao / repeticoes * 1000:>25.2f} {tempo_desfazer / repeticoes * 1000:>14.1f}")
+        if memoria is not None:
+            print(f"Estatísticas: {memoria.estatisticas()}")
+    print()
+
+
+def benchmark_paralelo():
+    """
+    analisar com paralelo=True sobre um programa de ~3 MB, com 1 processo e com
+    um processo por núcleo, comparado à análise sequencial. As regras de
+    validação continuam sequenciais, então a aceleração é limitada por elas.
+    Com 1 processo, analisar usa o caminho sequencial (sem ProcessPoolExecutor).
+    """
+    print("ANÁLISE LÉXICA PARALELA (~3 MB)")
+    codigo = gerar_programa_valido(10000)
+    analisador = AnalisadorLexico()
+    num_nucleos = os.cpu_count() or 1
+    
+    inicio = time.perf_counter()
+    referencia = analisador.analisar(codigo)
+    tempo_base = time.perf_counter() - inicio
+    print(f"{'Modo':<24} {'Tempo (s)':>10} {'Tokens/s':>12} {'Aceleração':>11} {'Idêntica':>9}")
+    print("-" * 70)
+    print(f"{'sequencial':<24} {tempo_base:>10.2f} {len(referencia) / tempo_base:>12.0f} {1:>10.2f}x {'-':>9}")
+    for processos in sorted({1, num_nucleos}):
+        inicio = time.perf_counter()
+        tokens = analisador.analisar(codigo, paralelo=True, processos=processos)
+        tempo = time.perf_counter() - inicio
+        print(f"{f'paralelo ({processos} processo(s))':<24} {tempo:>10.2f} {len(tokens) / tempo:>12.0f} "
+              f"{tempo_base / tempo:>10.2f}x {'sim' if tokens == referencia else 'NÃO':>9}")
+    print()
+
+
+# Tamanhos padrão do benchmark de fases e maior programa analisado de uma vez:
+# acima dele (os tokens e a árvore de 100 MB não cabem na memória), o tamanho é
+# medido em segmentos independentes gerados com sementes consecutivas
+TAMANHOS_FASES = ('1KB', '10KB', '100KB', '1MB', '10MB', '100MB')
+TAMANHO_SEGMENTO = 4 * 2**20
+UNIDADES = {'KB': 2**10, 'MB': 2**20, 'GB': 2**30, 'B': 1}
+
+
+def ler_tamanho(texto: str) -> int:
+    """Converte '100KB', '10MB', '512' ... em número de caracteres."""
+    texto = texto.strip().upper()
+    for unidade, multiplicador in UNIDADES.items():
+        if texto.endswith(unidade):
+            return int(float(texto[:-len(unidade)]) * multiplicador)
+    return int(texto)
+
+
+def medir_fases(codigo: str, memoria: bool = False) -> Tuple[dict, int, int]:
+    """
+    Executa as fases de analisar_completo separadamente sobre codigo e retorna
+    ({fase: segundos ou pico de bytes}, número de tokens, número de nós). Com
+    memoria=True, cada fase é medida com tracemalloc (medir_pico_memoria) em vez
+    de cronometrada: o rastreamento deixaria os tempos mais lentos.
+    """
+    analisador = AnalisadorLexico()
+    medidas = {}
+    
+    def medir(fase, funcao, *args):
+        if memoria:
+            resultado, medidas[fase] = medir_pico_memoria(funcao, *args)
+        else:
+            inicio = time.perf_counter()
+            resultado = funcao(*args)
+            medidas[fase] = time.perf_counter() - inicio
+        return resultado
+    
+    tokens_lexicos = medir('lexico', lambda: list(
+        analisador._tokens_lexicos(codigo.split('\n'), analisador._analisar_linha_mestre)))
+    tokens = medir('validacao', lambda: list(analisador._validar_tokens(iter(tokens_lexicos))))
+    del tokens_lexicos
+    # Sem limite de erros: com densidade_erros > 0 a análise não para nos primeiros 100
+    sintatico = AnalisadorSintatico(max_erros=None)
+    arvore, _ = medir('sintatico', sintatico.analisar, tokens)
+    medir('delimitadores', sintatico.validar_delimitadores)
+    medir('simbolos', sintatico.validar_simbolos)
+    with open(os.devnull, 'w', encoding='utf-8') as destino:
+        medir('arvore', sintatico.escrever_arvore, destino)
+    
+    num_nos = 0
+    pendentes = [arvore] if arvore is not None else []
+    while pendentes:
+        num_nos += 1
+        pendentes.extend(pendentes.pop().filhos)
+    return medidas, len(tokens), num_nos
+
+
+def benchmark_fases(tamanhos: Optional[str] = None, saida: str = 'benchmark_fases.json', semente: str = '0',
+                    profundidade: str = '3', complexidade: str = '3', densidade_erros: str = '0.0'):
+    """
+    Tokens por segundo e pico de memória de cada fase (análise léxica, regras de
+    validação, análise sintática, validar_delimitadores, validar_simbolos e
+    escrita da árvore) sobre programas gerados por gerar_programa, de 1 KB a
+    100 MB. Os parâmetros vêm da linha de comando (texto); os resultados são
+    gravados em JSON em saida para comparar execuções. Tamanhos maiores que
+    TAMANHO_SEGMENTO são medidos em segmentos: os tempos somam todos os
+    segmentos e o pico de memória é o do primeiro.
+    """
+    nomes_tamanhos = tamanhos.split(',') if tamanhos else list(TAMANHOS_FASES)
+    parametros = {'semente': int(semente), 'profundidade': int(profundidade),
+                  'complexidade': int(complexidade), 'densidade_erros': float(densidade_erros)}
+    print("FASES DA ANÁLISE POR TAMANHO DO PROGRAMA")
+    print(f"{'Tamanho':>8} {'Fase':<14} {'Tempo (s)':>10} {'Tokens/s':>12} {'Pico (MB)':>10}")
+    print("-" * 58)
+    
+    resultados = []
+    for nome in nomes_tamanhos:
+        tamanho = ler_tamanho(nome)
+        num_segmentos = max(1, math.ceil(tamanho / TAMANHO_SEGMENTO))
+        tempos = {}
+        picos = None
+        caracteres = num_tokens = num_nos = 0
+        for segmento in range(num_segmentos):
+            codigo = gerar_programa(tamanho // num_segmentos, parametros['semente'] + segmento,
+                                    parametros['profundidade'], parametros['complexidade'],
+                                    parametros['densidade_erros'])
+            medidas, tokens_segmento, nos_segmento = medir_fases(codigo)
+            for fase, tempo in medidas.items():
+                tempos[fase] = tempos.get(fase, 0.0) + tempo
+            if picos is None:
+                picos, _, _ = medir_fases(codigo, memoria=True)
+            caracteres += len(codigo)
+            num_tokens += tokens_segmento
+            num_nos += nos_segmento
+            del codigo
+        
+        fases = {}
+        for fase, tempo in tempos.items():
+            fases[fase] = {'tempo_s': tempo, 'tokens_por_s': num_tokens / tempo if tempo else None,
+                           'pico_memoria_bytes': picos[fase]}
+            tokens_por_s = f"{num_tokens / tempo:>12.0f}" if tempo else f"{'-':>12}"
+            print(f"{nome:>8} {fase:<14} {tempo:>10.3f} {tokens_por_s} {picos[fase] / 2**20:>10.1f}")
+        resultados.append({'tamanho': nome, 'caracteres': caracteres, 'segmentos': num_segmentos,
+                           'tokens': num_tokens, 'nos': num_nos, 'fases': fases})
+    
+    with open(saida, 'w', encoding='utf-8') as arquivo:
+        json.dump({
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'parametros': parametros,
+            'resultados': resultados,
+        }, arquivo, ensure_ascii=False, indent=2)
+    print(f"Resultados gravados em {saida}")
+    print()
+
+
+def benchmark_instrumentacao():
+    """
+    analisar_completo sem metricas e com uma MetricasAnalise por chamada. Sem
+    metricas o custo deve ser o de sempre; com elas, a contagem das tentativas
+    de regex pesa no reconhecimento. Imprime as métricas do maior programa.
+    """
+    print("INSTRUMENTAÇÃO DE analisar_completo")
+    print(f"{'Blocos':>8} {'Tokens':>8} {'Sem métricas (s)':>17} {'Com métricas (s)':>17} {'Custo':>7}")
+    print("-" * 62)
+    analisador = AnalisadorLexico()
+    for num_blocos in (10, 100, 1000, 5000):
+        codigo = gerar_programa_valido(num_blocos)
+        inicio = time.perf_counter()
+        tokens, _, _ = analisador.analisar_completo(codigo)
+        tempo_sem = time.perf_counter() - inicio
+        metricas = MetricasAnalise()
+        inicio = time.perf_counter()
+        analisador.analisar_completo(codigo, metricas=metricas)
+        tempo_com = time.perf_counter() - inicio
+        print(f"{num_blocos:>8} {len(tokens):>8} {tempo_sem:>17.4f} {tempo_com:>17.4f} "
+              f"{tempo_com / tempo_sem - 1:>+7.0%}")
+    print()
+    print(metricas.formatar())
+
+
+BENCHMARKS = {
+    'motores': benchmark_motores,
+    'linha_longa': benchmark_linha_longa,
+    'streaming': benchmark_streaming,
+    'incremental': benchmark_incremental,
+    'memoria_tokens': benchmark_memoria_tokens,
+    'identificadores': benchmark_identificadores,
+    'mmap': benchmark_mmap,
+    'validacao': benchmark_validacao,
+    'sintatico': benchmark_sintatico,
+    'expressoes': benchmark_expressoes,
+    'memoria_arvore': benchmark_memoria_arvore,
+    'escrita_arvore': benchmark_escrita_arvore,
+    'recuperacao': benchmark_recuperacao,
+    'reanalise_sintatica': benchmark_reanalise_sintatica,
+    'reconhecimento': benchmark_reconhecimento,
+    'lote': benchmark_lote,
+    'cache': benchmark_cache,
+    'memoria': benchmark_memoria,
+    'paralelo': benchmark_paralelo,
+    'fases': benchmark_fases,
+    'instrumentacao': benchmark_instrumentacao,
+}
+
+
+# Opções de linha de comando de cada benchmark (--opcao valor), passadas como
+# argumentos nomeados
+OPCOES = {
+    'fases': ('--tamanhos', '--saida', '--semente', '--profundidade', '--complexidade', '--densidade-erros'),
+}
+
+
+def main():
+    nomes = []
+    opcoes = {}
+    argumentos = iter(sys.argv[1:])
+    for argumento in argumentos:
+        if argumento.startswith('--'):
+            opcoes[argumento] = next(argumentos, None)
+        else:
+            nomes.append(argumento)
+    nomes = nomes or list(BENCHMARKS)
+    
+    for nome in nomes:
+        if nome not in BENCHMARKS:
+            print(f"Benchmark desconhecido: '{nome}'. Disponíveis: {', '.join(BENCHMARKS)}")
+            sys.exit(1)
+    for opcao, valor in opcoes.items():
+        if valor is None or not any(opcao in OPCOES.get(nome, ()) for nome in nomes):
+            print(f"Opção inválida: '{opcao}'. Opções: "
+                  + '; '.join(f"{nome}: {' '.join(lista)}" for nome, lista in OPCOES.items()))
+            sys.exit(1)
+    
+    for nome in nomes:
+        argumentos_nomeados = {opcao[2:].replace('-', '_'): valor for opcao, valor in opcoes.items()
+                               if opcao in OPCOES.get(nome, ())}
+        BENCHMARKS[nome](**argumentos_nomeados)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Testes dos modos de linha de comando que não abrem a interface gráfica."""
+import os
+import subprocess
+import sys
+
+ANALISADOR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'analisador.py')
+
+
+def executar(*argumentos) -> subprocess.CompletedProcess:
+    # Sem DISPLAY, um modo que caísse na interface gráfica falharia com TclError
+    ambiente = {chave: valor for chave, valor in os.environ.items() if chave != 'DISPLAY'}
+    return subprocess.run([sys.executable, ANALISADOR, *argumentos], capture_output=True,
+                          text=True, encoding='utf-8', env=ambiente, timeout=60)
+
+
+def test_verificar_sem_arquivos():
+    resultado = executar('--verificar')
+    assert resultado.returncode == 2
+    assert resultado.stderr.startswith("Uso: python analisador.py --verificar")
+
+
+def test_verificar_arquivo_correto(tmp_path):
+    caminho = tmp_path / "correto.als"
+    caminho.write_text("als\nintn x\nx <= 1\n", encoding='utf-8')
+    resultado = executar('--verificar', str(caminho))
+    assert resultado.returncode == 0
+    assert resultado.stdout == "1 arquivo(s) verificado(s), 0 erro(s)\n"
+
+
+def test_verificar_erro_de_leitura(tmp_path):
+    latin1 = tmp_path / "latin1.als"
+    latin1.write_bytes('als\nwrt "café"\n'.encode('latin-1'))
+    ausente = tmp_path / "ausente.als"
+    resultado = executar('--verificar', str(latin1), str(ausente))
+    assert resultado.returncode == 1
+    linhas = resultado.stderr.splitlines()
+    assert linhas[0].startswith(f"{latin1}: erro de leitura: 'utf-8' codec can't decode")
+    assert linhas[1] == f"{ausente}: erro de leitura: No such file or directory"
+    # Nenhum diagnóstico sintático inventado para os arquivos não lidos
+    assert resultado.stdout == "2 arquivo(s) verificado(s), 2 erro(s)\n"
+
+
+def test_batch_sem_diretorio():
+    for argumentos in (('--batch',), ('--batch', '--processos', '2')):
+        resultado = executar(*argumentos)
+        assert resultado.returncode == 2, argumentos
+        assert resultado.stderr.startswith("Uso: python analisador.py --batch")
+
+
+def test_batch_caminho_que_nao_e_diretorio(tmp_path):
+    arquivo = tmp_path / "programa.als"
+    arquivo.write_text("als\n", encoding='utf-8')
+    for caminho in (tmp_path / "inexistente", arquivo):
+        resultado = executar('--batch', str(caminho))
+        assert resultado.returncode == 2
+        assert resultado.stderr == f"Erro: '{caminho}' não é um diretório.\n"
+        assert resultado.stdout == ""
+
+
+def test_batch_opcoes_invalidas(tmp_path):
+    for opcoes in (('--processos', 'x'), ('--processos', '0'), ('--ordem', 'z'), ('--desconhecida', '1'),
+                   ('--processos',)):
+        resultado = executar('--batch', str(tmp_path), *opcoes)
+        assert resultado.returncode == 2, opcoes
+        assert resultado.stderr.startswith("Uso: python analisador.py --batch"), opcoes
+
+
+def test_batch_diretorio(tmp_path):
+    (tmp_path / "correto.als").write_text("als\nintn x\n", encoding='utf-8')
+    resultado = executar('--batch', str(tmp_path), '--processos', '1')
+    assert resultado.returncode == 0
+    assert '"erros_lexicos": [], "erros_sintaticos": []' in resultado.stdout
+    assert resultado.stderr == "1 arquivo(s) analisado(s), 0 com erros\n"
@@ -0,0 +1,87 @@
+"""
+Testes da MemoriaAnalise: acertos de analisar_completo, chaves que dependem da
+configuração do analisador e o caminho da interface gráfica (LexicoIncremental +
+reanalisar, com o resultado guardado por gravar_incremental).
+"""
+from analisador import (AnalisadorLexico, AnalisadorSintatico, LexicoIncremental, MemoriaAnalise,
+                        NoSomenteLeitura)
+
+PROGRAMA = "als\nintn x\nx <= 1 + 2\ncdt [ x gt 1 ]\n  wrt x\nwrt \"fim\""
+
+
+def chave_token(token) -> tuple:
+    return token.tipo, token.lexema, token.linha, token.coluna, token.descricao, token.eh_erro
+
+
+def nos(raiz) -> list:
+    """Nós da árvore em pré-ordem, com o token de cada um."""
+    resultado = []
+    pendentes = [raiz]
+    while pendentes:
+        no = pendentes.pop()
+        resultado.append((no.tipo, no.valor, chave_token(no.token) if no.token is not None else None))
+        pendentes.extend(reversed(no.filhos))
+    return resultado
+
+
+def resumo(resultado) -> tuple:
+    tokens, arvore, erros = resultado
+    return [chave_token(t) for t in tokens], nos(arvore), [chave_token(e) for e in erros]
+
+
+def test_acerto_retorna_listas_novas_e_arvore_somente_leitura():
+    analisador = AnalisadorLexico()
+    analisador.memoria = MemoriaAnalise()
+    esperado = AnalisadorLexico().analisar_completo(PROGRAMA)
+
+    tokens, arvore, erros = analisador.analisar_completo(PROGRAMA)
+    assert isinstance(arvore, NoSomenteLeitura) and not hasattr(arvore, 'adicionar_filho')
+    tokens.clear()
+    arvore.filhos.clear()
+    erros.append(None)
+
+    resultado = analisador.analisar_completo(PROGRAMA)
+    assert analisador.memoria.estatisticas()['acertos'] == 1
+    assert resumo(resultado) == resumo(esperado)
+    assert str(resultado[1]) == str(esperado[1])
+
+
+def test_configuracao_faz_parte_da_chave():
+    codigo = "als\nintn contador_total"
+    analisador = AnalisadorLexico()
+    analisador.memoria = MemoriaAnalise()
+    assert not [t for t in analisador.analisar_completo(codigo)[0] if t.eh_erro]
+
+    analisador.MAX_IDENTIFICADOR_LENGTH = 10
+    tokens, _, _ = analisador.analisar_completo(codigo)
+    assert analisador.memoria.estatisticas()['acertos'] == 0
+    assert [t.lexema for t in tokens if t.eh_erro] == ['contador_total']
+
+
+def test_caminho_da_interface_volta_ao_texto_anterior():
+    analisador = AnalisadorLexico()
+    analisador.memoria = memoria = MemoriaAnalise()
+    documento = LexicoIncremental(analisador)
+    sintatico = AnalisadorSintatico()
+
+    def analisar_como_interface(codigo):
+        # Mesmos passos de InterfaceGrafica.analisar_codigo
+        chave = memoria.chave(analisador.configuracao(), codigo, True, sintatico.max_erros)
+        resultado = memoria.obter(chave)
+        if resultado is None:
+            resultado = memoria.gravar_incremental(chave, *analisador.analisar_completo(
+                codigo, documento.atualizar(codigo), sintatico=sintatico))
+        return resultado
+
+    # B insere uma linha: os tokens seguintes de A mudam de linha no documento
+    codigo_a = PROGRAMA
+    codigo_b = PROGRAMA.replace("intn x\n", "intn x\nintn y\n")
+    acertos = []
+    for codigo in (codigo_a, codigo_a, codigo_b, codigo_a, codigo_b, codigo_a):
+        antes = memoria.acertos
+        resultado = analisar_como_interface(codigo)
+        acertos.append(memoria.acertos > antes)
+        assert resumo(resultado) == resumo(AnalisadorLexico().analisar_completo(codigo))
+        resultado[1].filhos.clear()
+    assert acertos == [False, True, False, True, True, True]
+    assert len(memoria) == 2
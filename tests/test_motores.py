@@ -0,0 +1,76 @@
+"""
+Testes diferenciais dos caminhos de análise léxica: os motores "mestre", "padroes"
+e "afd", iter_tokens, o TokenStore de analisar_compacto e a leitura de arquivos
+(modo texto e mmap) devem produzir exatamente os mesmos tokens.
+"""
+import glob
+import io
+import os
+
+import pytest
+
+from analisador import AnalisadorLexico
+from benchmark import gerar_programa_aleatorio, gerar_programa_corrompido
+
+PASTA_EXEMPLOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'exemplos')
+EXEMPLOS = sorted(glob.glob(os.path.join(PASTA_EXEMPLOS, '*.als')))
+
+# Entradas escritas à mão: quebras de linha CRLF e CR isoladas, texto fora do ASCII
+# (em strings, comentários, identificadores e como caractere inválido)
+ESPECIAIS = [
+    'als\r\nintn x\r\nwrt "á"\r\n',
+    'als\rintn x\r\rx <= 1',
+    'als\nintn açúcar\nwrt "olá" -- comentário çé\nx <= 2.a3 ² §\n',
+    'als\n\twrt "aberta\ncdt [ x gt 1 ] wrt "ok" -- ação\r\n',
+    '',
+    '\n\n',
+]
+
+analisador = AnalisadorLexico()
+
+
+def campos(token) -> tuple:
+    return token.tipo, token.lexema, token.linha, token.coluna, token.descricao, token.eh_erro
+
+
+def programas():
+    for caminho in EXEMPLOS:
+        with open(caminho, 'r', encoding='utf-8', newline='') as arquivo:
+            yield pytest.param(arquivo.read(), id=os.path.basename(caminho))
+    for posicao, codigo in enumerate(ESPECIAIS):
+        yield pytest.param(codigo, id=f"especial{posicao}")
+    for semente in range(300):
+        yield pytest.param(gerar_programa_aleatorio(semente), id=f"aleatorio{semente}")
+    for semente in range(5):
+        yield pytest.param(gerar_programa_corrompido(20, 5, semente), id=f"corrompido{semente}")
+
+
+PROGRAMAS = list(programas())
+
+
+def test_exemplos_encontrados():
+    assert EXEMPLOS
+
+
+@pytest.mark.parametrize("codigo", PROGRAMAS)
+def test_motores_iguais(codigo):
+    referencia = [campos(token) for token in analisador.analisar(codigo, motor="padroes")]
+    for motor in ("mestre", "afd"):
+        assert [campos(token) for token in analisador.analisar(codigo, motor=motor)] == referencia, motor
+    assert [campos(token) for token in analisador.analisar_compacto(codigo)] == referencia
+    for motor in analisador.MOTORES:
+        # Blocos pequenos fazem as linhas atravessarem vários blocos do fluxo
+        fluxo = io.StringIO(codigo, newline='')
+        tokens = analisador.iter_tokens(fluxo, motor=motor, tamanho_bloco=7)
+        assert [campos(token) for token in tokens] == referencia, motor
+
+
+@pytest.mark.parametrize("codigo", PROGRAMAS)
+def test_arquivo_igual_a_analisar(codigo, tmp_path):
+    caminho = tmp_path / "programa.als"
+    caminho.write_bytes(codigo.encode('utf-8'))
+    # Os arquivos são lidos como em modo texto, que converte CRLF e CR em '\n'
+    referencia = [campos(token) for token in analisador.analisar(codigo.replace('\r\n', '\n').replace('\r', '\n'))]
+    for usar_mmap in (False, True):
+        tokens = analisador.analisar_arquivo(str(caminho), usar_mmap=usar_mmap)
+        assert [campos(token) for token in tokens] == referencia, usar_mmap
@@ -0,0 +1,118 @@
+"""
+Testes de regressão da recuperação de erros do analisador sintático (modo
+pânico com conjuntos de sincronização) e do limite max_erros.
+"""
+import os
+
+from analisador import AnalisadorLexico, AnalisadorSintatico
+from benchmark import gerar_programa_corrompido
+
+PASTA_EXEMPLOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'exemplos')
+
+COMANDO_INCOMPLETO = 'ERRO_SINTAXE_COMANDO_INCOMPLETO'
+TOKEN_INESPERADO = "Token inesperado ')' não inicia um comando válido"
+
+# Um erro por comando com falha: os erros seguintes do mesmo comando são suprimidos
+ERROS_TESTE_SINTATICO = [
+    (13, 1, COMANDO_INCOMPLETO, "Esperado operador de atribuição '<='"),
+    (13, 7, COMANDO_INCOMPLETO, "Esperado '(' após 'input'"),
+    (16, 7, COMANDO_INCOMPLETO, 'Esperado identificador dentro dos parênteses'),
+    (19, 5, COMANDO_INCOMPLETO, "Esperado '[' para iniciar condição"),
+    (24, 5, COMANDO_INCOMPLETO, "Esperado ']' para fechar condição"),
+    (30, 1, COMANDO_INCOMPLETO, "Esperado ')' para fechar comando input"),
+    (30, 1, 'ERRO_SINTAXE_ESTRUTURA_REPETICAO_MALFORMADA', "Esperado 'in' após identificador em comando 'repeat'"),
+    (35, 17, 'ERRO_SINTAXE_EXPRESSAO_INVALIDA', "Expressão incompleta após operador matemático '+'"),
+    (38, 13, COMANDO_INCOMPLETO, "Esperado ']' para fechar condição"),
+    (45, 1, 'ERRO_SINTAXE_COMANDO_WRT_MALFORMADO', "Comando 'wrt' deve ser seguido por uma expressão válida"),
+    (46, 5, COMANDO_INCOMPLETO, "Esperado '[' para iniciar condição"),
+    (56, 5, COMANDO_INCOMPLETO, "Esperado '[' para iniciar condição"),
+    (59, 12, COMANDO_INCOMPLETO, TOKEN_INESPERADO),
+    (62, 5, COMANDO_INCOMPLETO, "Esperado '[' para iniciar condição"),
+]
+
+analisador = AnalisadorLexico()
+
+
+def analisar(codigo: str, max_erros=AnalisadorSintatico.MAX_ERROS):
+    sintatico = AnalisadorSintatico(max_erros=max_erros)
+    arvore, erros = sintatico.analisar(analisador.analisar(codigo))
+    return sintatico, arvore, erros
+
+
+def resumo(erros) -> list:
+    return [(erro.linha, erro.coluna, erro.tipo.name, erro.descricao) for erro in erros]
+
+
+def test_exemplo_erros_sintaticos():
+    with open(os.path.join(PASTA_EXEMPLOS, 'teste_erros_sintaticos.als'), encoding='utf-8') as arquivo:
+        codigo = arquivo.read()
+    sintatico, arvore, erros = analisar(codigo)
+    assert resumo(erros) == ERROS_TESTE_SINTATICO
+    assert sintatico.erros_suprimidos == 0
+    assert not sintatico.interrompida
+    assert arvore is not None
+
+
+def test_programas_corrompidos():
+    # Cada linha de lixo gera um único erro e a análise continua no comando seguinte
+    esperados = {
+        0: [(26, 1, COMANDO_INCOMPLETO, TOKEN_INESPERADO), (28, 1, COMANDO_INCOMPLETO, TOKEN_INESPERADO)],
+        1: [(10, 1, COMANDO_INCOMPLETO, TOKEN_INESPERADO), (38, 1, COMANDO_INCOMPLETO, TOKEN_INESPERADO)],
+    }
+    for semente, esperado in esperados.items():
+        codigo = gerar_programa_corrompido(3, 2, semente)
+        _, arvore, erros = analisar(codigo)
+        assert resumo(erros) == esperado, semente
+        # Os comandos depois das linhas corrompidas continuam na árvore
+        assert arvore is not None and len(arvore.filhos) > 1
+
+
+def test_sem_limite_de_erros():
+    codigo = gerar_programa_corrompido(200, 150, 0)
+    sintatico, arvore, erros = analisar(codigo, max_erros=None)
+    assert len(erros) == 150
+    assert {erro.descricao for erro in erros} == {TOKEN_INESPERADO}
+    assert not sintatico.interrompida
+    assert arvore is not None
+
+
+def test_limite_de_erros():
+    codigo = gerar_programa_corrompido(200, 150, 0)
+    _, _, todos = analisar(codigo, max_erros=None)
+    for limite in (5, AnalisadorSintatico.MAX_ERROS):
+        sintatico, _, erros = analisar(codigo, max_erros=limite)
+        # Os primeiros max_erros erros, seguidos do aviso de interrupção
+        assert len(erros) == limite + 1
+        assert resumo(erros[:limite]) == resumo(todos[:limite])
+        assert erros[-1].tipo.name == 'ERRO_SINTAXE_PROGRAMA_INCOMPLETO'
+        assert erros[-1].descricao == f"Limite de {limite} erros sintáticos atingido; análise interrompida"
+        assert sintatico.interrompida
+
+
+def test_limite_no_exemplo():
+    with open(os.path.join(PASTA_EXEMPLOS, 'teste_erros_sintaticos.als'), encoding='utf-8') as arquivo:
+        codigo = arquivo.read()
+    sintatico, _, erros = analisar(codigo, max_erros=3)
+    assert resumo(erros[:3]) == ERROS_TESTE_SINTATICO[:3]
+    assert len(erros) == 4 and sintatico.interrompida
+
+
+def test_limite_em_analisar_completo():
+    # Os erros de delimitadores e de símbolos entram no mesmo limite
+    codigo = gerar_programa_corrompido(200, 150, 0)
+    _, _, erros = analisador.analisar_completo(codigo)
+    assert len(erros) == AnalisadorSintatico.MAX_ERROS + 1
+
+
+def test_erro_na_condicao_descarta_o_resto_da_linha():
+    # O que vem depois do ']' na linha com defeito é descartado com o resto do
+    # comando, sem gerar erros em cascata na linha seguinte
+    codigo = "als\nintn x\ncdt [ ( ] x\n  wrt 2\nwrt 3"
+    _, arvore, erros = analisador.analisar_completo(codigo)
+    assert resumo(erros) == [
+        (3, 9, COMANDO_INCOMPLETO, "Esperado ')' para fechar expressão"),
+        (3, 7, 'ERRO_SINTAXE_PARENTESES_NAO_FECHADOS', "Parênteses de abertura '(' não fechado"),
+    ]
+    condicional = arvore.filhos[1].filhos[1]
+    assert condicional.tipo == "ESTRUTURA_CONDICIONAL"
+    assert [comando.tipo for comando in condicional.filhos[-1].filhos] == ["COMANDO_OUTPUT", "COMANDO_OUTPUT"]
@@ -0,0 +1,103 @@
+"""
+Testes da tabela de símbolos e de validar_simbolos: variáveis e funções não
+declaradas e variáveis redeclaradas, como reportadas por analisar_completo.
+"""
+import os
+
+import pytest
+
+from analisador import AnalisadorLexico
+
+PASTA_EXEMPLOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'exemplos')
+
+NAO_DECLARADA = 'ERRO_VARIAVEL_NAO_DECLARADA'
+FUNCAO_NAO_DECLARADA = 'ERRO_FUNCAO_NAO_DECLARADA'
+REDECLARADA = 'ERRO_VARIAVEL_REDECLARADA'
+
+analisador = AnalisadorLexico()
+
+
+def erros_simbolos(codigo: str) -> list:
+    """Erros de símbolos de analisar_completo, sem erros léxicos nos programas testados."""
+    tokens, _, erros = analisador.analisar_completo(codigo)
+    assert not [token for token in tokens if token.eh_erro]
+    return [(erro.linha, erro.coluna, erro.tipo.name, erro.descricao) for erro in erros
+            if erro.tipo.name in (NAO_DECLARADA, FUNCAO_NAO_DECLARADA, REDECLARADA)]
+
+
+def test_declarada_e_usada():
+    assert erros_simbolos("als\nintn x\nx <= 1\nwrt x\nfunc f()\n  wrt x\nf()") == []
+
+
+def test_uso_antes_da_declaracao():
+    # Basta a variável ser declarada em algum ponto do programa
+    assert erros_simbolos("als\nwrt x\nintn x") == []
+
+
+def test_nao_declarada_reportada_no_primeiro_uso():
+    assert erros_simbolos("als\nwrt y\ny <= 2\nwrt y") == [
+        (2, 5, NAO_DECLARADA, "Variável 'y' não foi declarada"),
+    ]
+
+
+def test_funcao_nao_declarada():
+    assert erros_simbolos("als\ng()\ng()") == [
+        (2, 1, FUNCAO_NAO_DECLARADA, "Função 'g' não foi declarada"),
+    ]
+
+
+def test_redeclarada_no_escopo_global():
+    assert erros_simbolos("als\nintn x\nden x") == [
+        (3, 5, REDECLARADA, "Variável 'x' já foi declarada na linha 2"),
+    ]
+
+
+def test_redeclaracao_entre_escopos():
+    # A declaração dentro da função não conflita com a global; a segunda, no
+    # mesmo escopo da função, sim
+    codigo = "als\nintn x\nfunc f()\n  intn x\n  intn x\nf()"
+    assert erros_simbolos(codigo) == [
+        (5, 8, REDECLARADA, "Variável 'x' já foi declarada na função 'f' na linha 4"),
+    ]
+
+
+def test_mesmo_nome_em_funcoes_diferentes():
+    assert erros_simbolos("als\nfunc f()\n  intn x\nfunc g()\n  intn x\nf()\ng()") == []
+
+
+@pytest.mark.parametrize("codigo, esperado", [
+    # A variável do repeat precisa ser declarada, como qualquer outra
+    ("als\nrepeat i in 5\n  wrt i\nwrt i", [(2, 8, NAO_DECLARADA, "Variável 'i' não foi declarada")]),
+    ("als\nintn i\nrepeat i in 5\n  wrt i", []),
+    ("als\nintn i\nrepeat i in 5\n  repeat i in 2\n    wrt i", []),
+])
+def test_variavel_do_repeat(codigo, esperado):
+    assert erros_simbolos(codigo) == esperado
+
+
+def test_diagnosticos_dos_exemplos():
+    esperados = {
+        'exemplo com erros.als': [(28, 5, REDECLARADA, "Variável 'nome' já foi declarada na linha 9")],
+        'exemplo_basico.als': [],
+        'exemplo_loops.als': [],
+        'teste_completo_correto.als': [],
+        'teste_erros_lexicos.als': [
+            (40, 7, NAO_DECLARADA, "Variável 'idade' não foi declarada"),
+            (47, 6, REDECLARADA, "Variável 'valor' já foi declarada na linha 11"),
+            (48, 5, REDECLARADA, "Variável 'nome' já foi declarada na linha 24"),
+            (49, 5, REDECLARADA, "Variável 'preco' já foi declarada na linha 25"),
+        ],
+        'teste_erros_sintaticos.als': [
+            (10, 8, NAO_DECLARADA, "Variável 'valor' não foi declarada"),
+            (23, 7, NAO_DECLARADA, "Variável 'idade' não foi declarada"),
+            (30, 8, NAO_DECLARADA, "Variável 'contador' não foi declarada"),
+        ],
+        'teste_estruturas_repeticao.als': [],
+        'teste_funcoes.als': [],
+    }
+    for nome, esperado in esperados.items():
+        with open(os.path.join(PASTA_EXEMPLOS, nome), encoding='utf-8') as arquivo:
+            _, _, erros = analisador.analisar_completo(arquivo.read())
+        obtidos = [(erro.linha, erro.coluna, erro.tipo.name, erro.descricao) for erro in erros
+                   if erro.tipo.name in (NAO_DECLARADA, FUNCAO_NAO_DECLARADA, REDECLARADA)]
+        assert obtidos == esperado, nome